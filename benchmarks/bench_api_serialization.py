@@ -0,0 +1,110 @@
+"""Compare p99 latency and peak memory of the model-based vs. row/stream response paths.
+
+Covers a 200-row /history page and a multi-MB /jobs/{id}/result?full=true payload.
+
+Usage: python benchmarks/bench_api_serialization.py [--rows 200] [--streams 20000] [--iterations 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from edvmp.shared.models import JobStatus
+from edvmp.shared.results import iter_metadata_json
+from edvmp.shared.store import LocalSqliteStore
+
+
+def _measure(fn: Callable[[], int], iterations: int) -> tuple[float, float, int]:
+    """Return (p99 ms, peak traced MiB, response bytes) for ``fn``."""
+    timings = []
+    size = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        size = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.quantiles(timings, n=100)[98], peak / 2**20, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--streams", type=int, default=20_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as td:
+        store = LocalSqliteStore(str(Path(td) / "bench.db"))
+        store.create_jobs(
+            bucket="videos",
+            jobs={f"job-{i:05d}": f"uploads/job-{i:05d}/a.mp4" for i in range(args.rows)},
+            status=JobStatus.succeeded,
+        )
+        metadata = {
+            "format": {"duration": "3600.0", "format_name": "matroska,webm"},
+            "streams": [
+                {
+                    "index": i,
+                    "codec_type": "data",
+                    "tags": {"title": f"track {i}", "language": "eng"},
+                }
+                for i in range(args.streams)
+            ],
+        }
+        store.store_result(job_id="job-00000", metadata=metadata, summary="summary")
+
+        def history_models() -> int:
+            page = store.list_jobs_page(limit=args.rows)
+            content = {
+                "items": [j.model_dump(mode="json") for j in page.items],
+                "next_cursor": page.next_cursor,
+            }
+            return len(JSONResponse(content).body)
+
+        def history_rows() -> int:
+            page = store.list_job_rows(limit=args.rows)
+            return len(orjson.dumps({"items": page.items, "next_cursor": page.next_cursor}))
+
+        def result_model() -> int:
+            result = store.get_result("job-00000", full=True)
+            return len(result.model_dump_json()) if result else 0
+
+        def result_stream() -> int:
+            payload = store.get_result_payload("job-00000")
+            if payload is None:
+                return 0
+            result, blob = payload
+            head = result.model_dump_json(exclude={"metadata"}).encode()[:-1] + b',"metadata":'
+            chunks = itertools.chain((head,), iter_metadata_json(blob), (b"}",))
+            return sum(len(chunk) for chunk in chunks)
+
+        cases = [
+            (f"history {args.rows} rows", history_models, history_rows, args.iterations),
+            ("result full", result_model, result_stream, max(10, args.iterations // 10)),
+        ]
+        for name, before_fn, after_fn, iterations in cases:
+            before_p99, before_mib, size = _measure(before_fn, iterations)
+            after_p99, after_mib, _ = _measure(after_fn, iterations)
+            print(
+                f"{name:18s} ({size / 1024:8.0f} KiB)  models: p99 {before_p99:7.2f} ms, peak {before_mib:6.1f} MiB"
+                f"  rows/stream: p99 {after_p99:7.2f} ms, peak {after_mib:6.1f} MiB"
+                f"  ({before_p99 / after_p99:.1f}x)"
+            )
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
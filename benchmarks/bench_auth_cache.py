@@ -0,0 +1,44 @@
+"""Compare bearer-token verification cost with and without the verified-token cache.
+
+Simulates pollers: each of --clients holds one token and hits the API in turn.
+
+Usage: python benchmarks/bench_auth_cache.py [--requests 50000] [--clients 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from edvmp.api.auth import TokenVerifier, issue_token
+from edvmp.shared.config import Settings
+
+
+def run(verifier: TokenVerifier, tokens: list[str], requests: int) -> float:
+    start = time.perf_counter()
+    for i in range(requests):
+        verifier.verify(tokens[i % len(tokens)])
+    return (time.perf_counter() - start) / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--clients", type=int, default=200)
+    args = parser.parse_args()
+
+    settings = Settings()
+    tokens = [
+        issue_token(settings, subject=f"poller-{i}").access_token for i in range(args.clients)
+    ]
+
+    uncached = run(TokenVerifier(settings, max_entries=0, cache_ttl_s=0), tokens, args.requests)
+    cached = run(
+        TokenVerifier(settings, max_entries=10_000, cache_ttl_s=300), tokens, args.requests
+    )
+    print(f"jwt.decode every request: {uncached * 1e6:8.1f} us/request")
+    print(f"verified-token cache    : {cached * 1e6:8.1f} us/request  ({uncached / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
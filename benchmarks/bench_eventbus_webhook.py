@@ -0,0 +1,93 @@
+"""Webhook requests/sec under concurrent load: per-record sync XADD vs. the pipelined async path.
+
+Needs a reachable Redis (REDIS_URL, default redis://localhost:6379/0); writes to a scratch stream.
+
+Usage: python benchmarks/bench_eventbus_webhook.py [--requests 500] [--concurrency 50] [--records 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Any
+
+import httpx
+import redis
+from fastapi import FastAPI, Request
+
+from edvmp.eventbus import main as eventbus_main
+from edvmp.eventbus.main import _parse_minio_webhook
+from edvmp.shared.events import RedisEventStream
+
+STREAM = "bench-events"
+
+
+def legacy_app(redis_url: str) -> FastAPI:
+    """The previous handler: a blocking XADD per record inside the async endpoint."""
+    stream = RedisEventStream(redis.Redis.from_url(redis_url), STREAM)
+    app = FastAPI()
+
+    @app.post("/minio/webhook")
+    async def minio_webhook(request: Request):
+        events = _parse_minio_webhook(await request.json())
+        for event in events:
+            stream.publish(event.model_dump(mode="json"))
+        return {"published": len(events)}
+
+    return app
+
+
+def _payload(records: int) -> dict[str, Any]:
+    return {
+        "Records": [
+            {"s3": {"bucket": {"name": "videos"}, "object": {"key": f"uploads/j{i}/a.mp4", "size": 1}}}
+            for i in range(records)
+        ]
+    }
+
+
+async def _drive(app: FastAPI, requests: int, concurrency: int, records: int) -> float:
+    payload = _payload(records)
+    sem = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def one() -> None:
+            async with sem:
+                (await client.post("/minio/webhook", json=payload)).raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--records", type=int, default=20)
+    args = parser.parse_args()
+
+    redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+    try:
+        redis.Redis.from_url(redis_url).ping()
+    except redis.RedisError as e:
+        print(f"skipped: Redis not reachable at {redis_url} ({e})")
+        return
+    os.environ["REDIS_URL"] = redis_url
+    os.environ["REDIS_EVENTS_STREAM"] = STREAM
+
+    results = {"per-record sync XADD": legacy_app(redis_url)}
+    for window_ms in ("0", "2"):
+        os.environ["EVENTBUS_BATCH_WINDOW_MS"] = window_ms
+        results[f"async pipeline (window {window_ms} ms)"] = eventbus_main.create_app()
+
+    for name, app in results.items():
+        rps = asyncio.run(_drive(app, args.requests, args.concurrency, args.records))
+        print(f"{name:32s}: {rps:8.0f} req/s")
+    redis.Redis.from_url(redis_url).delete(STREAM)
+
+
+if __name__ == "__main__":
+    main()
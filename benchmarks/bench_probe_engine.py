@@ -0,0 +1,75 @@
+"""Compare per-file probe latency of the in-process header parser vs. an ffprobe subprocess.
+
+Probes an MP4 given with --input, or one generated with ffmpeg. Without ffprobe on PATH the
+baseline is a bare ``true`` spawn, a lower bound on what any subprocess probe costs.
+
+Usage: python benchmarks/bench_probe_engine.py [--input in.mp4] [--iterations 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from edvmp.worker.ffprobe import ffprobe
+from edvmp.worker.native_probe import probe_native
+
+
+def _measure(fn: Callable[[], object], iterations: int) -> tuple[float, float]:
+    """Return (p50 ms, p99 ms) for ``fn``."""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    q = statistics.quantiles(timings, n=100)
+    return q[49], q[98]
+
+
+def _sample(directory: Path) -> Path:
+    if not shutil.which("ffmpeg"):
+        sys.exit("pass --input or install ffmpeg to generate a sample")
+    path = directory / "sample.mp4"
+    subprocess.run(
+        [
+            "ffmpeg", "-v", "error", "-y",
+            "-f", "lavfi", "-i", "testsrc2=size=1280x720:rate=30:duration=60",
+            "-f", "lavfi", "-i", "sine=sample_rate=48000:duration=60",
+            "-c:v", "libx264", "-preset", "ultrafast", "-c:a", "aac", str(path),
+        ],
+        check=True,
+    )  # fmt: skip
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", type=Path)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as td:
+        path = args.input or _sample(Path(td))
+        if shutil.which("ffprobe"):
+            baseline, before_fn = "ffprobe", lambda: ffprobe(path, timeout_s=30)
+        else:
+            baseline, before_fn = "spawn `true`", lambda: subprocess.run(["true"], check=True)
+        before_p50, before_p99 = _measure(before_fn, args.iterations)
+        after_p50, after_p99 = _measure(lambda: probe_native(path), args.iterations)
+        print(
+            f"{path.name} ({path.stat().st_size / 2**20:.1f} MiB)"
+            f"  {baseline}: p50 {before_p50:7.2f} ms, p99 {before_p99:7.2f} ms"
+            f"  native: p50 {after_p50:7.3f} ms, p99 {after_p99:7.3f} ms"
+            f"  ({before_p50 / after_p50:.0f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
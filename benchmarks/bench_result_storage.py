@@ -0,0 +1,120 @@
+"""Compare result storage size and read latency for raw ffprobe JSON vs. compressed, projected rows.
+
+Usage: python benchmarks/bench_result_storage.py [--results 500] [--streams 24] [--reads 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from edvmp.shared.store import LocalSqliteStore
+
+
+def _metadata(streams: int, seed: int) -> dict[str, Any]:
+    """A large ffprobe payload: many tagged streams, chapters and side data, as seen on real uploads."""
+    return {
+        "format": {
+            "filename": f"/tmp/upload-{seed}.mkv",
+            "format_name": "matroska,webm",
+            "duration": f"{3600 + seed}.125000",
+            "bit_rate": "8000000",
+            "tags": {"title": f"Feature {seed}", "encoder": "libebml v1.4.2 + libmatroska v1.6.4"},
+        },
+        "streams": [
+            {
+                "index": i,
+                "codec_type": "video" if i == 0 else ("audio" if i < streams // 2 else "subtitle"),
+                "codec_name": "hevc" if i == 0 else ("eac3" if i < streams // 2 else "subrip"),
+                "width": 3840 if i == 0 else None,
+                "height": 2160 if i == 0 else None,
+                "r_frame_rate": "24000/1001",
+                "time_base": "1/1000",
+                "disposition": {"default": int(i == 0), "forced": 0, "hearing_impaired": 0},
+                "side_data_list": [{"side_data_type": "Mastering display metadata"}]
+                if i == 0
+                else [],
+                "tags": {
+                    "language": f"l{i % 9}",
+                    "title": f"Track {i}",
+                    "DURATION": "01:00:00.125",
+                },
+            }
+            for i in range(streams)
+        ],
+        "chapters": [
+            {
+                "id": c,
+                "start_time": f"{c * 300}.0",
+                "end_time": f"{c * 300 + 300}.0",
+                "tags": {"title": f"Chapter {c}"},
+            }
+            for c in range(12)
+        ],
+    }
+
+
+def _insert_raw(store: LocalSqliteStore, job_id: str, metadata: dict[str, Any]) -> None:
+    """The previous layout: the whole ffprobe document as JSON text, parsed on every read."""
+    with store._conn() as conn:
+        conn.execute(
+            "INSERT INTO results(job_id, metadata_json, summary) VALUES (?, ?, ?);",
+            (job_id, json.dumps(metadata), "summary"),
+        )
+
+
+def _payload_bytes(store: LocalSqliteStore) -> int:
+    with store._conn() as conn:
+        row = conn.execute(
+            "SELECT SUM(LENGTH(metadata_json)) + COALESCE(SUM(LENGTH(metadata_gz)), 0) FROM results;"
+        ).fetchone()
+    return int(row[0])
+
+
+def run(*, compact: bool, results: int, streams: int, reads: int) -> tuple[int, float, float]:
+    """Return (payload bytes, default read us, full read us)."""
+    with tempfile.TemporaryDirectory() as td:
+        store = LocalSqliteStore(str(Path(td) / "bench.db"))
+        for i in range(results):
+            metadata = _metadata(streams, i)
+            if compact:
+                store.store_result(job_id=f"j{i}", metadata=metadata, summary="summary")
+            else:
+                _insert_raw(store, f"j{i}", metadata)
+        size = _payload_bytes(store)
+
+        timings = []
+        for full in (False, True):
+            start = time.perf_counter()
+            for i in range(reads):
+                store.get_result(f"j{i % results}", full=full)
+            timings.append((time.perf_counter() - start) / reads * 1e6)
+        store.close()
+    return size, timings[0], timings[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--results", type=int, default=500)
+    parser.add_argument("--streams", type=int, default=24)
+    parser.add_argument("--reads", type=int, default=5000)
+    args = parser.parse_args()
+
+    options = {"results": args.results, "streams": args.streams, "reads": args.reads}
+    raw_size, raw_read, raw_full = run(compact=False, **options)
+    size, read, full = run(compact=True, **options)
+    print(
+        f"raw JSON   : {raw_size / args.results:8.0f} B/result  read {raw_read:6.1f} us  full {raw_full:6.1f} us"
+    )
+    print(
+        f"compact    : {size / args.results:8.0f} B/result  read {read:6.1f} us  full {full:6.1f} us"
+        f"  ({raw_size / size:.1f}x smaller, {raw_read / read:.1f}x faster default read)"
+    )
+
+
+if __name__ == "__main__":
+    main()
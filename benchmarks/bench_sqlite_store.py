@@ -0,0 +1,83 @@
+"""Compare LocalSqliteStore ops/sec with per-call connections vs. cached per-thread connections.
+
+Usage: python benchmarks/bench_sqlite_store.py [--ops 5000] [--threads 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from edvmp.shared.models import JobStatus
+from edvmp.shared.store import LocalSqliteStore
+
+
+class ReconnectingStore(LocalSqliteStore):
+    """The previous behaviour: a fresh connection and WAL pragma on every call."""
+
+    @contextmanager
+    def _conn(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self._db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL;")
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+
+def _workload(store: LocalSqliteStore, thread_idx: int, ops: int) -> None:
+    for i in range(ops):
+        job_id = f"t{thread_idx}-{i % 200}"
+        match i % 5:
+            case 0:
+                store.create_job_if_missing(
+                    job_id=job_id,
+                    bucket="videos",
+                    key=f"uploads/{job_id}/a.mp4",
+                    status=JobStatus.submitted,
+                )
+            case 1:
+                store.update_job(job_id=job_id, status=JobStatus.processing)
+            case 2:
+                store.try_claim_idempotency(
+                    idempotency_key=f"s3://videos/{job_id}/{i}", job_id=job_id
+                )
+            case 3:
+                store.list_jobs(limit=50)
+            case _:
+                store.get_job(job_id)
+
+
+def run(store_cls: type[LocalSqliteStore], ops: int, threads: int) -> float:
+    with tempfile.TemporaryDirectory() as td:
+        store = store_cls(str(Path(td) / "bench.db"))
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for f in [pool.submit(_workload, store, t, ops // threads) for t in range(threads)]:
+                f.result()
+        elapsed = time.perf_counter() - start
+        store.close()
+    return ops / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ops", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    before = run(ReconnectingStore, args.ops, args.threads)
+    after = run(LocalSqliteStore, args.ops, args.threads)
+    print(f"per-call connections : {before:10.0f} ops/s")
+    print(f"per-thread connection: {after:10.0f} ops/s  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,12 +18,51 @@ resource "aws_dynamodb_table" "jobs" {
     type = "S"
   }
 
+  attribute {
+    name = "gsi2pk"
+    type = "S"
+  }
+
+  attribute {
+    name = "gsi3pk"
+    type = "S"
+  }
+
+  attribute {
+    name = "created_at"
+    type = "S"
+  }
+
   global_secondary_index {
     name            = "gsi1"
     hash_key        = "gsi1pk"
     range_key       = "gsi1sk"
     projection_type = "ALL"
   }
+
+  # /history?status=... Write-sharded like gsi1: gsi2pk = STATUS#<status>#<n>.
+  global_secondary_index {
+    name            = "gsi2"
+    hash_key        = "gsi2pk"
+    range_key       = "created_at"
+    projection_type = "ALL"
+  }
+
+  # /history?error_code=... gsi3pk = ERR#<code>#<n>, sparse: only failed jobs carry it.
+  global_secondary_index {
+    name            = "gsi3"
+    hash_key        = "gsi3pk"
+    range_key       = "created_at"
+    projection_type = "ALL"
+  }
+}
+
+locals {
+  # ResultProjection fields (minus video_codec, a key of its own index) and the summary.
+  result_search_attributes = [
+    "summary", "duration_s", "format_name", "bit_rate", "width", "height",
+    "audio_codec", "stream_count", "video_streams", "audio_streams",
+  ]
 }
 
 resource "aws_dynamodb_table" "results" {
@@ -35,6 +74,40 @@ resource "aws_dynamodb_table" "results" {
     name = "job_id"
     type = "S"
   }
+
+  attribute {
+    name = "catalog_pk"
+    type = "S"
+  }
+
+  attribute {
+    name = "completed_at"
+    type = "S"
+  }
+
+  attribute {
+    name = "video_codec_pk"
+    type = "S"
+  }
+
+  # /search without a codec: every result, write-sharded over CATALOG#<n>.
+  # Both indexes project the searchable attributes only, never metadata_gz.
+  global_secondary_index {
+    name               = "catalog"
+    hash_key           = "catalog_pk"
+    range_key          = "completed_at"
+    projection_type    = "INCLUDE"
+    non_key_attributes = concat(["video_codec"], local.result_search_attributes)
+  }
+
+  # /search?video_codec=...: sharded as <codec>#<n>, since h264 alone covers most files.
+  global_secondary_index {
+    name               = "video_codec"
+    hash_key           = "video_codec_pk"
+    range_key          = "completed_at"
+    projection_type    = "INCLUDE"
+    non_key_attributes = concat(["video_codec"], local.result_search_attributes)
+  }
 }
 
 resource "aws_dynamodb_table" "idempotency" {
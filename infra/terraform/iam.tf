@@ -28,6 +28,7 @@ data "aws_iam_policy_document" "task_runtime" {
     actions = [
       "s3:GetObject",
       "s3:PutObject",
+      "s3:AbortMultipartUpload",
       "s3:ListBucket"
     ]
     resources = [
@@ -41,13 +42,15 @@ data "aws_iam_policy_document" "task_runtime" {
       "dynamodb:GetItem",
       "dynamodb:PutItem",
       "dynamodb:UpdateItem",
+      "dynamodb:BatchWriteItem",
       "dynamodb:Query"
     ]
     resources = [
       aws_dynamodb_table.jobs.arn,
       aws_dynamodb_table.results.arn,
       aws_dynamodb_table.idempotency.arn,
-      "${aws_dynamodb_table.jobs.arn}/index/*"
+      "${aws_dynamodb_table.jobs.arn}/index/*",
+      "${aws_dynamodb_table.results.arn}/index/*"
     ]
   }
 
@@ -56,6 +59,7 @@ data "aws_iam_policy_document" "task_runtime" {
       "sqs:ReceiveMessage",
       "sqs:DeleteMessage",
       "sqs:SendMessage",
+      "sqs:ChangeMessageVisibility",
       "sqs:GetQueueAttributes"
     ]
     resources = [
@@ -20,6 +20,10 @@ data "aws_iam_policy_document" "sfn" {
       aws_dynamodb_table.idempotency.arn
     ]
   }
+  statement {
+    actions   = ["dynamodb:GetItem"]
+    resources = [aws_dynamodb_table.jobs.arn]
+  }
   statement {
     actions   = ["sqs:SendMessage"]
     resources = [aws_sqs_queue.jobs.arn]
@@ -48,6 +52,8 @@ locals {
               "job_id.$" = "$.job_id"
               "bucket.$" = "$.detail.bucket.name"
               "key.$"    = "$.detail.object.key"
+              "size.$"   = "$.detail.object.size"
+              "etag.$"   = "$.detail.object.etag"
             }
           }
         }
@@ -72,7 +78,79 @@ locals {
             Next        = "DoneDuplicate"
           }
         ]
-        Next = "Enqueue"
+        Next = "LoadJob"
+      }
+      # Jobs created through the API carry a priority and submitter; route those through
+      # SQS fair queues (MessageGroupId = submitter) so one tenant's backfill cannot
+      # crowd out everyone else. Objects without a job record keep the plain path.
+      LoadJob = {
+        Type     = "Task"
+        Resource = "arn:aws:states:::dynamodb:getItem"
+        Parameters = {
+          TableName            = aws_dynamodb_table.jobs.name
+          Key                  = { job_id = { "S.$" = "$.job_id" } }
+          ProjectionExpression = "priority, submitter"
+        }
+        ResultPath = "$.job"
+        Retry = [
+          {
+            ErrorEquals     = ["States.ALL"]
+            IntervalSeconds = 1
+            BackoffRate     = 2.0
+            MaxAttempts     = 3
+          }
+        ]
+        Next = "RouteByJob"
+      }
+      RouteByJob = {
+        Type = "Choice"
+        Choices = [
+          {
+            And = [
+              { Variable = "$.job.Item.priority.S", IsPresent = true },
+              { Variable = "$.job.Item.submitter.S", IsPresent = true }
+            ]
+            Next = "AddScheduling"
+          }
+        ]
+        Default = "Enqueue"
+      }
+      AddScheduling = {
+        Type = "Pass"
+        Parameters = {
+          "submitter.$" = "$.job.Item.submitter.S"
+          "message" = {
+            message_type = "ProcessVideo"
+            payload = {
+              "job_id.$"    = "$.job_id"
+              "bucket.$"    = "$.detail.bucket.name"
+              "key.$"       = "$.detail.object.key"
+              "size.$"      = "$.detail.object.size"
+              "etag.$"      = "$.detail.object.etag"
+              "priority.$"  = "$.job.Item.priority.S"
+              "submitter.$" = "$.job.Item.submitter.S"
+            }
+          }
+        }
+        Next = "EnqueueFair"
+      }
+      EnqueueFair = {
+        Type     = "Task"
+        Resource = "arn:aws:states:::sqs:sendMessage"
+        Parameters = {
+          QueueUrl           = aws_sqs_queue.jobs.id
+          "MessageBody.$"    = "States.JsonToString($.message)"
+          "MessageGroupId.$" = "$.submitter"
+        }
+        Retry = [
+          {
+            ErrorEquals     = ["States.ALL"]
+            IntervalSeconds = 1
+            BackoffRate     = 2.0
+            MaxAttempts     = 6
+          }
+        ]
+        End = true
       }
       Enqueue = {
         Type     = "Task"
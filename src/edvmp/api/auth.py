@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import time
 from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
 
@@ -7,7 +9,9 @@ import jwt
 from fastapi import Header, HTTPException
 from pydantic import BaseModel
 
+from edvmp.shared.cache import TtlLruCache
 from edvmp.shared.config import Settings
+from edvmp.shared.metrics import auth_cache_requests_total, auth_duration
 
 
 class LoginRequest(BaseModel):
@@ -33,19 +37,62 @@ def issue_token(settings: Settings, *, subject: str, ttl_seconds: int = 3600) ->
     return TokenResponse(access_token=token, expires_in=ttl_seconds)
 
 
+class TokenVerifier:
+    """Verifies bearer tokens, remembering recently verified ones by SHA-256 digest.
+
+    A cached token skips the decode and HMAC check until the earlier of its
+    ``exp`` and ``cache_ttl_s``; the cap bounds how long a rotated secret keeps
+    accepting old tokens. Rejected tokens are never cached.
+    """
+
+    def __init__(self, settings: Settings, *, max_entries: int, cache_ttl_s: float):
+        self._secret = settings.jwt_secret
+        self._issuer = settings.jwt_issuer
+        self._cache_ttl_s = cache_ttl_s
+        self._cache: TtlLruCache[bytes, str] = TtlLruCache(
+            max_entries=max_entries, ttl_s=cache_ttl_s
+        )
+
+    def verify(self, token: str) -> str:
+        """Return the token's subject, or raise HTTPException(401)."""
+        digest = hashlib.sha256(token.encode("utf-8")).digest()
+        subject = self._cache.get(digest)
+        if subject is not None:
+            auth_cache_requests_total.labels(result="hit").inc()
+            return subject
+        auth_cache_requests_total.labels(result="miss").inc()
+
+        try:
+            payload = jwt.decode(token, self._secret, algorithms=["HS256"])
+        except Exception as err:
+            raise HTTPException(status_code=401, detail="Invalid token") from err
+        if payload.get("iss") != self._issuer:
+            raise HTTPException(status_code=401, detail="Invalid token issuer")
+        subject = str(payload.get("sub") or "unknown")
+
+        ttl_s = self._cache_ttl_s
+        if isinstance(payload.get("exp"), int | float):
+            ttl_s = min(ttl_s, payload["exp"] - time.time())
+        self._cache.put(digest, subject, ttl_s=ttl_s)
+        return subject
+
+
 def make_get_current_user(settings: Settings) -> Callable[[str | None], str]:
+    verifier = TokenVerifier(
+        settings,
+        max_entries=settings.auth_cache_max_entries,
+        cache_ttl_s=settings.auth_cache_ttl_s,
+    )
+
     def get_current_user(
         authorization: str | None = Header(default=None),
     ) -> str:
-        if not authorization or not authorization.startswith("Bearer "):
-            raise HTTPException(status_code=401, detail="Missing bearer token")
-        token = authorization.removeprefix("Bearer ").strip()
+        start = time.perf_counter()
         try:
-            payload = jwt.decode(token, settings.jwt_secret, algorithms=["HS256"])
-        except Exception as err:
-            raise HTTPException(status_code=401, detail="Invalid token") from err
-        if payload.get("iss") != settings.jwt_issuer:
-            raise HTTPException(status_code=401, detail="Invalid token issuer")
-        return str(payload.get("sub") or "unknown")
+            if not authorization or not authorization.startswith("Bearer "):
+                raise HTTPException(status_code=401, detail="Missing bearer token")
+            return verifier.verify(authorization.removeprefix("Bearer ").strip())
+        finally:
+            auth_duration.observe(time.perf_counter() - start)
 
     return get_current_user
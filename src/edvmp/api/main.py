@@ -1,22 +1,47 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import itertools
+import json
 import logging
 import time
 import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime
+from typing import Annotated, Any
 
+import orjson
+import redis.asyncio
+from botocore.exceptions import ClientError
 from fastapi import Depends, FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 from edvmp.api.auth import LoginRequest, TokenResponse, issue_token, make_get_current_user
-from edvmp.shared.backends import get_store
+from edvmp.shared.backends import get_cached_store
 from edvmp.shared.config import Settings
+from edvmp.shared.events import AsyncRedisEventStream, EventFanout
 from edvmp.shared.http import prometheus_metrics_response
 from edvmp.shared.logging import configure_logging
-from edvmp.shared.metrics import api_metrics
-from edvmp.shared.models import JobStatus
-from edvmp.shared.s3 import ensure_bucket_exists, presign_put_url, s3_client
+from edvmp.shared.metrics import api_event_subscribers, api_metrics
+from edvmp.shared.models import JobPriority, JobRecord, JobStatus
+from edvmp.shared.pagination import InvalidCursor, JobQuery, ResultQuery
+from edvmp.shared.results import iter_metadata_json
+from edvmp.shared.s3 import (
+    MULTIPART_MAX_PARTS,
+    abort_multipart_upload,
+    complete_multipart_upload,
+    create_multipart_upload,
+    ensure_bucket_exists,
+    plan_multipart,
+    presign_put_url,
+    presign_upload_part_urls,
+    s3_client,
+)
+from edvmp.shared.store import JobsPartiallyCreated
 
 logger = logging.getLogger("edvmp.api")
 
@@ -24,6 +49,8 @@ logger = logging.getLogger("edvmp.api")
 class CreateJobRequest(BaseModel):
     filename: str = Field(min_length=1)
     content_type: str | None = None
+    # Scheduling class; defaults to interactive for single uploads and to the batch's priority.
+    priority: JobPriority | None = None
 
 
 class CreateJobResponse(BaseModel):
@@ -34,11 +61,109 @@ class CreateJobResponse(BaseModel):
     expires_in: int
 
 
+class CreateJobsBatchRequest(BaseModel):
+    jobs: list[CreateJobRequest] = Field(min_length=1)
+    priority: JobPriority = JobPriority.bulk
+
+
+class CreateJobsBatchResponse(BaseModel):
+    items: list[CreateJobResponse]
+
+
+PartNumber = Annotated[int, Field(ge=1, le=MULTIPART_MAX_PARTS)]
+
+
+class CreateMultipartJobRequest(BaseModel):
+    filename: str = Field(min_length=1)
+    size_bytes: int = Field(gt=0)
+    content_type: str | None = None
+    part_size_bytes: int | None = Field(default=None, gt=0)
+    priority: JobPriority = JobPriority.interactive
+
+
+class UploadPartUrl(BaseModel):
+    part_number: int
+    url: str
+
+
+class CreateMultipartJobResponse(BaseModel):
+    job_id: str
+    s3_bucket: str
+    s3_key: str
+    upload_id: str
+    part_size_bytes: int
+    parts: list[UploadPartUrl]
+    expires_in: int
+
+
+class PresignPartsRequest(BaseModel):
+    upload_id: str = Field(min_length=1)
+    part_numbers: list[PartNumber] = Field(min_length=1, max_length=MULTIPART_MAX_PARTS)
+
+
+class PresignPartsResponse(BaseModel):
+    parts: list[UploadPartUrl]
+    expires_in: int
+
+
+class CompletedPart(BaseModel):
+    part_number: PartNumber
+    etag: str = Field(min_length=1)
+
+
+class CompleteMultipartRequest(BaseModel):
+    upload_id: str = Field(min_length=1)
+    parts: list[CompletedPart] = Field(min_length=1, max_length=MULTIPART_MAX_PARTS)
+
+
+class AbortMultipartRequest(BaseModel):
+    upload_id: str = Field(min_length=1)
+
+
+_TERMINAL_STATUSES = frozenset({JobStatus.succeeded, JobStatus.failed})
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _etag(*parts: bytes) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part)
+    return f'"{digest.hexdigest()}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match", "")
+    return etag in (t.strip() for t in if_none_match.split(",")) or if_none_match.strip() == "*"
+
+
+def _json_with_etag(request: Request, model: BaseModel) -> Response:
+    """Serialize ``model`` with a content ETag; answer 304 when the client already has it."""
+    body = model.model_dump_json().encode("utf-8")
+    etag = _etag(body)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _multipart_error(e: ClientError) -> HTTPException:
+    code = e.response.get("Error", {}).get("Code")
+    if code == "NoSuchUpload":
+        return HTTPException(status_code=404, detail="Upload not found")
+    if code in ("InvalidPart", "InvalidPartOrder", "EntityTooSmall"):
+        return HTTPException(status_code=400, detail=f"Upload rejected by S3: {code}")
+    logger.error("multipart_s3_error", extra={"code": code, "error": str(e)})
+    return HTTPException(status_code=502, detail=f"S3 multipart call failed: {code}")
+
+
 def create_app() -> FastAPI:
     settings = Settings()
     configure_logging(settings.log_level)
 
-    store = get_store(settings)
+    store = get_cached_store(settings)
 
     s3_internal = s3_client(
         region_name=settings.s3_region,
@@ -58,7 +183,23 @@ def create_app() -> FastAPI:
 
     requests_total, latency = api_metrics(settings.prometheus_namespace)
 
-    app = FastAPI(title="event-driven-video-metadata-platform", version="0.1.0")
+    # Job status push rides the Redis events stream, which only exists in local/Redis mode.
+    # Elsewhere /jobs/{id}/events falls back to re-checking the store on every heartbeat.
+    events_redis: redis.asyncio.Redis | None = None
+    fanout: EventFanout | None = None
+    if settings.queue_backend == "redis":
+        events_redis = redis.asyncio.Redis.from_url(settings.redis_url)
+        fanout = EventFanout(AsyncRedisEventStream(events_redis, settings.redis_events_stream))
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        yield
+        if fanout is not None:
+            await fanout.aclose()
+        if events_redis is not None:
+            await events_redis.aclose()  # type: ignore[attr-defined]  # types-redis predates aclose()
+
+    app = FastAPI(title="event-driven-video-metadata-platform", version="0.1.0", lifespan=lifespan)
     get_current_user = make_get_current_user(settings)
 
     @app.middleware("http")
@@ -90,44 +231,341 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=401, detail="Invalid credentials")
         return issue_token(settings, subject=req.username)
 
+    def new_upload(filename: str, expires_in: int) -> CreateJobResponse:
+        job_id = str(uuid.uuid4())
+        key = f"uploads/{job_id}/{filename}"
+        # Presigning is a local signature computation; no request reaches S3.
+        url = presign_put_url(s3_presign, settings.s3_bucket, key, expires_in=expires_in)
+        return CreateJobResponse(
+            job_id=job_id,
+            s3_bucket=settings.s3_bucket,
+            s3_key=key,
+            upload_url=url,
+            expires_in=expires_in,
+        )
+
     @app.post("/jobs", response_model=CreateJobResponse)
     def create_job(req: CreateJobRequest, user: str = Depends(get_current_user)):
+        job = new_upload(req.filename, expires_in=900)
+        store.create_job_if_missing(
+            job_id=job.job_id,
+            bucket=job.s3_bucket,
+            key=job.s3_key,
+            status=JobStatus.awaiting_upload,
+            priority=req.priority or JobPriority.interactive,
+            submitter=user,
+        )
+        logger.info("job_created", extra={"job_id": job.job_id, "user": user, "s3_key": job.s3_key})
+        return job
+
+    @app.post("/jobs:batch", response_model=CreateJobsBatchResponse)
+    def create_jobs_batch(req: CreateJobsBatchRequest, user: str = Depends(get_current_user)):
+        if len(req.jobs) > settings.api_batch_max_jobs:
+            raise HTTPException(
+                status_code=422,
+                detail=f"At most {settings.api_batch_max_jobs} jobs per batch",
+            )
+        jobs = [new_upload(j.filename, expires_in=900) for j in req.jobs]
+        by_priority: dict[JobPriority, dict[str, str]] = {}
+        for spec, job in zip(req.jobs, jobs, strict=True):
+            by_priority.setdefault(spec.priority or req.priority, {})[job.job_id] = job.s3_key
+        created: list[str] = []
+        try:
+            for priority, keys in by_priority.items():
+                try:
+                    store.create_jobs(
+                        bucket=settings.s3_bucket,
+                        jobs=keys,
+                        status=JobStatus.awaiting_upload,
+                        priority=priority,
+                        submitter=user,
+                    )
+                except JobsPartiallyCreated as e:
+                    created.extend(e.written)
+                    raise
+                created.extend(keys)
+        except Exception as e:
+            if not created:
+                raise
+            # DynamoDB writes are not atomic across chunks: hand back the jobs that exist so
+            # the client can upload those and resubmit only the rest.
+            logger.exception(
+                "jobs_batch_partially_created",
+                extra={"written": len(created), "count": len(jobs), "user": user},
+            )
+            stored = set(created)
+            raise HTTPException(
+                status_code=503,
+                detail={
+                    "message": f"Only {len(stored)} of {len(jobs)} jobs were created",
+                    "items": [j.model_dump(mode="json") for j in jobs if j.job_id in stored],
+                },
+            ) from e
+        logger.info("jobs_batch_created", extra={"count": len(jobs), "user": user})
+        return CreateJobsBatchResponse(items=jobs)
+
+    def multipart_job_key(job_id: str) -> str:
+        job: JobRecord | None = store.get_job(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if job.status != JobStatus.awaiting_upload:
+            raise HTTPException(
+                status_code=409, detail=f"Job is {job.status.value}, not awaiting upload"
+            )
+        return job.s3_key
+
+    def part_urls(key: str, upload_id: str, part_numbers: list[int]) -> list[UploadPartUrl]:
+        urls = presign_upload_part_urls(
+            s3_presign,
+            settings.s3_bucket,
+            key,
+            upload_id,
+            part_numbers,
+            expires_in=settings.s3_multipart_url_expires_s,
+        )
+        return [UploadPartUrl(part_number=n, url=u) for n, u in zip(part_numbers, urls, strict=True)]
+
+    @app.post("/jobs:multipart", response_model=CreateMultipartJobResponse)
+    def create_multipart_job(req: CreateMultipartJobRequest, user: str = Depends(get_current_user)):
+        try:
+            part_size, part_count = plan_multipart(
+                req.size_bytes, req.part_size_bytes or settings.s3_multipart_part_size_bytes
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=413, detail=str(e)) from e
+
         job_id = str(uuid.uuid4())
         key = f"uploads/{job_id}/{req.filename}"
-        expires_in = 900
-        url = presign_put_url(s3_presign, settings.s3_bucket, key, expires_in=expires_in)
-
+        upload_id = create_multipart_upload(s3_internal, settings.s3_bucket, key, req.content_type)
         store.create_job_if_missing(
-            job_id=job_id, bucket=settings.s3_bucket, key=key, status=JobStatus.awaiting_upload
+            job_id=job_id,
+            bucket=settings.s3_bucket,
+            key=key,
+            status=JobStatus.awaiting_upload,
+            priority=req.priority,
+            submitter=user,
         )
-        logger.info("job_created", extra={"job_id": job_id, "user": user, "s3_key": key})
-        return CreateJobResponse(
+        logger.info(
+            "multipart_job_created",
+            extra={"job_id": job_id, "user": user, "s3_key": key, "parts": part_count},
+        )
+        return CreateMultipartJobResponse(
             job_id=job_id,
             s3_bucket=settings.s3_bucket,
             s3_key=key,
-            upload_url=url,
-            expires_in=expires_in,
+            upload_id=upload_id,
+            part_size_bytes=part_size,
+            parts=part_urls(key, upload_id, list(range(1, part_count + 1))),
+            expires_in=settings.s3_multipart_url_expires_s,
         )
 
+    @app.post("/jobs/{job_id}/multipart:presign", response_model=PresignPartsResponse)
+    def presign_multipart_parts(
+        job_id: str, req: PresignPartsRequest, _: str = Depends(get_current_user)
+    ):
+        """Fresh part URLs for resuming an upload after the originals expired."""
+        key = multipart_job_key(job_id)
+        return PresignPartsResponse(
+            parts=part_urls(key, req.upload_id, req.part_numbers),
+            expires_in=settings.s3_multipart_url_expires_s,
+        )
+
+    @app.post("/jobs/{job_id}/multipart:complete")
+    def complete_multipart(
+        job_id: str, req: CompleteMultipartRequest, user: str = Depends(get_current_user)
+    ):
+        key = multipart_job_key(job_id)
+        try:
+            etag = complete_multipart_upload(
+                s3_internal,
+                settings.s3_bucket,
+                key,
+                req.upload_id,
+                [(p.part_number, p.etag) for p in req.parts],
+            )
+        except ClientError as e:
+            raise _multipart_error(e) from e
+        # The ObjectCreated event for the finished object drives the job from here.
+        logger.info("multipart_upload_completed", extra={"job_id": job_id, "user": user})
+        return {"job_id": job_id, "s3_key": key, "etag": etag}
+
+    @app.post("/jobs/{job_id}/multipart:abort")
+    def abort_multipart(
+        job_id: str, req: AbortMultipartRequest, user: str = Depends(get_current_user)
+    ):
+        key = multipart_job_key(job_id)
+        try:
+            abort_multipart_upload(s3_internal, settings.s3_bucket, key, req.upload_id)
+        except ClientError as e:
+            raise _multipart_error(e) from e
+        store.update_job(
+            job_id=job_id,
+            status=JobStatus.failed,
+            error_code="upload_aborted",
+            error_message="Multipart upload aborted by client",
+        )
+        logger.info("multipart_upload_aborted", extra={"job_id": job_id, "user": user})
+        return {"job_id": job_id, "status": JobStatus.failed.value}
+
     @app.get("/jobs/{job_id}")
-    def get_job(job_id: str, _: str = Depends(get_current_user)):
+    def get_job(job_id: str, request: Request, _: str = Depends(get_current_user)):
         job = store.get_job(job_id)
         if job is None:
             raise HTTPException(status_code=404, detail="Job not found")
-        return job.model_dump(mode="json")
+        return _json_with_etag(request, job)
+
+    @app.get("/jobs/{job_id}/events")
+    async def job_events(job_id: str, _: str = Depends(get_current_user)):
+        """Server-sent events: the job's current state, then each status change until it is terminal."""
+        # Subscribe before the snapshot so a completion landing in between is not missed.
+        queue = await fanout.subscribe(job_id) if fanout is not None else None
+        job: JobRecord | None = await run_in_threadpool(store.get_job, job_id)
+        if job is None:
+            if queue is not None and fanout is not None:
+                fanout.unsubscribe(job_id, queue)
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        async def stream() -> AsyncIterator[str]:
+            api_event_subscribers.inc()
+            try:
+                # Without a fan-out nothing feeds this queue, so every wait ends in a store re-check.
+                events = queue if queue is not None else asyncio.Queue()
+                status = job.status
+                yield _sse("status", job.model_dump(mode="json"))
+                while status not in _TERMINAL_STATUSES:
+                    try:
+                        event = await asyncio.wait_for(events.get(), settings.api_sse_heartbeat_s)
+                    except TimeoutError:
+                        current: JobRecord | None = await run_in_threadpool(store.get_job, job_id)
+                        if current is not None and current.status != status:
+                            status = current.status
+                            yield _sse("status", current.model_dump(mode="json"))
+                        else:
+                            yield ": keepalive\n\n"
+                        continue
+                    if "status" not in event:
+                        continue
+                    # Send the same JobRecord shape as the snapshot. The event wins over a
+                    # cached read that has not caught up with it yet.
+                    current = await run_in_threadpool(store.get_job, job_id)
+                    if current is None:
+                        continue
+                    if current.status != event["status"]:
+                        fields = ("status", "error_code", "error_message")
+                        current = JobRecord.model_validate(
+                            current.model_dump() | {k: event[k] for k in fields if k in event}
+                        )
+                    status = current.status
+                    yield _sse("status", current.model_dump(mode="json"))
+            finally:
+                api_event_subscribers.dec()
+                if queue is not None and fanout is not None:
+                    fanout.unsubscribe(job_id, queue)
+
+        return StreamingResponse(
+            stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
 
     @app.get("/jobs/{job_id}/result")
-    def get_result(job_id: str, _: str = Depends(get_current_user)):
-        result = store.get_result(job_id)
-        if result is None:
+    def get_result(
+        job_id: str, request: Request, full: bool = False, _: str = Depends(get_current_user)
+    ):
+        """Summary and metadata projection; ``full=true`` adds the complete ffprobe payload.
+
+        The full payload is streamed as it is inflated and never parsed, so a
+        multi-MB document costs neither a JSON round-trip nor a full copy in memory.
+        """
+        if not full:
+            result = store.get_result(job_id)
+            if result is None:
+                raise HTTPException(status_code=404, detail="Result not found")
+            return _json_with_etag(request, result)
+
+        payload = store.get_result_payload(job_id)
+        if payload is None:
             raise HTTPException(status_code=404, detail="Result not found")
-        return result.model_dump(mode="json")
+        result, blob = payload
+        # Reopen the serialized result and splice the stored document in as its last field.
+        head = result.model_dump_json(exclude={"metadata"}).encode("utf-8")[:-1] + b',"metadata":'
+        etag = _etag(head, blob)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _not_modified(request, etag):
+            return Response(status_code=304, headers=headers)
+        return StreamingResponse(
+            itertools.chain((head,), iter_metadata_json(blob), (b"}",)),
+            media_type="application/json",
+            headers=headers,
+        )
 
     @app.get("/history")
-    def history(limit: int = 50, _: str = Depends(get_current_user)):
+    def history(
+        request: Request,
+        limit: int = 50,
+        cursor: str | None = None,
+        status: JobStatus | None = None,
+        error_code: str | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        _: str = Depends(get_current_user),
+    ):
+        limit = max(1, min(200, limit))
+        query = JobQuery(
+            status=status,
+            error_code=error_code,
+            created_after=created_after,
+            created_before=created_before,
+        )
+        try:
+            page = store.list_job_rows(limit=limit, cursor=cursor, query=query)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        # Rows come from the store as JSON-ready dicts; orjson encodes them without a model pass.
+        if "application/x-ndjson" in request.headers.get("accept", ""):
+            headers = {"X-Next-Cursor": page.next_cursor} if page.next_cursor else None
+            return StreamingResponse(
+                (orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE) for row in page.items),
+                media_type="application/x-ndjson",
+                headers=headers,
+            )
+        return Response(
+            content=orjson.dumps({"items": page.items, "next_cursor": page.next_cursor}),
+            media_type="application/json",
+        )
+
+    @app.get("/search")
+    def search(
+        limit: int = 50,
+        cursor: str | None = None,
+        video_codec: str | None = None,
+        audio_codec: str | None = None,
+        format_name: str | None = None,
+        min_width: int | None = None,
+        min_height: int | None = None,
+        min_duration_s: float | None = None,
+        max_duration_s: float | None = None,
+        _: str = Depends(get_current_user),
+    ):
+        """Catalog search over result projections, newest first, e.g. ``?video_codec=hevc&min_height=2160``."""
         limit = max(1, min(200, limit))
-        jobs = store.list_jobs(limit=limit)
-        return {"items": [j.model_dump(mode="json") for j in jobs]}
+        query = ResultQuery(
+            video_codec=video_codec.lower() if video_codec else None,
+            audio_codec=audio_codec.lower() if audio_codec else None,
+            format_name=format_name,
+            min_width=min_width,
+            min_height=min_height,
+            min_duration_s=min_duration_s,
+            max_duration_s=max_duration_s,
+        )
+        try:
+            page = store.search_results(limit=limit, cursor=cursor, query=query)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        return {
+            "items": [hit.model_dump(mode="json") for hit in page.items],
+            "next_cursor": page.next_cursor,
+        }
 
     @app.exception_handler(RuntimeError)
     async def runtime_error_handler(_: Request, exc: RuntimeError):
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Any
 from urllib.parse import unquote_plus
 
-import redis
+import redis.asyncio
 from fastapi import FastAPI, Request
 
 from edvmp.shared.config import Settings
-from edvmp.shared.events import RedisEventStream
+from edvmp.shared.events import AsyncRedisEventStream, PublishBatcher
 from edvmp.shared.http import prometheus_metrics_response
 from edvmp.shared.logging import configure_logging
 from edvmp.shared.models import JobCompletedEvent, ObjectCreatedEvent
@@ -46,10 +48,16 @@ def create_app() -> FastAPI:
     settings = Settings()
     configure_logging(settings.log_level)
 
-    r = redis.Redis.from_url(settings.redis_url)
-    stream = RedisEventStream(r, settings.redis_events_stream)
+    r = redis.asyncio.Redis.from_url(settings.redis_url)
+    stream = AsyncRedisEventStream(r, settings.redis_events_stream)
+    publisher = PublishBatcher(stream, window_s=settings.eventbus_batch_window_ms / 1000)
 
-    app = FastAPI(title="edvmp-eventbus", version="0.1.0")
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        yield
+        await r.aclose()  # type: ignore[attr-defined]  # types-redis predates aclose()
+
+    app = FastAPI(title="edvmp-eventbus", version="0.1.0", lifespan=lifespan)
 
     @app.get("/healthz")
     def healthz():
@@ -63,16 +71,14 @@ def create_app() -> FastAPI:
     async def minio_webhook(request: Request):
         payload = await request.json()
         events = _parse_minio_webhook(payload)
-        published = 0
-        for event in events:
-            stream.publish(event.model_dump(mode="json"))
-            published += 1
+        await publisher.publish_many([event.model_dump(mode="json") for event in events])
+        published = len(events)
         logger.info("minio_webhook_published", extra={"count": published})
         return {"published": published}
 
     @app.post("/events/job-completed")
     async def job_completed(event: JobCompletedEvent):
-        stream.publish(event.model_dump(mode="json"))
+        await publisher.publish_many([event.model_dump(mode="json")])
         return {"published": 1}
 
     return app
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import logging
 import time
-from dataclasses import dataclass
-from typing import Protocol
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+from typing import Any, Protocol
 
 from edvmp.shared.models import JobCompletedEvent, JobStatus, ObjectCreatedEvent
 from edvmp.shared.queue import QueueMessage
 from edvmp.shared.store import LocalSqliteStore
 
+logger = logging.getLogger("edvmp.orchestrator")
+
 
 def job_id_from_s3_key(key: str) -> str | None:
     parts = key.split("/")
@@ -27,29 +31,64 @@ class QueueWriter(Protocol):
     def enqueue(self, message: QueueMessage) -> None: ...
 
 
+@dataclass(frozen=True)
+class BatchResult:
+    decisions: list[OrchestratorDecision] = field(default_factory=list)
+    messages: list[QueueMessage] = field(default_factory=list)
+    ack_ids: list[str] = field(default_factory=list)
+    failed_ids: list[str] = field(default_factory=list)
+    enqueued_keys: list[str] = field(default_factory=list)
+
+
 def handle_object_created(
     *,
     store: LocalSqliteStore,
     queue: QueueWriter,
     event: ObjectCreatedEvent,
 ) -> OrchestratorDecision:
+    decision, message = _plan_object_created(store=store, event=event)
+    if message is not None:
+        queue.enqueue(message)
+        store.mark_idempotency_enqueued([decision.idempotency_key])
+    return decision
+
+
+def _plan_object_created(
+    *, store: LocalSqliteStore, event: ObjectCreatedEvent
+) -> tuple[OrchestratorDecision, QueueMessage | None]:
     job_id = job_id_from_s3_key(event.key) or f"job-{int(time.time() * 1000)}"
     idempotency_key = f"s3://{event.bucket}/{event.key}"
 
+    action = "enqueued"
     claimed = store.try_claim_idempotency(idempotency_key=idempotency_key, job_id=job_id)
-    if not claimed:
-        return OrchestratorDecision(action="skip_duplicate", job_id=job_id, idempotency_key=idempotency_key)
+    if claimed:
+        store.create_job_if_missing(job_id=job_id, bucket=event.bucket, key=event.key, status=JobStatus.submitted)
+        store.update_job(job_id=job_id, status=JobStatus.processing)
+    else:
+        # A claim can commit while the enqueue after it fails; the event is then redelivered
+        # and must emit the job again rather than be dropped as a duplicate.
+        pending_job_id = store.pending_idempotency_claim(idempotency_key)
+        pending = store.get_job(pending_job_id) if pending_job_id else None
+        if pending is None or pending.status not in (JobStatus.submitted, JobStatus.processing):
+            return OrchestratorDecision(action="skip_duplicate", job_id=job_id, idempotency_key=idempotency_key), None
+        job_id, action = pending.job_id, "reenqueued"
 
-    store.create_job_if_missing(job_id=job_id, bucket=event.bucket, key=event.key, status=JobStatus.submitted)
-    store.update_job(job_id=job_id, status=JobStatus.processing)
-
-    queue.enqueue(
-        QueueMessage(
-            message_type="ProcessVideo",
-            payload={"job_id": job_id, "bucket": event.bucket, "key": event.key},
-        )
+    payload: dict[str, Any] = {"job_id": job_id, "bucket": event.bucket, "key": event.key}
+    # Scheduling hints recorded when the job was created through the API.
+    job = store.get_job(job_id)
+    if job is not None:
+        payload["priority"] = job.priority.value
+        if job.submitter:
+            payload["submitter"] = job.submitter
+    # Size lets the worker plan ranged probe reads without a HEAD request.
+    if event.size is not None:
+        payload["size"] = event.size
+    if event.etag is not None:
+        payload["etag"] = event.etag
+    return (
+        OrchestratorDecision(action=action, job_id=job_id, idempotency_key=idempotency_key),
+        QueueMessage(message_type="ProcessVideo", payload=payload),
     )
-    return OrchestratorDecision(action="enqueued", job_id=job_id, idempotency_key=idempotency_key)
 
 
 def handle_job_completed(*, store: LocalSqliteStore, event: JobCompletedEvent) -> None:
@@ -59,3 +98,54 @@ def handle_job_completed(*, store: LocalSqliteStore, event: JobCompletedEvent) -
         error_code=event.error_code,
         error_message=event.error_message,
     )
+
+
+def handle_event_batch(
+    *,
+    store: LocalSqliteStore,
+    events: Sequence[tuple[str, dict[str, Any]]],
+) -> BatchResult:
+    """Apply a whole stream read batch in one SQLite transaction.
+
+    Each event runs in its own savepoint, so a bad event is rolled back and
+    reported in ``failed_ids`` (left unacked) without affecting the rest. The
+    returned messages must be enqueued, and ``ack_ids`` acknowledged, only
+    after this returns, i.e. after the transaction has committed; then
+    ``enqueued_keys`` are confirmed with ``mark_idempotency_enqueued``.
+    """
+    result = BatchResult()
+    with store.transaction():
+        for message_id, event in events:
+            try:
+                with store.transaction():
+                    event_type = event.get("event_type")
+                    if event_type == "ObjectCreated":
+                        decision, message = _plan_object_created(
+                            store=store, event=ObjectCreatedEvent.model_validate(event)
+                        )
+                        if decision.idempotency_key in result.enqueued_keys:
+                            # Repeated within this batch; its claim is unconfirmed only until commit.
+                            decision, message = replace(decision, action="skip_duplicate"), None
+                        result.decisions.append(decision)
+                        if message is not None:
+                            result.messages.append(message)
+                            result.enqueued_keys.append(decision.idempotency_key)
+                        logger.info(
+                            "object_created_handled",
+                            extra={
+                                "action": decision.action,
+                                "job_id": decision.job_id,
+                                "idempotency_key": decision.idempotency_key,
+                            },
+                        )
+                    elif event_type == "JobCompleted":
+                        completed = JobCompletedEvent.model_validate(event)
+                        handle_job_completed(store=store, event=completed)
+                        logger.info("job_status_updated", extra=completed.model_dump(mode="json"))
+                    else:
+                        logger.warning("unknown_event_type", extra={"event_type": event_type, "event": event})
+                result.ack_ids.append(message_id)
+            except Exception:
+                result.failed_ids.append(message_id)
+                logger.exception("orchestrator_event_failed", extra={"message_id": message_id, "event": event})
+    return result
@@ -4,15 +4,21 @@ import logging
 import os
 import socket
 import time
+from typing import Any
 
 import redis
+from prometheus_client import start_http_server
 
-from edvmp.orchestrator.handlers import handle_job_completed, handle_object_created
+from edvmp.orchestrator.handlers import handle_event_batch
+from edvmp.shared.backends import redis_jobs_queue
 from edvmp.shared.config import Settings
 from edvmp.shared.events import RedisEventStream
 from edvmp.shared.logging import configure_logging
-from edvmp.shared.models import JobCompletedEvent, ObjectCreatedEvent
-from edvmp.shared.queue import RedisQueue
+from edvmp.shared.metrics import (
+    event_stream_oldest_pending_age,
+    event_stream_pending,
+    event_stream_reclaimed_total,
+)
 from edvmp.shared.store import LocalSqliteStore
 
 logger = logging.getLogger("edvmp.orchestrator")
@@ -30,7 +36,7 @@ def main() -> None:
     stream.ensure_consumer_group(group_name)
 
     store = LocalSqliteStore(settings.db_path)
-    queue = RedisQueue(r, settings.redis_jobs_queue)
+    queue = redis_jobs_queue(r, settings)
 
     logger.info(
         "orchestrator_started",
@@ -40,47 +46,78 @@ def main() -> None:
             "queue": settings.redis_jobs_queue,
             "db_path": settings.db_path,
             "consumer": consumer_name,
+            "metrics_port": settings.orchestrator_metrics_port,
         },
     )
 
+    start_http_server(settings.orchestrator_metrics_port)
+
+    next_maintenance = 0.0
     while True:
         try:
-            messages = stream.read_group(group_name=group_name, consumer_name=consumer_name)
+            messages: list[tuple[str, dict[str, Any]]] = []
+            if time.monotonic() >= next_maintenance:
+                messages = _maintain(stream, settings, group_name, consumer_name)
+                # Keep claiming back-to-back while the pending list still has idle entries.
+                full = len(messages) >= settings.orchestrator_read_count
+                next_maintenance = time.monotonic() + (0 if full else settings.orchestrator_maintenance_interval_s)
+            if not messages:
+                messages = stream.read_group(
+                    group_name=group_name,
+                    consumer_name=consumer_name,
+                    block_ms=settings.orchestrator_block_ms,
+                    count=settings.orchestrator_read_count,
+                )
             if not messages:
                 continue
-            for message_id, event in messages:
-                try:
-                    event_type = event.get("event_type")
-                    if event_type == "ObjectCreated":
-                        decision = handle_object_created(
-                            store=store, queue=queue, event=ObjectCreatedEvent.model_validate(event)
-                        )
-                        logger.info(
-                            "object_created_handled",
-                            extra={
-                                "action": decision.action,
-                                "job_id": decision.job_id,
-                                "idempotency_key": decision.idempotency_key,
-                            },
-                        )
-
-                    elif event_type == "JobCompleted":
-                        completed = JobCompletedEvent.model_validate(event)
-                        handle_job_completed(store=store, event=completed)
-                        logger.info("job_status_updated", extra=completed.model_dump(mode="json"))
-                    else:
-                        logger.warning("unknown_event_type", extra={"event_type": event_type, "event": event})
-
-                    stream.ack(group_name, message_id)
-                except Exception:
-                    logger.exception(
-                        "orchestrator_event_failed",
-                        extra={"message_id": message_id, "event": event},
-                    )
+            result = handle_event_batch(store=store, events=messages)
+            # Only once the batch transaction has committed: the enqueues in one MULTI on the
+            # queue's hash slot, then the XACKs. The stream lives in another Cluster slot, so
+            # the two cannot share a transaction; a crash in between redelivers the events,
+            # and an unconfirmed claim re-enqueues its job (at least once, never lost).
+            pipe = r.pipeline(transaction=True)
+            queue.enqueue_many(result.messages, pipe=pipe)
+            pipe.execute()
+            store.mark_idempotency_enqueued(result.enqueued_keys)
+            stream.ack_many(group_name, result.ack_ids)
+            logger.info(
+                "orchestrator_batch_applied",
+                extra={
+                    "events": len(messages),
+                    "enqueued": len(result.messages),
+                    "failed": len(result.failed_ids),
+                },
+            )
         except Exception:
             logger.exception("orchestrator_loop_failed")
             time.sleep(1)
 
 
+def _maintain(
+    stream: RedisEventStream, settings: Settings, group_name: str, consumer_name: str
+) -> list[tuple[str, dict[str, Any]]]:
+    """Reclaim idle pending entries, publish consumer lag and forget consumers that scaled away."""
+    claimed = stream.claim_pending(
+        group_name=group_name,
+        consumer_name=consumer_name,
+        min_idle_ms=settings.orchestrator_claim_idle_ms,
+        count=settings.orchestrator_read_count,
+        max_deliveries=settings.orchestrator_max_deliveries,
+        dlq_name=settings.redis_dlq,
+    )
+    if claimed:
+        event_stream_reclaimed_total.labels(group=group_name).inc(len(claimed))
+        logger.warning("orchestrator_reclaimed_pending", extra={"count": len(claimed)})
+
+    stats = stream.pending_stats(group_name)
+    event_stream_pending.labels(group=group_name).set(stats.count)
+    event_stream_oldest_pending_age.labels(group=group_name).set(stats.oldest_age_s)
+
+    removed = stream.remove_idle_consumers(group_name, min_idle_ms=settings.orchestrator_consumer_idle_ms)
+    if removed:
+        logger.info("orchestrator_removed_idle_consumers", extra={"consumers": removed})
+    return claimed
+
+
 if __name__ == "__main__":
     main()
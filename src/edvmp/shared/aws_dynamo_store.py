@@ -1,12 +1,60 @@
 from __future__ import annotations
 
+import heapq
+import itertools
+import time
+import zlib
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from typing import Any
 
 import boto3
 from botocore.exceptions import ClientError
 
-from edvmp.shared.models import JobRecord, JobResult, JobStatus
+from edvmp.shared.models import (
+    JobPriority,
+    JobRecord,
+    JobResult,
+    JobStatus,
+    ResultProjection,
+    SearchHit,
+)
+from edvmp.shared.pagination import (
+    InvalidCursor,
+    JobPage,
+    JobQuery,
+    ResultQuery,
+    RowPage,
+    SearchPage,
+    decode_cursor,
+    encode_cursor,
+    iso_utc,
+    json_timestamp,
+)
+from edvmp.shared.results import compress_metadata, decompress_metadata, project_metadata
+from edvmp.shared.store import JobsPartiallyCreated
+
+# (index name, partition attribute, sort attribute) per filter shape. gsi1 holds every
+# job, write-sharded over HISTORY#<n>. gsi2 and gsi3 narrow that to one status or error
+# code and are sharded the same way (STATUS#<status>#<n>, ERR#<code>#<n>): a handful of
+# distinct values would otherwise put every job write on one or two GSI partitions.
+# gsi3pk is only written for failed jobs, so gsi3 is sparse.
+_HISTORY_INDEX = ("gsi1", "gsi1pk", "gsi1sk")
+_STATUS_INDEX = ("gsi2", "gsi2pk", "created_at")
+_ERROR_INDEX = ("gsi3", "gsi3pk", "created_at")
+_HISTORY_PK = "HISTORY"
+_STATUS_PK = "STATUS"
+_ERROR_PK = "ERR"
+# Results table indexes for /search. Every result is written under CATALOG#<n> and, when
+# it has a video stream, under <codec>#<n> (both sharded like history, since a few codecs
+# cover nearly every file); video_codec_pk is sparse, and both project only the searchable
+# attributes.
+_CATALOG_INDEX = ("catalog", "catalog_pk", "completed_at")
+_VIDEO_CODEC_INDEX = ("video_codec", "video_codec_pk", "completed_at")
+_CATALOG_PK = "CATALOG"
+_BATCH_WRITE_MAX = 25
+_BATCH_WRITE_ATTEMPTS = 5
 
 
 def _utc_now_iso() -> str:
@@ -14,24 +62,39 @@ def _utc_now_iso() -> str:
 
 
 class AwsDynamoStore:
-    def __init__(self, *, region_name: str, jobs_table: str, results_table: str, idempotency_table: str):
+    def __init__(
+        self,
+        *,
+        region_name: str,
+        jobs_table: str,
+        results_table: str,
+        idempotency_table: str,
+        history_shards: int = 8,
+        read_legacy_history: bool = True,
+    ):
         self._ddb = boto3.client("dynamodb", region_name=region_name)
         self._jobs_table = jobs_table
         self._results_table = results_table
         self._idempotency_table = idempotency_table
+        # New jobs are spread over HISTORY#0..n-1 so no single gsi1 partition takes every write.
+        # Until backfill_history_shards has run, reads also include the legacy HISTORY partition.
+        self._history_shards = max(1, history_shards)
+        self._read_legacy_history = read_legacy_history
+        self._history_pool = ThreadPoolExecutor(
+            max_workers=self._history_shards + 1, thread_name_prefix="edvmp-ddb-history"
+        )
 
-    def create_job_if_missing(self, *, job_id: str, bucket: str, key: str, status: JobStatus) -> None:
-        now = _utc_now_iso()
-        item = {
-            "job_id": {"S": job_id},
-            "status": {"S": status.value},
-            "created_at": {"S": now},
-            "updated_at": {"S": now},
-            "s3_bucket": {"S": bucket},
-            "s3_key": {"S": key},
-            "gsi1pk": {"S": "HISTORY"},
-            "gsi1sk": {"S": now},
-        }
+    def create_job_if_missing(
+        self,
+        *,
+        job_id: str,
+        bucket: str,
+        key: str,
+        status: JobStatus,
+        priority: JobPriority = JobPriority.standard,
+        submitter: str | None = None,
+    ) -> None:
+        item = self._new_job_item(job_id, bucket, key, status, _utc_now_iso(), priority, submitter)
         try:
             self._ddb.put_item(
                 TableName=self._jobs_table,
@@ -43,6 +106,56 @@ class AwsDynamoStore:
                 return
             raise
 
+    def create_jobs(
+        self,
+        *,
+        bucket: str,
+        jobs: Mapping[str, str],
+        status: JobStatus,
+        priority: JobPriority = JobPriority.standard,
+        submitter: str | None = None,
+    ) -> None:
+        """Write many new jobs (``job_id -> s3 key``) with BatchWriteItem, 25 items per request.
+
+        BatchWriteItem takes no condition expressions, so unlike
+        ``create_job_if_missing`` this overwrites an existing job_id; callers pass
+        freshly generated ids. Unprocessed items are retried with backoff. Chunks
+        are not atomic together: a failure after some jobs were stored raises
+        ``JobsPartiallyCreated`` listing them.
+        """
+        now = _utc_now_iso()
+        requests = [
+            {
+                "PutRequest": {
+                    "Item": self._new_job_item(job_id, bucket, key, status, now, priority, submitter)
+                }
+            }
+            for job_id, key in jobs.items()
+        ]
+        written: list[str] = []
+        for start in range(0, len(requests), _BATCH_WRITE_MAX):
+            pending = requests[start : start + _BATCH_WRITE_MAX]
+            chunk = [r["PutRequest"]["Item"]["job_id"]["S"] for r in pending]
+            try:
+                for attempt in range(_BATCH_WRITE_ATTEMPTS):
+                    if attempt:
+                        time.sleep(min(2.0, 0.05 * 2**attempt))
+                    res = self._ddb.batch_write_item(RequestItems={self._jobs_table: pending})
+                    pending = (res.get("UnprocessedItems") or {}).get(self._jobs_table) or []
+                    if not pending:
+                        break
+                else:
+                    raise RuntimeError(f"DynamoDB left {len(pending)} job writes unprocessed")
+            except Exception as e:
+                left = {r["PutRequest"]["Item"]["job_id"]["S"] for r in pending}
+                written.extend(job_id for job_id in chunk if job_id not in left)
+                if not written:
+                    raise
+                raise JobsPartiallyCreated(
+                    f"{e}; {len(written)} of {len(requests)} jobs were written", written
+                ) from e
+            written.extend(chunk)
+
     def update_job(
         self,
         *,
@@ -52,18 +165,26 @@ class AwsDynamoStore:
         error_message: str | None = None,
     ) -> None:
         now = _utc_now_iso()
-        expr = "SET #s = :s, updated_at = :u, error_code = :ec, error_message = :em"
+        expr = "SET #s = :s, gsi2pk = :g2, updated_at = :u, error_message = :em"
+        values = {
+            ":s": {"S": status.value},
+            ":g2": {"S": self._status_pk(job_id, status.value)},
+            ":u": {"S": now},
+            ":em": {"S": error_message or ""},
+        }
+        if error_code:
+            expr += ", error_code = :ec, gsi3pk = :g3"
+            values[":ec"] = {"S": error_code}
+            values[":g3"] = {"S": self._error_pk(job_id, error_code)}
+        else:
+            # Absent rather than "" keeps the job out of the sparse error_code index.
+            expr += " REMOVE error_code, gsi3pk"
         self._ddb.update_item(
             TableName=self._jobs_table,
             Key={"job_id": {"S": job_id}},
             UpdateExpression=expr,
             ExpressionAttributeNames={"#s": "status"},
-            ExpressionAttributeValues={
-                ":s": {"S": status.value},
-                ":u": {"S": now},
-                ":ec": {"S": error_code or ""},
-                ":em": {"S": error_message or ""},
-            },
+            ExpressionAttributeValues=values,
         )
 
     def get_job(self, job_id: str) -> JobRecord | None:
@@ -71,64 +192,516 @@ class AwsDynamoStore:
         item = res.get("Item")
         if not item:
             return None
-        return JobRecord(
-            job_id=item["job_id"]["S"],
-            status=JobStatus(item["status"]["S"]),
-            created_at=datetime.fromisoformat(item["created_at"]["S"]),
-            updated_at=datetime.fromisoformat(item["updated_at"]["S"]),
-            s3_bucket=item["s3_bucket"]["S"],
-            s3_key=item["s3_key"]["S"],
-            error_code=(item.get("error_code") or {}).get("S") or None,
-            error_message=(item.get("error_message") or {}).get("S") or None,
-        )
+        return _item_to_job(item)
 
     def list_jobs(self, limit: int = 50) -> list[JobRecord]:
-        res = self._ddb.query(
-            TableName=self._jobs_table,
-            IndexName="gsi1",
-            KeyConditionExpression="gsi1pk = :pk",
-            ExpressionAttributeValues={":pk": {"S": "HISTORY"}},
-            ScanIndexForward=False,
-            Limit=limit,
+        return self.list_jobs_page(limit=limit).items
+
+    def list_jobs_page(
+        self, *, limit: int = 50, cursor: str | None = None, query: JobQuery | None = None
+    ) -> JobPage:
+        """Newest-first page of jobs from the narrowest GSI for the filters.
+
+        Cursors wrap the key of the last item returned from each partition, so a
+        page that a filter expression cut short still resumes exactly where it stopped.
+        """
+        items, next_cursor = self._query_jobs_page(limit, cursor, query or JobQuery())
+        return JobPage(items=[_item_to_job(item) for item in items], next_cursor=next_cursor)
+
+    def list_job_rows(
+        self, *, limit: int = 50, cursor: str | None = None, query: JobQuery | None = None
+    ) -> RowPage:
+        """``list_jobs_page`` as JSON-ready dicts built straight from the items, with no JobRecord."""
+        items, next_cursor = self._query_jobs_page(limit, cursor, query or JobQuery())
+        return RowPage(items=[_item_to_json(item) for item in items], next_cursor=next_cursor)
+
+    def _query_jobs_page(
+        self, limit: int, cursor: str | None, query: JobQuery
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        position = decode_cursor(cursor) if cursor is not None else None
+        if query.error_code is None and query.status is None:
+            return self._list_history_page(limit=limit, position=position, query=query)
+
+        if query.error_code is not None:
+            index, prefix = _ERROR_INDEX, f"{_ERROR_PK}#{query.error_code}"
+        elif query.status is not None:
+            index, prefix = _STATUS_INDEX, f"{_STATUS_PK}#{query.status.value}"
+        index_name, pk_attr, sk_attr = index
+
+        def kwargs_for(pk: str) -> dict[str, Any]:
+            kwargs = self._query_kwargs(index_name, pk_attr, sk_attr, pk, query)
+            if query.error_code is not None and query.status is not None:
+                kwargs["FilterExpression"] = "#st = :st"
+                kwargs["ExpressionAttributeNames"]["#st"] = "status"
+                kwargs["ExpressionAttributeValues"][":st"] = {"S": query.status.value}
+            return kwargs
+
+        return self._merge_partitions(
+            index=index,
+            partitions=[f"{prefix}#{n}" for n in range(self._history_shards)],
+            kwargs_for=kwargs_for,
+            limit=limit,
+            position=position,
+            before=iso_utc(query.created_before) if query.created_before else None,
         )
-        items = res.get("Items") or []
-        out: list[JobRecord] = []
-        for item in items:
-            out.append(
-                JobRecord(
-                    job_id=item["job_id"]["S"],
-                    status=JobStatus(item["status"]["S"]),
-                    created_at=datetime.fromisoformat(item["created_at"]["S"]),
-                    updated_at=datetime.fromisoformat(item["updated_at"]["S"]),
-                    s3_bucket=item["s3_bucket"]["S"],
-                    s3_key=item["s3_key"]["S"],
-                    error_code=(item.get("error_code") or {}).get("S") or None,
-                    error_message=(item.get("error_message") or {}).get("S") or None,
+
+    def _list_history_page(
+        self, *, limit: int, position: dict[str, Any] | None, query: JobQuery
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        index, pk_attr, sk_attr = _HISTORY_INDEX
+        return self._merge_partitions(
+            index=_HISTORY_INDEX,
+            partitions=self._history_partitions(),
+            kwargs_for=lambda pk: self._query_kwargs(index, pk_attr, sk_attr, pk, query),
+            limit=limit,
+            position=position,
+            before=iso_utc(query.created_before) if query.created_before else None,
+        )
+
+    def _merge_partitions(
+        self,
+        *,
+        index: tuple[str, str, str],
+        partitions: list[str],
+        kwargs_for: Callable[[str], dict[str, Any]],
+        limit: int,
+        position: dict[str, Any] | None,
+        before: str | None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Scatter-gather sharded index partitions and merge them newest-first.
+
+        Each shard is queried for up to ``limit`` items in parallel; the merged
+        page keeps the newest ``limit`` and the cursor records, per shard, the
+        key to resume after (or ``None`` once the shard is exhausted).
+        """
+        index_name, pk_attr, sk_attr = index
+        resume: dict[str, Any] = {pk: {} for pk in partitions}
+        if position is not None:
+            shards = position.get("p")
+            if (
+                position.get("i") != index_name
+                or not isinstance(shards, dict)
+                or set(shards) != set(partitions)
+            ):
+                raise InvalidCursor("cursor was issued for a different filter or shard layout")
+            for pk, key in shards.items():
+                if key is not None and not _is_resume_key(key, pk, pk_attr, sk_attr):
+                    raise InvalidCursor("cursor is not valid")
+            resume = shards
+
+        live = [pk for pk in partitions if resume[pk] is not None]
+
+        def fetch(pk: str) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
+            return self._query_partition(kwargs_for(pk), sk_attr, resume[pk] or None, limit, before)
+
+        fetched = dict(zip(live, self._history_pool.map(fetch, live), strict=True))
+        tagged = [
+            [((item[sk_attr]["S"], item["job_id"]["S"]), pk, item) for item in items]
+            for pk, (items, _) in fetched.items()
+        ]
+        page = list(itertools.islice(heapq.merge(*tagged, key=lambda t: t[0], reverse=True), limit))
+
+        taken: dict[str, list[dict[str, Any]]] = {pk: [] for pk in live}
+        for _, pk, item in page:
+            taken[pk].append(item)
+        next_resume = dict(resume)
+        for pk, (items, last_key) in fetched.items():
+            if len(taken[pk]) == len(items):
+                next_resume[pk] = last_key
+            else:
+                next_resume[pk] = (
+                    _index_key(taken[pk][-1], pk_attr, sk_attr) if taken[pk] else resume[pk]
                 )
+
+        next_cursor = None
+        if any(key is not None for key in next_resume.values()):
+            next_cursor = encode_cursor({"i": index_name, "p": next_resume})
+        return [item for _, _, item in page], next_cursor
+
+    def _history_partitions(self) -> list[str]:
+        partitions = [f"{_HISTORY_PK}#{n}" for n in range(self._history_shards)]
+        if self._read_legacy_history:
+            partitions.append(_HISTORY_PK)
+        return partitions
+
+    def _query_kwargs(
+        self, index: str, pk_attr: str, sk_attr: str, pk_value: str, query: JobQuery
+    ) -> dict[str, Any]:
+        after = iso_utc(query.created_after) if query.created_after else None
+        before = iso_utc(query.created_before) if query.created_before else None
+        values: dict[str, Any] = {":pk": {"S": pk_value}}
+        key_condition = "#pk = :pk"
+        if after and before:
+            # BETWEEN is inclusive; items stamped exactly `before` are dropped in _query_partition.
+            key_condition += " AND #sk BETWEEN :a AND :b"
+            values.update({":a": {"S": after}, ":b": {"S": before}})
+        elif after:
+            key_condition += " AND #sk >= :a"
+            values[":a"] = {"S": after}
+        elif before:
+            key_condition += " AND #sk < :b"
+            values[":b"] = {"S": before}
+        return {
+            "TableName": self._jobs_table,
+            "IndexName": index,
+            "KeyConditionExpression": key_condition,
+            "ExpressionAttributeNames": {"#pk": pk_attr, "#sk": sk_attr},
+            "ExpressionAttributeValues": values,
+            "ScanIndexForward": False,
+        }
+
+    def _query_partition(
+        self,
+        kwargs: dict[str, Any],
+        sk_attr: str,
+        start_key: dict[str, Any] | None,
+        want: int,
+        before: str | None,
+    ) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
+        """Query one index partition until ``want`` items match or it runs out.
+
+        Items whose sort key is not below ``before`` are dropped. Returns the items
+        and the LastEvaluatedKey after them (``None`` when the partition is exhausted).
+        """
+        items: list[dict[str, Any]] = []
+        while True:
+            call = dict(kwargs, Limit=want - len(items))
+            if start_key:
+                call["ExclusiveStartKey"] = start_key
+            res = self._ddb.query(**call)
+            items.extend(
+                item
+                for item in res.get("Items") or []
+                if before is None or item[sk_attr]["S"] < before
             )
-        return out
+            start_key = res.get("LastEvaluatedKey")
+            if len(items) >= want or start_key is None:
+                return items, start_key
+
+    def backfill_history_shards(self) -> int:
+        """Move items still under the legacy single ``HISTORY`` partition onto their shard.
+
+        Safe to re-run: each update is conditional on the item still carrying the
+        legacy key. Returns the number of items moved.
+        """
+        index, pk_attr, sk_attr = _HISTORY_INDEX
+        kwargs = self._query_kwargs(index, pk_attr, sk_attr, _HISTORY_PK, JobQuery())
+        kwargs["ProjectionExpression"] = "job_id"
+        moved = 0
+        start_key: dict[str, Any] | None = None
+        while True:
+            call = dict(kwargs)
+            if start_key:
+                call["ExclusiveStartKey"] = start_key
+            res = self._ddb.query(**call)
+            for item in res.get("Items") or []:
+                job_id = item["job_id"]["S"]
+                try:
+                    self._ddb.update_item(
+                        TableName=self._jobs_table,
+                        Key={"job_id": {"S": job_id}},
+                        UpdateExpression="SET gsi1pk = :shard",
+                        ConditionExpression="gsi1pk = :legacy",
+                        ExpressionAttributeValues={
+                            ":shard": {"S": self._history_pk(job_id)},
+                            ":legacy": {"S": _HISTORY_PK},
+                        },
+                    )
+                    moved += 1
+                except ClientError as e:
+                    if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                        raise
+            start_key = res.get("LastEvaluatedKey")
+            if start_key is None:
+                return moved
+
+    def backfill_filter_shards(self) -> int:
+        """Write ``gsi2pk``/``gsi3pk`` on jobs created before the status and error indexes were sharded.
+
+        Scans the jobs table; each update is conditional on the status and error
+        code it was computed from, so a job updated meanwhile (which already
+        carries the new keys) is left alone. Safe to re-run; returns the number
+        of items updated.
+        """
+        kwargs: dict[str, Any] = {
+            "TableName": self._jobs_table,
+            "FilterExpression": (
+                "attribute_not_exists(gsi2pk)"
+                " OR (attribute_exists(error_code) AND attribute_not_exists(gsi3pk))"
+            ),
+            "ProjectionExpression": "job_id, #s, error_code",
+            "ExpressionAttributeNames": {"#s": "status"},
+        }
+        updated = 0
+        start_key: dict[str, Any] | None = None
+        while True:
+            call = dict(kwargs)
+            if start_key:
+                call["ExclusiveStartKey"] = start_key
+            res = self._ddb.scan(**call)
+            for item in res.get("Items") or []:
+                job_id, status = item["job_id"]["S"], item["status"]["S"]
+                expr = "SET gsi2pk = :g2"
+                condition = "#s = :s AND attribute_not_exists(error_code)"
+                values = {":g2": {"S": self._status_pk(job_id, status)}, ":s": {"S": status}}
+                if "error_code" in item:
+                    error_code = item["error_code"]["S"]
+                    expr += ", gsi3pk = :g3"
+                    condition = "#s = :s AND error_code = :ec"
+                    values[":g3"] = {"S": self._error_pk(job_id, error_code)}
+                    values[":ec"] = {"S": error_code}
+                try:
+                    self._ddb.update_item(
+                        TableName=self._jobs_table,
+                        Key={"job_id": {"S": job_id}},
+                        UpdateExpression=expr,
+                        ConditionExpression=condition,
+                        ExpressionAttributeNames={"#s": "status"},
+                        ExpressionAttributeValues=values,
+                    )
+                    updated += 1
+                except ClientError as e:
+                    if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                        raise
+            start_key = res.get("LastEvaluatedKey")
+            if start_key is None:
+                return updated
+
+    def _new_job_item(
+        self,
+        job_id: str,
+        bucket: str,
+        key: str,
+        status: JobStatus,
+        now: str,
+        priority: JobPriority,
+        submitter: str | None,
+    ) -> dict[str, Any]:
+        item = {
+            "job_id": {"S": job_id},
+            "status": {"S": status.value},
+            "created_at": {"S": now},
+            "updated_at": {"S": now},
+            "s3_bucket": {"S": bucket},
+            "s3_key": {"S": key},
+            "gsi1pk": {"S": self._history_pk(job_id)},
+            "gsi1sk": {"S": now},
+            "gsi2pk": {"S": self._status_pk(job_id, status.value)},
+            "priority": {"S": priority.value},
+        }
+        if submitter:
+            item["submitter"] = {"S": submitter}
+        return item
+
+    def _shard(self, job_id: str) -> int:
+        return zlib.crc32(job_id.encode("utf-8")) % self._history_shards
+
+    def _history_pk(self, job_id: str) -> str:
+        return f"{_HISTORY_PK}#{self._shard(job_id)}"
+
+    def _status_pk(self, job_id: str, status: str) -> str:
+        return f"{_STATUS_PK}#{status}#{self._shard(job_id)}"
+
+    def _error_pk(self, job_id: str, error_code: str) -> str:
+        return f"{_ERROR_PK}#{error_code}#{self._shard(job_id)}"
 
     def store_result(self, *, job_id: str, metadata: dict[str, Any], summary: str) -> None:
-        self._ddb.put_item(
-            TableName=self._results_table,
-            Item={
-                "job_id": {"S": job_id},
-                "metadata_json": {"S": json_dumps(metadata)},
-                "summary": {"S": summary},
-            },
-        )
+        item: dict[str, Any] = {
+            "job_id": {"S": job_id},
+            "summary": {"S": summary},
+            # Binary gzip keeps large probes well under the 400 KB item limit.
+            "metadata_gz": {"B": compress_metadata(metadata)},
+            "completed_at": {"S": _utc_now_iso()},
+            **self._search_attributes(job_id, project_metadata(metadata)),
+        }
+        self._ddb.put_item(TableName=self._results_table, Item=item)
 
-    def get_result(self, job_id: str) -> JobResult | None:
-        res = self._ddb.get_item(TableName=self._results_table, Key={"job_id": {"S": job_id}})
-        item = res.get("Item")
-        if not item:
+    def _search_attributes(self, job_id: str, projection: ResultProjection) -> dict[str, Any]:
+        """Projection attributes plus the index keys that make a result searchable."""
+        item: dict[str, Any] = {"catalog_pk": {"S": self._catalog_pk(job_id)}}
+        for name, value in projection.model_dump().items():
+            if isinstance(value, int | float):
+                item[name] = {"N": str(value)}
+            elif value is not None:
+                item[name] = {"S": value}
+        if projection.video_codec is not None:
+            item["video_codec_pk"] = {"S": self._video_codec_pk(job_id, projection.video_codec)}
+        return item
+
+    def get_result(self, job_id: str, *, full: bool = False) -> JobResult | None:
+        """Summary and projection; the compressed payload is only fetched and inflated when ``full``."""
+        item = self._get_result_item(job_id, payload=full)
+        if item is None:
             return None
+        if "metadata_json" in item:
+            # Written before compact results existed.
+            metadata = json_loads(item["metadata_json"]["S"])
+            return JobResult(
+                job_id=item["job_id"]["S"],
+                summary=item["summary"]["S"],
+                projection=project_metadata(metadata),
+                metadata=metadata if full else None,
+            )
         return JobResult(
             job_id=item["job_id"]["S"],
-            metadata=json_loads(item["metadata_json"]["S"]),
             summary=item["summary"]["S"],
+            projection=_item_to_projection(item),
+            metadata=decompress_metadata(item["metadata_gz"]["B"]) if full else None,
         )
 
+    def get_result_payload(self, job_id: str) -> tuple[JobResult, bytes] | None:
+        """The result without metadata, plus the still-compressed ffprobe payload for streaming."""
+        item = self._get_result_item(job_id, payload=True)
+        if item is None:
+            return None
+        if "metadata_json" in item:
+            metadata = json_loads(item["metadata_json"]["S"])
+            projection, blob = project_metadata(metadata), compress_metadata(metadata)
+        else:
+            projection, blob = _item_to_projection(item), item["metadata_gz"]["B"]
+        result = JobResult(
+            job_id=item["job_id"]["S"], summary=item["summary"]["S"], projection=projection
+        )
+        return result, blob
+
+    def _get_result_item(self, job_id: str, *, payload: bool) -> dict[str, Any] | None:
+        attributes = ["job_id", "summary", "metadata_json", *ResultProjection.model_fields]
+        if payload:
+            attributes.append("metadata_gz")
+        names = {f"#a{i}": a for i, a in enumerate(attributes)}
+        res = self._ddb.get_item(
+            TableName=self._results_table,
+            Key={"job_id": {"S": job_id}},
+            ProjectionExpression=", ".join(names),
+            ExpressionAttributeNames=names,
+        )
+        item: dict[str, Any] | None = res.get("Item") or None
+        return item
+
+    def search_results(
+        self, *, limit: int = 50, cursor: str | None = None, query: ResultQuery | None = None
+    ) -> SearchPage:
+        """Newest-first page of results matching the projection filters.
+
+        A video_codec filter scatter-gathers that codec's shards of the sparse
+        video_codec index; anything else scatter-gathers the catalog shards. The
+        remaining filters are applied as a FilterExpression on the index items.
+        """
+        query = query or ResultQuery()
+        position = decode_cursor(cursor) if cursor is not None else None
+        index = _CATALOG_INDEX if query.video_codec is None else _VIDEO_CODEC_INDEX
+        prefix = _CATALOG_PK if query.video_codec is None else query.video_codec
+        index_name, pk_attr, sk_attr = index
+        items, next_cursor = self._merge_partitions(
+            index=index,
+            partitions=[f"{prefix}#{n}" for n in range(self._history_shards)],
+            kwargs_for=lambda pk: self._search_kwargs(index_name, pk_attr, sk_attr, pk, query),
+            limit=limit,
+            position=position,
+            before=None,
+        )
+        hits = [
+            SearchHit(
+                job_id=item["job_id"]["S"],
+                completed_at=datetime.fromisoformat(item["completed_at"]["S"]),
+                summary=item["summary"]["S"],
+                projection=_item_to_projection(item),
+            )
+            for item in items
+        ]
+        return SearchPage(items=hits, next_cursor=next_cursor)
+
+    def _search_kwargs(
+        self, index: str, pk_attr: str, sk_attr: str, pk_value: str, query: ResultQuery
+    ) -> dict[str, Any]:
+        names = {"#pk": pk_attr, "#sk": sk_attr}
+        values: dict[str, Any] = {":pk": {"S": pk_value}}
+        conditions = []
+        for n, (attribute, op, value) in enumerate(query.filters()):
+            if attribute == "video_codec" and index == _VIDEO_CODEC_INDEX[0]:
+                continue  # already the partition key
+            names[f"#f{n}"] = attribute
+            values[f":f{n}"] = {"S": value} if isinstance(value, str) else {"N": str(value)}
+            conditions.append(f"#f{n} {op} :f{n}")
+        kwargs: dict[str, Any] = {
+            "TableName": self._results_table,
+            "IndexName": index,
+            "KeyConditionExpression": "#pk = :pk",
+            "ExpressionAttributeNames": names,
+            "ExpressionAttributeValues": values,
+            "ScanIndexForward": False,
+        }
+        if conditions:
+            kwargs["FilterExpression"] = " AND ".join(conditions)
+        return kwargs
+
+    def _catalog_pk(self, job_id: str) -> str:
+        return f"{_CATALOG_PK}#{self._shard(job_id)}"
+
+    def _video_codec_pk(self, job_id: str, codec: str) -> str:
+        return f"{codec}#{self._shard(job_id)}"
+
+    def backfill_result_search_keys(self) -> int:
+        """Make results stored before /search existed (or before codecs were sharded) searchable.
+
+        Scans the results table for items without ``catalog_pk`` or
+        ``video_codec_pk``, projects their stored payload and writes the search
+        attributes; ``completed_at`` falls back to the job's ``updated_at``.
+        Safe to re-run; returns the number of items updated.
+        """
+        kwargs: dict[str, Any] = {
+            "TableName": self._results_table,
+            "FilterExpression": (
+                "attribute_not_exists(catalog_pk)"
+                " OR (attribute_exists(video_codec) AND attribute_not_exists(video_codec_pk))"
+            ),
+            "ProjectionExpression": "job_id, metadata_json, metadata_gz, completed_at",
+        }
+        updated = 0
+        start_key: dict[str, Any] | None = None
+        while True:
+            call = dict(kwargs)
+            if start_key:
+                call["ExclusiveStartKey"] = start_key
+            res = self._ddb.scan(**call)
+            for item in res.get("Items") or []:
+                job_id = item["job_id"]["S"]
+                if "metadata_json" in item:
+                    metadata = json_loads(item["metadata_json"]["S"])
+                else:
+                    metadata = decompress_metadata(item["metadata_gz"]["B"])
+                attributes = self._search_attributes(job_id, project_metadata(metadata))
+                if "completed_at" not in item:
+                    attributes["completed_at"] = {"S": self._job_updated_at(job_id)}
+                names = {f"#a{i}": name for i, name in enumerate(attributes)}
+                try:
+                    self._ddb.update_item(
+                        TableName=self._results_table,
+                        Key={"job_id": {"S": job_id}},
+                        UpdateExpression="SET " + ", ".join(f"{n} = :{n[1:]}" for n in names),
+                        ConditionExpression="attribute_exists(job_id)",
+                        ExpressionAttributeNames=names,
+                        ExpressionAttributeValues={
+                            f":{n[1:]}": attributes[name] for n, name in names.items()
+                        },
+                    )
+                    updated += 1
+                except ClientError as e:
+                    if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                        raise
+            start_key = res.get("LastEvaluatedKey")
+            if start_key is None:
+                return updated
+
+    def _job_updated_at(self, job_id: str) -> str:
+        res = self._ddb.get_item(
+            TableName=self._jobs_table,
+            Key={"job_id": {"S": job_id}},
+            ProjectionExpression="updated_at",
+        )
+        item = res.get("Item") or {}
+        return str(item["updated_at"]["S"]) if "updated_at" in item else _utc_now_iso()
+
     def try_claim_idempotency(self, *, idempotency_key: str, job_id: str) -> bool:
         try:
             self._ddb.put_item(
@@ -147,6 +720,69 @@ class AwsDynamoStore:
             raise
 
 
+def _item_to_job(item: dict[str, Any]) -> JobRecord:
+    return JobRecord(
+        job_id=item["job_id"]["S"],
+        status=JobStatus(item["status"]["S"]),
+        created_at=datetime.fromisoformat(item["created_at"]["S"]),
+        updated_at=datetime.fromisoformat(item["updated_at"]["S"]),
+        s3_bucket=item["s3_bucket"]["S"],
+        s3_key=item["s3_key"]["S"],
+        error_code=(item.get("error_code") or {}).get("S") or None,
+        error_message=(item.get("error_message") or {}).get("S") or None,
+        priority=JobPriority((item.get("priority") or {}).get("S") or JobPriority.standard),
+        submitter=(item.get("submitter") or {}).get("S"),
+    )
+
+
+def _item_to_json(item: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "job_id": item["job_id"]["S"],
+        "status": item["status"]["S"],
+        "created_at": json_timestamp(item["created_at"]["S"]),
+        "updated_at": json_timestamp(item["updated_at"]["S"]),
+        "s3_bucket": item["s3_bucket"]["S"],
+        "s3_key": item["s3_key"]["S"],
+        "error_code": (item.get("error_code") or {}).get("S") or None,
+        "error_message": (item.get("error_message") or {}).get("S") or None,
+        "priority": (item.get("priority") or {}).get("S") or JobPriority.standard.value,
+        "submitter": (item.get("submitter") or {}).get("S"),
+    }
+
+
+def _item_to_projection(item: dict[str, Any]) -> ResultProjection:
+    return ResultProjection(
+        **{
+            name: value.get("N", value.get("S"))
+            for name, value in item.items()
+            if name in ResultProjection.model_fields
+        }
+    )
+
+
+def _index_key(item: dict[str, Any], pk_attr: str, sk_attr: str) -> dict[str, Any]:
+    return {"job_id": item["job_id"], pk_attr: item[pk_attr], sk_attr: item[sk_attr]}
+
+
+def _is_resume_key(key: Any, pk: str, pk_attr: str, sk_attr: str) -> bool:
+    """Whether a cursor's per-shard ``key`` can go to DynamoDB as this partition's ExclusiveStartKey.
+
+    ``{}`` is a shard not read yet; anything else must be the index key
+    ``_index_key`` (or a LastEvaluatedKey) builds for this partition. A forged
+    key would otherwise surface as a ValidationException from DynamoDB, i.e. a 500.
+    """
+    if not isinstance(key, dict):
+        return False
+    if not key:
+        return True
+    if set(key) != {"job_id", pk_attr, sk_attr}:
+        return False
+    for value in key.values():
+        if not isinstance(value, dict) or set(value) != {"S"} or not isinstance(value["S"], str):
+            return False
+    return bool(key[pk_attr]["S"] == pk)
+
+
 def json_dumps(obj: Any) -> str:
     import json
 
@@ -1,11 +1,32 @@
 from __future__ import annotations
 
+import logging
+import threading
+import time
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any
 
 import boto3
 
-from edvmp.shared.queue import QueueMessage
+from edvmp.shared.metrics import queue_lease_extensions_failed_total, queue_wait_seconds
+from edvmp.shared.queue import QueueMessage, message_priority
+
+logger = logging.getLogger("edvmp.sqs")
+
+# SQS caps ReceiveMessage and every *Batch call at 10 entries, and DelaySeconds at 15 minutes.
+MAX_BATCH = 10
+MAX_DELAY_S = 900
+
+
+def _chunks(items: Sequence[Any], size: int = MAX_BATCH) -> list[Sequence[Any]]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _fair_group(message: QueueMessage) -> dict[str, str]:
+    """``MessageGroupId`` = submitter, as Step Functions sends it, so a re-send stays in its tenant's fair share."""
+    submitter = message.payload.get("submitter")
+    return {"MessageGroupId": str(submitter)} if submitter else {}
 
 
 @dataclass(frozen=True)
@@ -21,24 +42,55 @@ class SqsQueue:
         self._queue_url = queue_url
 
     def enqueue(self, message: QueueMessage) -> None:
-        self._sqs.send_message(QueueUrl=self._queue_url, MessageBody=message.to_json())
+        self._sqs.send_message(
+            QueueUrl=self._queue_url, MessageBody=message.to_json(), **_fair_group(message)
+        )
+
+    def enqueue_delayed(self, message: QueueMessage, delay_s: float) -> None:
+        self._sqs.send_message(
+            QueueUrl=self._queue_url,
+            MessageBody=message.to_json(),
+            DelaySeconds=max(0, min(MAX_DELAY_S, round(delay_s))),
+            **_fair_group(message),
+        )
+
+    def enqueue_batch(self, messages: Sequence[QueueMessage]) -> None:
+        for chunk in _chunks(messages):
+            res = self._sqs.send_message_batch(
+                QueueUrl=self._queue_url,
+                Entries=[
+                    {"Id": str(i), "MessageBody": m.to_json(), **_fair_group(m)}
+                    for i, m in enumerate(chunk)
+                ],
+            )
+            failed = res.get("Failed") or []
+            if failed:
+                raise RuntimeError(
+                    f"SQS send_message_batch failed for {len(failed)} message(s): {failed}"
+                )
 
     def receive(self, *, wait_time_s: int = 10, max_messages: int = 1) -> list[SqsReceived]:
         res = self._sqs.receive_message(
             QueueUrl=self._queue_url,
-            MaxNumberOfMessages=max_messages,
+            MaxNumberOfMessages=max(1, min(MAX_BATCH, max_messages)),
             WaitTimeSeconds=wait_time_s,
             MessageAttributeNames=["All"],
             AttributeNames=["All"],
         )
         out: list[SqsReceived] = []
+        now_ms = time.time() * 1000
         for m in res.get("Messages", []) or []:
-            body = m["Body"]
+            message = QueueMessage.from_json(m["Body"])
+            attributes = m.get("Attributes") or {}
+            if "SentTimestamp" in attributes:
+                queue_wait_seconds.labels(priority=message_priority(message)).observe(
+                    max(0.0, now_ms - int(attributes["SentTimestamp"])) / 1000
+                )
             out.append(
                 SqsReceived(
-                    message=QueueMessage.from_json(body),
+                    message=message,
                     receipt_handle=m["ReceiptHandle"],
-                    attributes=m.get("Attributes") or {},
+                    attributes=attributes,
                 )
             )
         return out
@@ -46,6 +98,131 @@ class SqsQueue:
     def delete(self, receipt_handle: str) -> None:
         self._sqs.delete_message(QueueUrl=self._queue_url, ReceiptHandle=receipt_handle)
 
+    def delete_batch(self, receipt_handles: Sequence[str]) -> list[str]:
+        """Delete in batches of 10; returns the receipt handles SQS refused (they will be redelivered)."""
+        refused: list[str] = []
+        for chunk in _chunks(receipt_handles):
+            res = self._sqs.delete_message_batch(
+                QueueUrl=self._queue_url,
+                Entries=[{"Id": str(i), "ReceiptHandle": h} for i, h in enumerate(chunk)],
+            )
+            refused.extend(chunk[int(f["Id"])] for f in res.get("Failed") or [])
+        return refused
+
+    def change_visibility_batch(
+        self, receipt_handles: Sequence[str], *, timeout_s: int
+    ) -> list[str]:
+        """Extend in batches of 10; returns the receipt handles SQS refused."""
+        refused: list[str] = []
+        for chunk in _chunks(receipt_handles):
+            res = self._sqs.change_message_visibility_batch(
+                QueueUrl=self._queue_url,
+                Entries=[
+                    {"Id": str(i), "ReceiptHandle": h, "VisibilityTimeout": timeout_s}
+                    for i, h in enumerate(chunk)
+                ],
+            )
+            refused.extend(chunk[int(f["Id"])] for f in res.get("Failed") or [])
+        return refused
+
 
 class SqsDlq(SqsQueue):
-    pass
+    def drain(self, max_items: int = 1000, *, wait_time_s: int = 2) -> list[dict[str, Any]]:
+        items: list[dict[str, Any]] = []
+        while len(items) < max_items:
+            received = self.receive(wait_time_s=wait_time_s, max_messages=max_items - len(items))
+            if not received:
+                break
+            items.extend(r.message.payload for r in received)
+            self.delete_batch([r.receipt_handle for r in received])
+        return items
+
+
+class SqsInFlight:
+    """Batches deletes and keeps visibility leases alive for messages a worker is processing.
+
+    ``ack`` buffers the receipt handle and a background thread flushes buffered
+    handles with ``DeleteMessageBatch`` once 10 are waiting or ``flush_interval_s``
+    passes. The same thread extends the visibility timeout of long-running
+    messages before it lapses, so slow jobs are not redelivered to another worker.
+    """
+
+    def __init__(
+        self,
+        queue: SqsQueue,
+        *,
+        visibility_timeout_s: int,
+        flush_interval_s: float = 1.0,
+    ):
+        self._queue = queue
+        self._visibility_timeout_s = visibility_timeout_s
+        self._flush_interval_s = flush_interval_s
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._pending_deletes: list[str] = []
+        self._leases: dict[str, float] = {}
+        self._thread = threading.Thread(target=self._loop, name="edvmp-sqs-inflight", daemon=True)
+        self._thread.start()
+
+    def track(self, receipt_handle: str) -> None:
+        with self._lock:
+            self._leases[receipt_handle] = time.monotonic()
+
+    def ack(self, receipt_handle: str) -> None:
+        with self._lock:
+            self._leases.pop(receipt_handle, None)
+            self._pending_deletes.append(receipt_handle)
+            full = len(self._pending_deletes) >= MAX_BATCH
+        if full:
+            self._wake.set()
+
+    def _loop(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(timeout=self._flush_interval_s)
+            self._wake.clear()
+            try:
+                self._flush()
+                self._extend_leases()
+            except Exception:
+                logger.exception("sqs_inflight_maintenance_failed")
+
+    def _flush(self) -> None:
+        with self._lock:
+            handles, self._pending_deletes = self._pending_deletes, []
+        if handles:
+            refused = self._queue.delete_batch(handles)
+            if refused:
+                logger.warning("sqs_delete_refused", extra={"count": len(refused)})
+
+    def _extend_leases(self) -> None:
+        # Renew once a third of the lease is left so one missed tick does not expire it.
+        renew_after = self._visibility_timeout_s * 2 / 3
+        now = time.monotonic()
+        with self._lock:
+            due = {h: at for h, at in self._leases.items() if now - at >= renew_after}
+            for h in due:
+                self._leases[h] = now
+        if not due:
+            return
+        try:
+            failed = self._queue.change_visibility_batch(
+                list(due), timeout_s=self._visibility_timeout_s
+            )
+        except Exception:
+            logger.exception("sqs_visibility_extend_failed", extra={"count": len(due)})
+            failed = list(due)
+        if failed:
+            # Counted, and retried on the next tick while the lease may still be alive.
+            queue_lease_extensions_failed_total.inc(len(failed))
+            logger.warning("sqs_visibility_extend_refused", extra={"count": len(failed)})
+            with self._lock:
+                for h in failed:
+                    if h in self._leases:
+                        self._leases[h] = due[h]
+
+    def close(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join()
+        self._flush()
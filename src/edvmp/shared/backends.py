@@ -4,7 +4,9 @@ import redis
 
 from edvmp.shared.aws_dynamo_store import AwsDynamoStore
 from edvmp.shared.aws_sqs_queue import SqsDlq, SqsQueue
+from edvmp.shared.cached_store import CachedStore
 from edvmp.shared.config import Settings
+from edvmp.shared.content_cache import ContentCache, RedisContentCache, SqliteContentCache
 from edvmp.shared.queue import RedisDlq, RedisQueue
 from edvmp.shared.store import LocalSqliteStore
 
@@ -18,17 +20,44 @@ def get_store(settings: Settings):
             jobs_table=settings.ddb_jobs_table,
             results_table=settings.ddb_results_table,
             idempotency_table=settings.ddb_idempotency_table,
+            history_shards=settings.ddb_history_shards,
+            read_legacy_history=settings.ddb_history_read_legacy,
         )
     return LocalSqliteStore(settings.db_path)
 
 
+def get_cached_store(settings: Settings):
+    store = get_store(settings)
+    if settings.store_cache_max_entries <= 0:
+        return store
+    return CachedStore(
+        store,
+        max_entries=settings.store_cache_max_entries,
+        active_ttl_s=settings.store_cache_active_ttl_s,
+        terminal_ttl_s=settings.store_cache_terminal_ttl_s,
+        redis_client=redis.Redis.from_url(settings.redis_url) if settings.store_cache_redis else None,
+        redis_ttl_s=settings.store_cache_redis_ttl_s,
+    )
+
+
 def get_queue(settings: Settings):
     if settings.queue_backend == "sqs":
         if not settings.sqs_jobs_queue_url:
             raise RuntimeError("SQS_JOBS_QUEUE_URL must be set when QUEUE_BACKEND=sqs")
         return SqsQueue(region_name=settings.s3_region, queue_url=settings.sqs_jobs_queue_url)
-    r = redis.Redis.from_url(settings.redis_url)
-    return RedisQueue(r, settings.redis_jobs_queue)
+    return redis_jobs_queue(redis.Redis.from_url(settings.redis_url), settings)
+
+
+def redis_jobs_queue(client: redis.Redis, settings: Settings) -> RedisQueue:
+    return RedisQueue(
+        client,
+        settings.redis_jobs_queue,
+        class_weights=settings.queue_class_weights,
+        submitter_weights=settings.queue_submitter_weights,
+        size_penalty_s_per_gib=settings.queue_size_penalty_s_per_gib,
+        lease_s=settings.redis_queue_lease_s,
+        max_deliveries=settings.redis_queue_max_deliveries,
+    )
 
 
 def get_dlq(settings: Settings):
@@ -38,3 +67,20 @@ def get_dlq(settings: Settings):
         return SqsDlq(region_name=settings.s3_region, queue_url=settings.sqs_dlq_url)
     r = redis.Redis.from_url(settings.redis_url)
     return RedisDlq(r, settings.redis_dlq)
+
+
+def get_content_cache(settings: Settings) -> ContentCache | None:
+    if settings.content_cache_backend == "sqlite":
+        return SqliteContentCache(
+            settings.db_path,
+            ttl_s=settings.content_cache_ttl_s,
+            max_entries=settings.content_cache_max_entries,
+        )
+    if settings.content_cache_backend == "redis":
+        return RedisContentCache(
+            redis.Redis.from_url(settings.redis_url),
+            prefix="content-cache",
+            ttl_s=settings.content_cache_ttl_s,
+            max_entries=settings.content_cache_max_entries,
+        )
+    return None
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Any, cast
 
 import boto3
@@ -12,6 +13,12 @@ class BedrockClient:
     mode: str  # mock|aws
     model_id: str
     region_name: str
+    # Optional pre-built bedrock-runtime client (or a local stand-in); built once on first use otherwise.
+    client: Any = field(default=None, compare=False, repr=False)
+
+    @cached_property
+    def _runtime(self) -> Any:
+        return self.client or boto3.client("bedrock-runtime", region_name=self.region_name)
 
     def summarize(self, *, metadata: dict[str, Any]) -> str:
         if self.mode != "aws":
@@ -25,7 +32,6 @@ class BedrockClient:
                 f"video codec={codec}, resolution={width}x{height}, duration_s={duration}."
             )
 
-        bedrock_runtime = boto3.client("bedrock-runtime", region_name=self.region_name)
         prompt = (
             "Summarize the following extracted video metadata in 1-2 sentences for a job status page.\n\n"
             + json.dumps(metadata)
@@ -37,7 +43,7 @@ class BedrockClient:
                 "messages": [{"role": "user", "content": prompt}],
             }
         )
-        response = bedrock_runtime.invoke_model(modelId=self.model_id, body=body)
+        response = self._runtime.invoke_model(modelId=self.model_id, body=body)
         payload = json.loads(response["body"].read())
         # Anthropics responses are typically: { "content": [ { "text": "..." } ] }
         return cast(str, payload["content"][0]["text"])
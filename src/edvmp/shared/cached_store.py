@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, TypeVar
+
+import redis
+from pydantic import BaseModel, ValidationError
+
+from edvmp.shared.cache import TtlLruCache
+from edvmp.shared.metrics import store_cache_requests_total
+from edvmp.shared.models import JobRecord, JobResult, JobStatus
+
+logger = logging.getLogger("edvmp.cached_store")
+
+M = TypeVar("M", bound=BaseModel)
+
+_TERMINAL = frozenset({JobStatus.succeeded, JobStatus.failed})
+
+# Part of every Redis key. Bump it whenever JobRecord or JobResult changes shape, so
+# replicas on different releases never read each other's entries.
+_REDIS_SCHEMA_VERSION = 2
+
+
+class CachedStore:
+    """Read-through cache for job and result lookups in front of any store backend.
+
+    In-flight job records live for ``active_ttl_s``; terminal records and
+    results rarely change, so they live for the longer ``terminal_ttl_s``. Each
+    bounds how stale a write made by another process (a reprocess, a backfill)
+    can look. An optional Redis tier lets API replicas share entries; a copy
+    taken from it keeps the entry's remaining Redis TTL, so the two tiers never
+    add up to more than one TTL. Writes made through this wrapper invalidate
+    both tiers; every other call goes to the backend.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        *,
+        max_entries: int,
+        active_ttl_s: float,
+        terminal_ttl_s: float = 300.0,
+        redis_client: redis.Redis | None = None,
+        redis_prefix: str = "store-cache",
+        redis_ttl_s: int = 7 * 24 * 3600,
+    ):
+        self._store = store
+        self._active_ttl_s = active_ttl_s
+        self._terminal_ttl_s = terminal_ttl_s
+        self._jobs: TtlLruCache[str, JobRecord] = TtlLruCache(
+            max_entries=max_entries, ttl_s=terminal_ttl_s
+        )
+        self._results: TtlLruCache[str, JobResult] = TtlLruCache(
+            max_entries=max_entries, ttl_s=terminal_ttl_s
+        )
+        self._redis = redis_client
+        self._redis_prefix = f"{redis_prefix}:v{_REDIS_SCHEMA_VERSION}"
+        self._redis_ttl_s = redis_ttl_s
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._store, name)
+
+    def get_job(self, job_id: str) -> JobRecord | None:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            store_cache_requests_total.labels(kind="job", result="hit").inc()
+            return job
+        job, remaining_s = self._redis_get("job", job_id, JobRecord)
+        if job is not None:
+            store_cache_requests_total.labels(kind="job", result="redis_hit").inc()
+            self._jobs.put(job_id, job, ttl_s=min(self._job_ttl_s(job), remaining_s))
+            return job
+        store_cache_requests_total.labels(kind="job", result="miss").inc()
+        job = self._store.get_job(job_id)
+        if job is not None:
+            ttl_s = self._job_ttl_s(job)
+            self._jobs.put(job_id, job, ttl_s=ttl_s)
+            self._redis_put("job", job_id, job, ttl_s=ttl_s)
+        return job
+
+    def get_result(self, job_id: str, *, full: bool = False) -> JobResult | None:
+        kind = "result-full" if full else "result"
+        key = f"{job_id}:full" if full else job_id
+        result = self._results.get(key)
+        if result is not None:
+            store_cache_requests_total.labels(kind=kind, result="hit").inc()
+            return result
+        result, remaining_s = self._redis_get(kind, job_id, JobResult)
+        if result is not None:
+            store_cache_requests_total.labels(kind=kind, result="redis_hit").inc()
+            self._results.put(key, result, ttl_s=min(self._terminal_ttl_s, remaining_s))
+            return result
+        store_cache_requests_total.labels(kind=kind, result="miss").inc()
+        result = self._store.get_result(job_id, full=full)
+        if result is not None:
+            self._results.put(key, result)
+            self._redis_put(kind, job_id, result, ttl_s=self._terminal_ttl_s)
+        return result
+
+    def update_job(self, *, job_id: str, **kwargs: Any) -> None:
+        self._store.update_job(job_id=job_id, **kwargs)
+        self._jobs.invalidate(job_id)
+        self._redis_delete("job", job_id)
+
+    def store_result(self, *, job_id: str, **kwargs: Any) -> None:
+        self._store.store_result(job_id=job_id, **kwargs)
+        self._results.invalidate(job_id)
+        self._results.invalidate(f"{job_id}:full")
+        self._redis_delete("result", job_id)
+        self._redis_delete("result-full", job_id)
+
+    def _job_ttl_s(self, job: JobRecord) -> float:
+        return self._terminal_ttl_s if job.status in _TERMINAL else self._active_ttl_s
+
+    # The Redis tier is best effort: on any Redis error, fall through to the backend.
+
+    def _redis_get(self, kind: str, job_id: str, model: type[M]) -> tuple[M | None, float]:
+        """The cached value and its remaining Redis TTL in seconds; ``(None, 0)`` on a miss."""
+        if self._redis is None:
+            return None, 0.0
+        key = f"{self._redis_prefix}:{kind}:{job_id}"
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.pttl(key)
+            raw, pttl_ms = pipe.execute()
+        except redis.RedisError:
+            logger.warning("store_cache_redis_unavailable", exc_info=True)
+            return None, 0.0
+        # PTTL is -2 when the key expired between the two commands; every key is set with PX.
+        if raw is None or pttl_ms <= 0:
+            return None, 0.0
+        try:
+            return model.model_validate_json(raw), pttl_ms / 1000
+        except ValidationError:
+            # Written by an incompatible release under the same version; treat it as a miss.
+            logger.warning("store_cache_entry_invalid", extra={"kind": kind, "job_id": job_id})
+            self._redis_delete(kind, job_id)
+            return None, 0.0
+
+    def _redis_put(self, kind: str, job_id: str, value: BaseModel, *, ttl_s: float) -> None:
+        if self._redis is None or ttl_s <= 0:
+            return
+        ttl_ms = int(min(ttl_s, self._redis_ttl_s) * 1000)
+        try:
+            self._redis.set(
+                f"{self._redis_prefix}:{kind}:{job_id}", value.model_dump_json(), px=ttl_ms
+            )
+        except redis.RedisError:
+            logger.warning("store_cache_redis_unavailable", exc_info=True)
+
+    def _redis_delete(self, kind: str, job_id: str) -> None:
+        if self._redis is None:
+            return
+        try:
+            self._redis.delete(f"{self._redis_prefix}:{kind}:{job_id}")
+        except redis.RedisError:
+            logger.warning("store_cache_redis_unavailable", exc_info=True)
@@ -17,16 +17,25 @@ class Settings(BaseSettings):
     auth_password: str = Field(default="demo", alias="AUTH_PASSWORD")
     jwt_secret: str = Field(default="change-me-in-prod", alias="JWT_SECRET")
     jwt_issuer: str = Field(default="edvmp", alias="JWT_ISSUER")
+    auth_cache_max_entries: int = Field(default=10_000, alias="AUTH_CACHE_MAX_ENTRIES")
+    auth_cache_ttl_s: float = Field(default=300, alias="AUTH_CACHE_TTL_S")  # 0 disables
 
     # API
     api_host: str = Field(default="0.0.0.0", alias="API_HOST")
     api_port: int = Field(default=8000, alias="API_PORT")
+    api_batch_max_jobs: int = Field(default=500, alias="API_BATCH_MAX_JOBS")
+    # /jobs/{id}/events: keepalive interval, which is also how often the store is re-checked.
+    api_sse_heartbeat_s: float = Field(default=15.0, alias="API_SSE_HEARTBEAT_S")
 
     # Storage
     s3_endpoint_url: str | None = Field(default=None, alias="S3_ENDPOINT_URL")
     s3_public_endpoint_url: str | None = Field(default=None, alias="S3_PUBLIC_ENDPOINT_URL")
     s3_region: str = Field(default="us-east-1", alias="S3_REGION")
     s3_bucket: str = Field(default="videos", alias="S3_BUCKET")
+    s3_multipart_part_size_bytes: int = Field(
+        default=64 * 1024 * 1024, alias="S3_MULTIPART_PART_SIZE_BYTES"
+    )
+    s3_multipart_url_expires_s: int = Field(default=3600, alias="S3_MULTIPART_URL_EXPIRES_S")
 
     # AWS credentials (also used for MinIO in local mode)
     aws_access_key_id: str | None = Field(default=None, alias="AWS_ACCESS_KEY_ID")
@@ -38,9 +47,29 @@ class Settings(BaseSettings):
     redis_jobs_queue: str = Field(default="jobs", alias="REDIS_JOBS_QUEUE")
     redis_dlq: str = Field(default="dlq", alias="REDIS_DLQ")
 
+    # Jobs queue scheduling (Redis): class and submitter weights are JSON objects, e.g.
+    # QUEUE_SUBMITTER_WEIGHTS='{"backfill-bot": 0.25}'; unlisted submitters weigh 1.
+    queue_class_weights: dict[str, float] = Field(
+        default={"interactive": 8.0, "standard": 4.0, "bulk": 1.0}, alias="QUEUE_CLASS_WEIGHTS"
+    )
+    queue_submitter_weights: dict[str, float] = Field(default={}, alias="QUEUE_SUBMITTER_WEIGHTS")
+    queue_size_penalty_s_per_gib: float = Field(default=60.0, alias="QUEUE_SIZE_PENALTY_S_PER_GIB")
+    # Workers lease Redis messages; a lease not acked or renewed in time is redelivered.
+    redis_queue_lease_s: float = Field(default=300.0, alias="REDIS_QUEUE_LEASE_S")
+    redis_queue_reap_interval_s: float = Field(default=15.0, alias="REDIS_QUEUE_REAP_INTERVAL_S")
+    # Leases a message may lose (worker crash, OOM, hang) before it is dead-lettered; 0 = no cap.
+    redis_queue_max_deliveries: int = Field(default=5, alias="REDIS_QUEUE_MAX_DELIVERIES")
+
     # Local persistence
     db_path: str = Field(default="data/app.db", alias="DB_PATH")
 
+    # API read-through cache for job/result lookups (0 entries disables)
+    store_cache_max_entries: int = Field(default=10_000, alias="STORE_CACHE_MAX_ENTRIES")
+    store_cache_active_ttl_s: float = Field(default=2.0, alias="STORE_CACHE_ACTIVE_TTL_S")
+    store_cache_terminal_ttl_s: float = Field(default=300.0, alias="STORE_CACHE_TERMINAL_TTL_S")
+    store_cache_redis: bool = Field(default=False, alias="STORE_CACHE_REDIS")
+    store_cache_redis_ttl_s: int = Field(default=7 * 24 * 3600, alias="STORE_CACHE_REDIS_TTL_S")
+
     # Backend switches (local mock vs AWS)
     store_backend: str = Field(default="sqlite", alias="STORE_BACKEND")  # sqlite|dynamodb
     queue_backend: str = Field(default="redis", alias="QUEUE_BACKEND")  # redis|sqs
@@ -49,25 +78,78 @@ class Settings(BaseSettings):
     ddb_jobs_table: str | None = Field(default=None, alias="DDB_JOBS_TABLE")
     ddb_results_table: str | None = Field(default=None, alias="DDB_RESULTS_TABLE")
     ddb_idempotency_table: str | None = Field(default=None, alias="DDB_IDEMPOTENCY_TABLE")
+    ddb_history_shards: int = Field(default=8, alias="DDB_HISTORY_SHARDS")
+    # Keep reading the pre-sharding "HISTORY" partition until `make backfill-history` has run.
+    ddb_history_read_legacy: bool = Field(default=True, alias="DDB_HISTORY_READ_LEGACY")
 
     # SQS (AWS mode)
     sqs_jobs_queue_url: str | None = Field(default=None, alias="SQS_JOBS_QUEUE_URL")
     sqs_dlq_url: str | None = Field(default=None, alias="SQS_DLQ_URL")
+    # Matches the jobs queue visibility_timeout_seconds in infra/terraform/sqs.tf
+    sqs_visibility_timeout_s: int = Field(default=300, alias="SQS_VISIBILITY_TIMEOUT_S")
+    sqs_ack_flush_interval_s: float = Field(default=1.0, alias="SQS_ACK_FLUSH_INTERVAL_S")
 
     # EventBridge (AWS mode)
     eventbridge_bus_name: str = Field(default="default", alias="EVENTBRIDGE_BUS_NAME")
 
+    # Event bus (local): coalesce webhook publishes across concurrent requests; 0 disables
+    eventbus_batch_window_ms: float = Field(default=0.0, alias="EVENTBUS_BATCH_WINDOW_MS")
+
+    # Orchestrator (local event stream consumer)
+    orchestrator_read_count: int = Field(default=10, alias="ORCHESTRATOR_READ_COUNT")
+    orchestrator_block_ms: int = Field(default=5_000, alias="ORCHESTRATOR_BLOCK_MS")
+    orchestrator_claim_idle_ms: int = Field(default=60_000, alias="ORCHESTRATOR_CLAIM_IDLE_MS")
+    orchestrator_max_deliveries: int = Field(default=5, alias="ORCHESTRATOR_MAX_DELIVERIES")
+    orchestrator_consumer_idle_ms: int = Field(default=3_600_000, alias="ORCHESTRATOR_CONSUMER_IDLE_MS")
+    orchestrator_maintenance_interval_s: float = Field(default=15.0, alias="ORCHESTRATOR_MAINTENANCE_INTERVAL_S")
+    orchestrator_metrics_port: int = Field(default=9101, alias="ORCHESTRATOR_METRICS_PORT")
+
     # Worker
     worker_concurrency: int = Field(default=1, alias="WORKER_CONCURRENCY")
+    worker_probe_processes: int = Field(default=2, alias="WORKER_PROBE_PROCESSES")
+    # Per-stage pipeline threads; unset stages fall back to WORKER_CONCURRENCY
+    worker_download_workers: int | None = Field(default=None, alias="WORKER_DOWNLOAD_WORKERS")
+    worker_probe_workers: int | None = Field(default=None, alias="WORKER_PROBE_WORKERS")
+    worker_summarize_workers: int | None = Field(default=None, alias="WORKER_SUMMARIZE_WORKERS")
+    worker_persist_workers: int | None = Field(default=None, alias="WORKER_PERSIST_WORKERS")
+    worker_stage_queue_size: int = Field(default=4, alias="WORKER_STAGE_QUEUE_SIZE")
+    # native: parse MP4/MOV and Matroska/WebM headers in process, ffprobe for the rest.
+    worker_probe_engine: str = Field(default="native", alias="WORKER_PROBE_ENGINE")  # native|ffprobe
+    # Per-call ffprobe budget; a probe past its wall-clock or CPU limit is killed.
+    worker_probe_timeout_s: float = Field(default=120.0, alias="WORKER_PROBE_TIMEOUT_S")
+    worker_probe_max_cpu_s: int = Field(default=120, alias="WORKER_PROBE_MAX_CPU_S")
+    worker_probe_max_memory_mb: int = Field(default=2048, alias="WORKER_PROBE_MAX_MEMORY_MB")
+    worker_probe_max_output_mb: int = Field(default=64, alias="WORKER_PROBE_MAX_OUTPUT_MB")
+    worker_probe_mode: str = Field(default="ranged", alias="WORKER_PROBE_MODE")  # ranged|full
+    worker_probe_head_bytes: int = Field(default=1024 * 1024, alias="WORKER_PROBE_HEAD_BYTES")
+    worker_probe_tail_bytes: int = Field(default=1024 * 1024, alias="WORKER_PROBE_TAIL_BYTES")
+    worker_probe_max_moov_bytes: int = Field(default=64 * 1024 * 1024, alias="WORKER_PROBE_MAX_MOOV_BYTES")
     worker_max_attempts: int = Field(default=3, alias="WORKER_MAX_ATTEMPTS")
     worker_backoff_seconds: float = Field(default=1.0, alias="WORKER_BACKOFF_SECONDS")
+    # Per failure category overrides (JSON), e.g. '{"provider_error": {"max_attempts": 8}}';
+    # WORKER_MAX_ATTEMPTS/WORKER_BACKOFF_SECONDS apply to categories without a policy.
+    worker_retry_policies: dict[str, dict[str, float]] = Field(
+        default={}, alias="WORKER_RETRY_POLICIES"
+    )
     worker_metrics_port: int = Field(default=9100, alias="WORKER_METRICS_PORT")
 
+    # Content-addressed analysis cache (skip probe + summary for re-uploaded media)
+    content_cache_backend: str = Field(default="none", alias="CONTENT_CACHE_BACKEND")  # none|sqlite|redis
+    content_cache_ttl_s: int = Field(default=7 * 24 * 3600, alias="CONTENT_CACHE_TTL_S")
+    content_cache_max_entries: int = Field(default=100_000, alias="CONTENT_CACHE_MAX_ENTRIES")
+
     # Bedrock
     bedrock_mode: str = Field(default="mock", alias="BEDROCK_MODE")  # mock|aws
     bedrock_model_id: str = Field(
         default="anthropic.claude-3-sonnet-20240229-v1:0", alias="BEDROCK_MODEL_ID"
     )
+    bedrock_max_concurrency: int = Field(default=4, alias="BEDROCK_MAX_CONCURRENCY")
+    bedrock_rate_per_s: float = Field(default=5.0, alias="BEDROCK_RATE_PER_S")  # 0 disables
+    bedrock_burst: int = Field(default=10, alias="BEDROCK_BURST")
+    bedrock_max_attempts: int = Field(default=5, alias="BEDROCK_MAX_ATTEMPTS")
+    summary_cache_ttl_s: float = Field(default=24 * 3600, alias="SUMMARY_CACHE_TTL_S")
+    summary_cache_max_entries: int = Field(default=10_000, alias="SUMMARY_CACHE_MAX_ENTRIES")
+    summary_duration_bucket_s: float = Field(default=10.0, alias="SUMMARY_DURATION_BUCKET_S")
 
     # Observability
     prometheus_namespace: str = Field(default="edvmp", alias="PROMETHEUS_NAMESPACE")
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+import redis
+
+from edvmp.shared.metrics import content_cache_requests_total
+from edvmp.shared.store import SqliteDatabase
+
+
+@dataclass(frozen=True)
+class CachedAnalysis:
+    metadata: dict[str, Any]
+    summary: str
+
+    def to_json(self) -> str:
+        return json.dumps({"metadata": self.metadata, "summary": self.summary})
+
+    @staticmethod
+    def from_json(raw: str | bytes) -> CachedAnalysis:
+        data = json.loads(raw)
+        return CachedAnalysis(metadata=data["metadata"], summary=data["summary"])
+
+
+def content_key(*, etag: str | None, size: int | None) -> str | None:
+    """Identify object content by S3 ETag + size; None when either is unknown.
+
+    Single-part ETags are the MD5 of the body. Multipart ETags depend on the
+    part layout, so identical files uploaded with different part sizes miss.
+    """
+    if not etag or size is None:
+        return None
+    etag = etag.strip('"')
+    return f"{etag}:{int(size)}"
+
+
+class ContentCache(Protocol):
+    def get(self, key: str) -> CachedAnalysis | None: ...
+
+    def put(self, key: str, analysis: CachedAnalysis) -> None: ...
+
+
+class SqliteContentCache(SqliteDatabase):
+    """Content cache in a SQLite table; entries expire after ``ttl_s`` and the least recently used are evicted past ``max_entries``."""
+
+    def __init__(self, db_path: str, *, ttl_s: int, max_entries: int):
+        self._ttl_s = ttl_s
+        self._max_entries = max_entries
+        super().__init__(db_path)
+
+    def _init_schema(self) -> None:
+        with self._conn() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS content_cache (
+                  content_key TEXT PRIMARY KEY,
+                  analysis_json TEXT NOT NULL,
+                  expires_at REAL NOT NULL,
+                  last_used_at REAL NOT NULL
+                );
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_content_cache_last_used ON content_cache(last_used_at);"
+            )
+
+    def get(self, key: str) -> CachedAnalysis | None:
+        now = time.time()
+        with self._conn() as conn:
+            row = conn.execute(
+                "SELECT analysis_json FROM content_cache WHERE content_key = ? AND expires_at > ?;",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                content_cache_requests_total.labels(result="miss").inc()
+                return None
+            conn.execute(
+                "UPDATE content_cache SET last_used_at = ? WHERE content_key = ?;", (now, key)
+            )
+        content_cache_requests_total.labels(result="hit").inc()
+        return CachedAnalysis.from_json(row["analysis_json"])
+
+    def put(self, key: str, analysis: CachedAnalysis) -> None:
+        now = time.time()
+        with self.transaction(), self._conn() as conn:
+            conn.execute(
+                """
+                INSERT INTO content_cache(content_key, analysis_json, expires_at, last_used_at)
+                VALUES(?, ?, ?, ?)
+                ON CONFLICT(content_key) DO UPDATE SET
+                  analysis_json=excluded.analysis_json,
+                  expires_at=excluded.expires_at,
+                  last_used_at=excluded.last_used_at;
+                """,
+                (key, analysis.to_json(), now + self._ttl_s, now),
+            )
+            conn.execute("DELETE FROM content_cache WHERE expires_at <= ?;", (now,))
+            conn.execute(
+                """
+                DELETE FROM content_cache WHERE content_key IN (
+                  SELECT content_key FROM content_cache
+                  ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+                );
+                """,
+                (self._max_entries,),
+            )
+
+
+class RedisContentCache:
+    """Content cache in Redis: values expire via TTL, and a sorted set of last-use times drives LRU eviction."""
+
+    def __init__(self, client: redis.Redis, *, prefix: str, ttl_s: int, max_entries: int):
+        self._client = client
+        self._prefix = prefix
+        self._index = f"{prefix}:lru"
+        self._ttl_s = ttl_s
+        self._max_entries = max_entries
+
+    def get(self, key: str) -> CachedAnalysis | None:
+        raw = self._client.get(f"{self._prefix}:{key}")
+        if raw is None:
+            content_cache_requests_total.labels(result="miss").inc()
+            return None
+        self._client.zadd(self._index, {key: time.time()})
+        content_cache_requests_total.labels(result="hit").inc()
+        return CachedAnalysis.from_json(raw)
+
+    def put(self, key: str, analysis: CachedAnalysis) -> None:
+        pipe = self._client.pipeline(transaction=False)
+        pipe.set(f"{self._prefix}:{key}", analysis.to_json(), ex=self._ttl_s)
+        pipe.zadd(self._index, {key: time.time()})
+        pipe.zcard(self._index)
+        size = int(pipe.execute()[-1])
+        overflow = size - self._max_entries
+        if overflow > 0:
+            evicted = [k.decode("utf-8") for k, _ in self._client.zpopmin(self._index, overflow)]
+            self._client.delete(*(f"{self._prefix}:{k}" for k in evicted))
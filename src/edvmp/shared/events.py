@@ -1,15 +1,34 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import json
+import logging
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
 from typing import Any, cast
 
 import redis
+import redis.asyncio
+from redis.client import Pipeline
+
+from edvmp.shared.metrics import event_stream_dead_lettered_total
+
+logger = logging.getLogger("edvmp.events")
+
+
+@dataclass(frozen=True)
+class PendingStats:
+    count: int
+    oldest_age_s: float
 
 
 class RedisEventStream:
     def __init__(self, client: redis.Redis, stream_name: str):
         self._client = client
         self._stream_name = stream_name
+        self._claim_cursors: dict[str, str] = {}
 
     def publish(self, event: dict[str, Any]) -> str:
         message_id = self._client.xadd(
@@ -47,10 +66,291 @@ class RedisEventStream:
         )
         out: list[tuple[str, dict[str, Any]]] = []
         for _, messages in items:
-            for message_id, fields in messages:
-                event = json.loads(fields[b"event"].decode("utf-8"))
-                out.append((message_id.decode("utf-8"), event))
+            out.extend(_decode_entries(messages))
         return out
 
+    def claim_pending(
+        self,
+        *,
+        group_name: str,
+        consumer_name: str,
+        min_idle_ms: int,
+        count: int = 10,
+        max_deliveries: int = 0,
+        dlq_name: str | None = None,
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """Take over entries another consumer read but never acked (e.g. it crashed mid-batch).
+
+        Successive calls walk the pending list with XAUTOCLAIM's cursor and wrap
+        around once it is exhausted. With ``max_deliveries`` set, entries
+        delivered more often than that are pushed to ``dlq_name`` and acked
+        instead of returned, so one poison event cannot loop forever. Entries
+        trimmed from the stream while pending are acked: nothing is left to process.
+        """
+        start_id = self._claim_cursors.get(group_name, "0-0")
+        res = self._client.xautoclaim(
+            self._stream_name,
+            group_name,
+            consumer_name,
+            min_idle_time=min_idle_ms,
+            start_id=start_id,
+            count=count,
+        )
+        next_id, messages = res[0], res[1]
+        self._claim_cursors[group_name] = next_id.decode("utf-8") if isinstance(next_id, bytes) else next_id
+        trimmed = [_str_id(message_id) for message_id, fields in messages if not fields]
+        entries = _decode_entries(messages)
+        poisoned: list[tuple[str, dict[str, Any], int]] = []
+        if max_deliveries and entries:
+            deliveries = self._delivery_counts(group_name, [message_id for message_id, _ in entries])
+            poisoned = [(i, e, deliveries[i]) for i, e in entries if deliveries.get(i, 0) > max_deliveries]
+            entries = [(i, e) for i, e in entries if deliveries.get(i, 0) <= max_deliveries]
+        if trimmed or poisoned:
+            pipe = self._client.pipeline(transaction=True)
+            for message_id, event, delivered in poisoned:
+                pipe.rpush(
+                    dlq_name or f"{self._stream_name}:dead",
+                    json.dumps(
+                        {
+                            "job_id": event.get("job_id"),
+                            "event_id": message_id,
+                            "event": event,
+                            "error_code": "poison_event",
+                            "error_message": f"event failed {delivered} deliveries",
+                        }
+                    ),
+                )
+            pipe.xack(self._stream_name, group_name, *trimmed, *(i for i, _, _ in poisoned))
+            pipe.execute()
+        if poisoned:
+            event_stream_dead_lettered_total.labels(group=group_name).inc(len(poisoned))
+            logger.warning(
+                "event_stream_dead_lettered",
+                extra={"group": group_name, "message_ids": [i for i, _, _ in poisoned]},
+            )
+        return entries
+
+    def _delivery_counts(self, group_name: str, message_ids: Sequence[str]) -> dict[str, int]:
+        pipe = self._client.pipeline(transaction=False)
+        for message_id in message_ids:
+            pipe.xpending_range(self._stream_name, group_name, min=message_id, max=message_id, count=1)
+        counts: dict[str, int] = {}
+        for rows in pipe.execute():
+            for row in rows:
+                counts[_str_id(row["message_id"])] = int(row["times_delivered"])
+        return counts
+
+    def pending_stats(self, group_name: str) -> PendingStats:
+        summary = self._client.xpending(self._stream_name, group_name)
+        count = int(summary.get("pending") or 0)
+        oldest_id = summary.get("min")
+        if not count or not oldest_id:
+            return PendingStats(count=0, oldest_age_s=0.0)
+        if isinstance(oldest_id, bytes):
+            oldest_id = oldest_id.decode("utf-8")
+        # Stream IDs start with the entry's creation time in milliseconds.
+        created_ms = int(str(oldest_id).split("-", 1)[0])
+        return PendingStats(count=count, oldest_age_s=max(0.0, time.time() - created_ms / 1000))
+
+    def remove_idle_consumers(self, group_name: str, *, min_idle_ms: int) -> list[str]:
+        """Drop consumers (e.g. replicas that were scaled away) idle for ``min_idle_ms`` with nothing pending."""
+        removed: list[str] = []
+        for c in self._client.xinfo_consumers(self._stream_name, group_name):
+            name = c["name"].decode("utf-8") if isinstance(c["name"], bytes) else str(c["name"])
+            if int(c["pending"]) == 0 and int(c["idle"]) >= min_idle_ms:
+                self._client.xgroup_delconsumer(self._stream_name, group_name, name)
+                removed.append(name)
+        return removed
+
     def ack(self, group_name: str, message_id: str) -> None:
         self._client.xack(self._stream_name, group_name, message_id)
+
+    def ack_many(self, group_name: str, message_ids: Sequence[str], *, pipe: Pipeline | None = None) -> None:
+        if not message_ids:
+            return
+        (pipe or self._client).xack(self._stream_name, group_name, *message_ids)
+
+
+class AsyncRedisEventStream:
+    """asyncio publisher for the event stream; writes a batch of events with one pipelined round trip."""
+
+    def __init__(self, client: redis.asyncio.Redis, stream_name: str):
+        self._client = client
+        self._stream_name = stream_name
+
+    async def publish(self, event: dict[str, Any]) -> str:
+        ids = await self.publish_many([event])
+        return ids[0]
+
+    async def publish_many(self, events: Sequence[dict[str, Any]]) -> list[str]:
+        if not events:
+            return []
+        pipe = self._client.pipeline(transaction=False)
+        for event in events:
+            pipe.xadd(self._stream_name, fields={"event": json.dumps(event)}, maxlen=10_000, approximate=True)
+        ids = await pipe.execute()
+        return [i.decode("utf-8") if isinstance(i, bytes) else str(i) for i in ids]
+
+    async def latest_id(self) -> str:
+        """Id of the newest entry (``0-0`` on an empty stream), a concrete position to XREAD after."""
+        newest = await self._client.xrevrange(self._stream_name, "+", "-", count=1)
+        return _str_id(newest[0][0]) if newest else "0-0"
+
+    async def read(self, last_id: str, *, count: int, block_ms: int) -> list[tuple[str, dict[str, Any]]]:
+        """Plain XREAD (no consumer group) of entries after ``last_id``."""
+        resp = await self._client.xread({self._stream_name: last_id}, count=count, block=block_ms)
+        if not resp:
+            return []
+        _, messages = resp[0]
+        return _decode_entries(messages)
+
+
+class PublishBatcher:
+    """Coalesces publishes from concurrent requests into one pipeline per ``window_s``.
+
+    Every caller waits for the flush that carries its events, so a request still
+    only returns once its events are in the stream.
+    """
+
+    def __init__(self, stream: AsyncRedisEventStream, *, window_s: float, max_batch: int = 1_000):
+        self._stream = stream
+        self._window_s = window_s
+        self._max_batch = max_batch
+        self._pending: list[tuple[Sequence[dict[str, Any]], asyncio.Future[None]]] = []
+        self._pending_events = 0
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flushing: set[asyncio.Task[None]] = set()
+
+    async def publish_many(self, events: Sequence[dict[str, Any]]) -> None:
+        if not events:
+            return
+        if self._window_s <= 0:
+            await self._stream.publish_many(events)
+            return
+        loop = asyncio.get_running_loop()
+        done: asyncio.Future[None] = loop.create_future()
+        self._pending.append((events, done))
+        self._pending_events += len(events)
+        if self._pending_events >= self._max_batch:
+            self._schedule_flush(loop)
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._window_s, self._schedule_flush, loop)
+        await done
+
+    def _schedule_flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending, self._pending_events = self._pending, [], 0
+        if batch:
+            task = loop.create_task(self._flush(batch))
+            self._flushing.add(task)
+            task.add_done_callback(self._flushing.discard)
+
+    async def _flush(self, batch: list[tuple[Sequence[dict[str, Any]], asyncio.Future[None]]]) -> None:
+        try:
+            await self._stream.publish_many([e for events, _ in batch for e in events])
+        except Exception as e:
+            for _, done in batch:
+                if not done.done():
+                    done.set_exception(e)
+            return
+        for _, done in batch:
+            if not done.done():
+                done.set_result(None)
+
+
+class EventFanout:
+    """One stream reader per process that hands events to in-process subscribers by ``job_id``.
+
+    The reader starts with the first subscriber and stops with the last, so an
+    idle API process holds no blocking read against Redis. It tails new entries
+    from the stream's newest id, resolved before ``subscribe`` returns and then
+    carried forward from read to read; XREAD from ``$`` would instead drop
+    whatever lands between two reads. A subscriber that stops draining its queue
+    loses its oldest events rather than stalling the others.
+    """
+
+    def __init__(
+        self, stream: AsyncRedisEventStream, *, block_ms: int = 5_000, count: int = 500, queue_size: int = 16
+    ):
+        self._stream = stream
+        self._block_ms = block_ms
+        self._count = count
+        self._queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue[dict[str, Any]]]] = {}
+        self._reader: asyncio.Task[None] | None = None
+        self._starting = asyncio.Lock()
+
+    async def subscribe(self, job_id: str) -> asyncio.Queue[dict[str, Any]]:
+        """Register for ``job_id``'s events; every entry added after this returns is delivered."""
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        async with self._starting:
+            if self._reader is None or self._reader.done():
+                try:
+                    start_id: str | None = await self._stream.latest_id()
+                except Exception:
+                    # The reader resolves it itself once Redis answers; until then
+                    # the SSE heartbeat's store re-check covers the subscriber.
+                    logger.exception("event_fanout_read_failed")
+                    start_id = None
+                self._reader = asyncio.get_running_loop().create_task(self._run(start_id))
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue[dict[str, Any]]) -> None:
+        queues = self._subscribers.get(job_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[job_id]
+        if not self._subscribers and self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(q) for q in self._subscribers.values())
+
+    async def _run(self, last_id: str | None) -> None:
+        while True:
+            try:
+                if last_id is None:
+                    last_id = await self._stream.latest_id()
+                entries = await self._stream.read(last_id, count=self._count, block_ms=self._block_ms)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("event_fanout_read_failed")
+                await asyncio.sleep(1.0)
+                continue
+            for message_id, event in entries:
+                last_id = message_id
+                for queue in tuple(self._subscribers.get(str(event.get("job_id")), ())):
+                    if queue.full():
+                        queue.get_nowait()
+                    queue.put_nowait(event)
+
+    async def aclose(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reader
+            self._reader = None
+
+
+def _str_id(message_id: bytes | str) -> str:
+    return message_id.decode("utf-8") if isinstance(message_id, bytes) else message_id
+
+
+def _decode_entries(messages: Sequence[tuple[bytes, dict[bytes, bytes] | None]]) -> list[tuple[str, dict[str, Any]]]:
+    out: list[tuple[str, dict[str, Any]]] = []
+    for message_id, fields in messages:
+        # Entries trimmed from the stream while pending come back without fields;
+        # claim_pending acks them.
+        if not fields:
+            continue
+        event = json.loads(fields[b"event"].decode("utf-8"))
+        out.append((_str_id(message_id), event))
+    return out
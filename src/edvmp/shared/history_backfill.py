@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import logging
+
+from edvmp.shared.backends import get_store
+from edvmp.shared.config import Settings
+from edvmp.shared.logging import configure_logging
+
+logger = logging.getLogger("edvmp.history_backfill")
+
+
+def main() -> None:
+    """Move jobs onto the sharded index keys, then set DDB_HISTORY_READ_LEGACY=false.
+
+    Jobs leave the legacy single HISTORY partition, jobs written before
+    gsi2/gsi3 were sharded get their STATUS#/ERR# keys, and results stored
+    before /search get their projection and CATALOG#/<codec># keys.
+    """
+    settings = Settings()
+    configure_logging(settings.log_level)
+    if settings.store_backend != "dynamodb":
+        raise RuntimeError("History backfill only applies to STORE_BACKEND=dynamodb")
+
+    store = get_store(settings)
+    moved = store.backfill_history_shards()
+    keyed = store.backfill_filter_shards()
+    searchable = store.backfill_result_search_keys()
+    logger.info(
+        "history_backfill_completed",
+        extra={
+            "moved": moved,
+            "filter_keyed": keyed,
+            "results_keyed": searchable,
+            "shards": settings.ddb_history_shards,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 
 def api_metrics(namespace: str) -> tuple[Counter, Histogram]:
@@ -18,6 +18,48 @@ def api_metrics(namespace: str) -> tuple[Counter, Histogram]:
     return requests_total, latency
 
 
+auth_cache_requests_total = Counter(
+    "edvmp_auth_cache_requests_total",
+    "Bearer token verifications by cache result",
+    labelnames=("result",),
+)
+auth_duration = Histogram(
+    "edvmp_auth_duration_seconds",
+    "Time spent authenticating a request (seconds)",
+    buckets=(0.00001, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005, 0.01),
+)
+api_event_subscribers = Gauge(
+    "edvmp_api_event_subscribers",
+    "Open /jobs/{id}/events streams in this API process",
+)
+store_cache_requests_total = Counter(
+    "edvmp_store_cache_requests_total",
+    "API job/result lookups by cache tier that answered (hit, redis_hit, miss)",
+    labelnames=("kind", "result"),
+)
+queue_wait_seconds = Histogram(
+    "edvmp_queue_wait_seconds",
+    "Time a job message waited in the jobs queue before a worker took it (seconds)",
+    labelnames=("priority",),
+    buckets=(0.1, 0.5, 1, 2, 5, 10, 30, 60, 120, 300, 900, 1800, 3600),
+)
+queue_leases_expired_total = Counter(
+    "edvmp_queue_leases_expired_total",
+    "Redis queue messages put back for redelivery after their lease expired",
+)
+queue_lease_extensions_failed_total = Counter(
+    "edvmp_queue_lease_extensions_failed_total",
+    "SQS visibility extensions that failed; those messages may be redelivered mid-job",
+)
+queue_dead_lettered_total = Counter(
+    "edvmp_queue_dead_lettered_total",
+    "Redis queue messages dropped for the DLQ after REDIS_QUEUE_MAX_DELIVERIES expired leases",
+)
+worker_retries_total = Counter(
+    "edvmp_worker_retries_total",
+    "Failed job attempts scheduled for a delayed retry",
+    labelnames=("category",),
+)
 worker_jobs_total = Counter(
     "edvmp_worker_jobs_total",
     "Worker job outcomes",
@@ -28,6 +70,63 @@ worker_job_duration = Histogram(
     "Worker job duration (seconds)",
     buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60),
 )
+worker_stage_queue_depth = Gauge(
+    "edvmp_worker_stage_queue_depth",
+    "Jobs waiting for a free thread in a worker pipeline stage",
+    labelnames=("stage",),
+)
+worker_stage_duration = Histogram(
+    "edvmp_worker_stage_duration_seconds",
+    "Worker pipeline stage service time (seconds)",
+    labelnames=("stage",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60),
+)
+probe_duration = Histogram(
+    "edvmp_probe_duration_seconds",
+    "Probe wall time per call, by outcome (native, ok, error, timeout, cpu_limit)",
+    labelnames=("outcome",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 120, 300),
+)
+probe_kills_total = Counter(
+    "edvmp_probe_kills_total",
+    "ffprobe processes killed for exceeding their time or CPU budget",
+    labelnames=("reason",),
+)
+event_stream_pending = Gauge(
+    "edvmp_event_stream_pending",
+    "Event stream entries delivered to a consumer group but not yet acked",
+    labelnames=("group",),
+)
+event_stream_oldest_pending_age = Gauge(
+    "edvmp_event_stream_oldest_pending_age_seconds",
+    "Age of the oldest unacked event stream entry (seconds)",
+    labelnames=("group",),
+)
+event_stream_reclaimed_total = Counter(
+    "edvmp_event_stream_reclaimed_total",
+    "Idle pending entries taken over from other consumers",
+    labelnames=("group",),
+)
+event_stream_dead_lettered_total = Counter(
+    "edvmp_event_stream_dead_lettered_total",
+    "Pending entries acked and moved to the DLQ after too many deliveries",
+    labelnames=("group",),
+)
+content_cache_requests_total = Counter(
+    "edvmp_content_cache_requests_total",
+    "Content-addressed analysis cache lookups",
+    labelnames=("result",),
+)
+summary_cache_requests_total = Counter(
+    "edvmp_summary_cache_requests_total",
+    "Summary lookups by outcome (hit, miss, coalesced onto an in-flight call)",
+    labelnames=("result",),
+)
+bedrock_invocations_total = Counter(
+    "edvmp_bedrock_invocations_total",
+    "Bedrock invoke_model calls by outcome",
+    labelnames=("outcome",),
+)
 dlq_messages_total = Counter(
     "edvmp_dlq_messages_total",
     "DLQ messages produced",
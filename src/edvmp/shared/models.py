@@ -15,6 +15,12 @@ class JobStatus(StrEnum):
     failed = "FAILED"
 
 
+class JobPriority(StrEnum):
+    interactive = "interactive"
+    standard = "standard"
+    bulk = "bulk"
+
+
 class JobRecord(BaseModel):
     job_id: str
     status: JobStatus
@@ -24,12 +30,38 @@ class JobRecord(BaseModel):
     s3_key: str
     error_code: str | None = None
     error_message: str | None = None
+    priority: JobPriority = JobPriority.standard
+    submitter: str | None = None
+
+
+class ResultProjection(BaseModel):
+    """Typed subset of the ffprobe output, stored as plain columns/attributes."""
+
+    duration_s: float | None = None
+    format_name: str | None = None
+    bit_rate: int | None = None
+    video_codec: str | None = None
+    width: int | None = None
+    height: int | None = None
+    audio_codec: str | None = None
+    stream_count: int = 0
+    video_streams: int = 0
+    audio_streams: int = 0
 
 
 class JobResult(BaseModel):
     job_id: str
-    metadata: dict[str, Any]
     summary: str
+    projection: ResultProjection
+    # The full ffprobe payload; only loaded (and decompressed) when explicitly requested.
+    metadata: dict[str, Any] | None = None
+
+
+class SearchHit(BaseModel):
+    job_id: str
+    completed_at: datetime
+    summary: str
+    projection: ResultProjection
 
 
 class ObjectCreatedEvent(BaseModel):
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+from edvmp.shared.models import JobRecord, JobStatus, SearchHit
+
+
+class InvalidCursor(ValueError):
+    """The cursor is malformed or was issued for a different query shape."""
+
+
+@dataclass(frozen=True)
+class JobQuery:
+    """Filters for a job listing; ``created_after`` is inclusive and ``created_before`` exclusive."""
+
+    status: JobStatus | None = None
+    error_code: str | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+
+
+@dataclass(frozen=True)
+class JobPage:
+    items: list[JobRecord] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
+@dataclass(frozen=True)
+class RowPage:
+    """A page of JSON-ready dicts, for responses that skip model validation."""
+
+    items: list[dict[str, Any]] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
+@dataclass(frozen=True)
+class ResultQuery:
+    """Catalog filters over stored results; codec and format matches are exact, ranges inclusive."""
+
+    video_codec: str | None = None
+    audio_codec: str | None = None
+    format_name: str | None = None
+    min_width: int | None = None
+    min_height: int | None = None
+    min_duration_s: float | None = None
+    max_duration_s: float | None = None
+
+    def filters(self) -> list[tuple[str, str, Any]]:
+        """``(attribute, operator, value)`` for each filter that is set."""
+        filters: list[tuple[str, str, Any]] = []
+        for attribute, op, value in (
+            ("video_codec", "=", self.video_codec),
+            ("audio_codec", "=", self.audio_codec),
+            ("format_name", "=", self.format_name),
+            ("width", ">=", self.min_width),
+            ("height", ">=", self.min_height),
+            ("duration_s", ">=", self.min_duration_s),
+            ("duration_s", "<=", self.max_duration_s),
+        ):
+            if value is not None:
+                filters.append((attribute, op, value))
+        return filters
+
+
+@dataclass(frozen=True)
+class SearchPage:
+    items: list[SearchHit] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
+def iso_utc(value: datetime) -> str:
+    """Render a timestamp the way the stores write ``created_at`` so string comparison orders correctly."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.astimezone(UTC).isoformat()
+
+
+def json_timestamp(value: str) -> str:
+    """A stored ``isoformat()`` UTC timestamp, rendered the way pydantic serializes it (``Z`` suffix)."""
+    return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    raw = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursor("cursor is not valid") from e
+    if not isinstance(payload, dict):
+        raise InvalidCursor("cursor is not valid")
+    return payload
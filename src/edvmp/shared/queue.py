@@ -1,10 +1,25 @@
 from __future__ import annotations
 
 import json
+import logging
+import threading
+import time
+import uuid
+from collections.abc import Callable, Mapping, Sequence
 from dataclasses import dataclass
 from typing import Any
 
 import redis
+from redis.client import Pipeline
+
+from edvmp.shared.metrics import (
+    queue_dead_lettered_total,
+    queue_leases_expired_total,
+    queue_wait_seconds,
+)
+from edvmp.shared.models import JobPriority
+
+logger = logging.getLogger("edvmp.queue")
 
 
 @dataclass(frozen=True)
@@ -12,29 +27,493 @@ class QueueMessage:
     message_type: str
     payload: dict[str, Any]
 
+    def to_dict(self) -> dict[str, Any]:
+        return {"message_type": self.message_type, "payload": self.payload}
+
     def to_json(self) -> str:
-        return json.dumps({"message_type": self.message_type, "payload": self.payload})
+        return json.dumps(self.to_dict())
 
     @staticmethod
-    def from_json(raw: str) -> QueueMessage:
-        data = json.loads(raw)
+    def from_dict(data: dict[str, Any]) -> QueueMessage:
         return QueueMessage(message_type=data["message_type"], payload=data["payload"])
 
+    @staticmethod
+    def from_json(raw: str) -> QueueMessage:
+        return QueueMessage.from_dict(json.loads(raw))
+
+
+# Shared by the scripts below. ``activate`` marks a submitter and its class runnable;
+# newcomers start at the last dispatched pass, so idle time earns no burst credit.
+# ``restore`` puts a parked entry (a lease or a delayed retry) back: legacy messages at the
+# head of the list, scheduled ones into their submitter's set at their recorded score.
+# Deadlines use the Redis clock so workers with skewed clocks agree on expiry.
+# ``prefix`` is the hash tag ``{<queue>}``: the per-class and per-submitter keys built here
+# share one Redis Cluster slot with the declared keys (and with the legacy list ``<queue>``,
+# which hashes the same), so every script stays on one node.
+_LUA_HELPERS = """
+local function activate(prefix, classes, vtime, class, submitter)
+  local active = prefix .. ':c:' .. class .. ':active'
+  if not redis.call('ZSCORE', active, submitter) then
+    redis.call('ZADD', active, tonumber(redis.call('HGET', vtime, class) or '0'), submitter)
+  end
+  if not redis.call('ZSCORE', classes, class) then
+    redis.call('ZADD', classes, tonumber(redis.call('HGET', vtime, '*') or '0'), class)
+  end
+end
+local function restore(prefix, legacy, classes, vtime, r)
+  if r.k then
+    redis.call('ZADD', prefix .. ':c:' .. r.k .. ':s:' .. r.s, r.p, r.m)
+    activate(prefix, classes, vtime, r.k, r.s)
+  else
+    redis.call('LPUSH', legacy, r.m)
+  end
+end
+local function now_ms()
+  local t = redis.call('TIME')
+  return t[1] * 1000 + math.floor(t[2] / 1000)
+end
+local function entry_id(m)
+  local ok, e = pcall(cjson.decode, m)
+  if ok and type(e) == 'table' and e.id then return e.id end
+  return m
+end
+"""
+
+_ENQUEUE_SCRIPT = (
+    _LUA_HELPERS
+    + """
+local classes, vtime, wake = KEYS[1], KEYS[2], KEYS[3]
+local prefix, member, score, class, submitter = ARGV[1], ARGV[2], ARGV[3], ARGV[4], ARGV[5]
+redis.call('ZADD', prefix .. ':c:' .. class .. ':s:' .. submitter, score, member)
+activate(prefix, classes, vtime, class, submitter)
+redis.call('RPUSH', wake, '1')
+redis.call('LTRIM', wake, -64, -1)
+"""
+)
+
+# Stride scheduling at two levels: the class with the lowest virtual pass goes next, then
+# the submitter with the lowest pass inside it. A class advances by 1/weight per job; a
+# submitter by cost/weight, where cost grows with file size. Delayed retries that are due
+# join the queue first. With a lease, the taken entry is parked in the in-flight hash until
+# it is acked or its deadline passes; the record carries how many earlier leases of the
+# entry expired (``d``), which the deliveries hash keeps only while the entry is queued.
+_DEQUEUE_SCRIPT = (
+    _LUA_HELPERS
+    + """
+local legacy, classes, vtime, leases, inflight = KEYS[1], KEYS[2], KEYS[3], KEYS[4], KEYS[5]
+local delayed, deliveries = KEYS[6], KEYS[7]
+local prefix = ARGV[1]
+local class_weights, submitter_weights = cjson.decode(ARGV[2]), cjson.decode(ARGV[3])
+local lease_ms, lease_id = tonumber(ARGV[4]), ARGV[5]
+local function lease(record)
+  local id = entry_id(record.m)
+  record.d = tonumber(redis.call('HGET', deliveries, id) or '0')
+  redis.call('HDEL', deliveries, id)
+  if lease_ms > 0 then
+    redis.call('HSET', inflight, lease_id, cjson.encode(record))
+    redis.call('ZADD', leases, now_ms() + lease_ms, lease_id)
+  end
+end
+local due = redis.call('ZRANGEBYSCORE', delayed, '-inf', now_ms(), 'LIMIT', 0, 100)
+for _, raw in ipairs(due) do
+  redis.call('ZREM', delayed, raw)
+  restore(prefix, legacy, classes, vtime, cjson.decode(raw))
+end
+local old = redis.call('LPOP', legacy)
+if old then
+  lease({m = old})
+  return {'', old}
+end
+local c = redis.call('ZRANGE', classes, 0, 0, 'WITHSCORES')
+if #c == 0 then return nil end
+local class, cpass = c[1], tonumber(c[2])
+local active = prefix .. ':c:' .. class .. ':active'
+local s = redis.call('ZRANGE', active, 0, 0, 'WITHSCORES')
+if #s == 0 then
+  redis.call('ZREM', classes, class)
+  return nil
+end
+local submitter, spass = s[1], tonumber(s[2])
+local entries = prefix .. ':c:' .. class .. ':s:' .. submitter
+local e = redis.call('ZRANGE', entries, 0, 0, 'WITHSCORES')
+local member = e[1]
+redis.call('ZREM', entries, member)
+redis.call('HSET', vtime, class, spass, '*', cpass)
+if redis.call('ZCARD', entries) == 0 then
+  redis.call('ZREM', active, submitter)
+else
+  local cost = tonumber(cjson.decode(member)['c']) or 1
+  redis.call('ZADD', active, spass + cost / (submitter_weights[submitter] or 1), submitter)
+end
+if redis.call('ZCARD', active) == 0 then
+  redis.call('ZREM', classes, class)
+else
+  redis.call('ZADD', classes, cpass + 1 / (class_weights[class] or 1), class)
+end
+lease({k = class, s = submitter, m = member, p = e[2]})
+return {class, member}
+"""
+)
+
+# Due times come from the Redis clock, the one the dequeue script promotes by, so a worker
+# whose clock is skewed cannot hold a retry back (or release it early).
+_DELAY_SCRIPT = (
+    _LUA_HELPERS
+    + """
+redis.call('ZADD', KEYS[1], now_ms() + tonumber(ARGV[1]), ARGV[2])
+"""
+)
+
+# Returns the lease ids that no longer exist (already reaped), so the caller can report them.
+_EXTEND_SCRIPT = (
+    _LUA_HELPERS
+    + """
+local leases, deadline = KEYS[1], now_ms() + tonumber(ARGV[1])
+local lost = {}
+for i = 2, #ARGV do
+  if redis.call('ZSCORE', leases, ARGV[i]) then
+    redis.call('ZADD', leases, deadline, ARGV[i])
+  else
+    table.insert(lost, ARGV[i])
+  end
+end
+return lost
+"""
+)
+
+# Puts expired leases back where they came from, at their original place in line. An entry
+# whose lease has now expired ``max_deliveries`` times is dropped instead and returned as
+# (class, member) pairs after the requeued count, for the caller to dead-letter; the DLQ
+# lives outside this queue's cluster slot, so the script cannot push there itself.
+_REAP_SCRIPT = (
+    _LUA_HELPERS
+    + """
+local leases, inflight, legacy, classes, vtime, wake = KEYS[1], KEYS[2], KEYS[3], KEYS[4], KEYS[5], KEYS[6]
+local deliveries = KEYS[7]
+local prefix, limit, max_deliveries = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3])
+local expired = redis.call('ZRANGEBYSCORE', leases, '-inf', now_ms(), 'LIMIT', 0, limit)
+local out = {0}
+for _, id in ipairs(expired) do
+  local raw = redis.call('HGET', inflight, id)
+  redis.call('ZREM', leases, id)
+  redis.call('HDEL', inflight, id)
+  if raw then
+    local r = cjson.decode(raw)
+    local n = (r.d or 0) + 1
+    if max_deliveries > 0 and n >= max_deliveries then
+      table.insert(out, r.k or '')
+      table.insert(out, r.m)
+    else
+      redis.call('HSET', deliveries, entry_id(r.m), n)
+      restore(prefix, legacy, classes, vtime, r)
+      redis.call('RPUSH', wake, '1')
+      out[1] = out[1] + 1
+    end
+  end
+end
+redis.call('LTRIM', wake, -64, -1)
+return out
+"""
+)
+
+
+class RedeliveryLimitExceeded(RuntimeError):
+    """A message's lease expired ``max_deliveries`` times; its job fails instead of looping."""
+
+
+@dataclass(frozen=True)
+class RedisReceived:
+    message: QueueMessage
+    lease_id: str
+
+
+@dataclass(frozen=True)
+class Reaped:
+    requeued: int
+    # Messages whose lease expired ``max_deliveries`` times; they are no longer queued.
+    dead_lettered: list[QueueMessage]
+
 
 class RedisQueue:
-    def __init__(self, client: redis.Redis, queue_name: str):
+    """Jobs queue with priority classes, per-submitter weighted fair queuing and size-aware ordering.
+
+    Messages carry ``priority`` and ``submitter`` in their payload. Each
+    (class, submitter) pair has its own sorted set ordered by enqueue time plus
+    ``size_penalty_s_per_gib`` per GiB of ``size``, so a small file can overtake
+    a large one queued shortly before it. Classes share workers in proportion
+    to ``class_weights`` and submitters within a class in proportion to
+    ``submitter_weights``, so a backfill cannot starve interactive uploads.
+    Messages left in the plain list at ``queue_name`` by older producers are
+    served first.
+
+    Every other key is ``{queue_name}:...``. The hash tag puts the whole queue,
+    including the keys the scripts derive, in the same Redis Cluster slot as
+    the plain list, so the queue works on Cluster but lives on one shard.
+
+    ``receive`` leases a message for ``lease_s`` instead of removing it: the
+    consumer acks it when done or extends the lease while working, and
+    ``requeue_expired`` puts back messages whose consumer went away, up to
+    ``max_deliveries`` leases per message (0 for no limit).
+    ``dequeue_blocking`` takes a message without a lease (at most once).
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        queue_name: str,
+        *,
+        class_weights: Mapping[str, float] | None = None,
+        submitter_weights: Mapping[str, float] | None = None,
+        size_penalty_s_per_gib: float = 60.0,
+        lease_s: float = 300.0,
+        max_deliveries: int = 0,
+    ):
         self._client = client
         self._queue_name = queue_name
+        self._prefix = f"{{{queue_name}}}"
+        self._classes = f"{self._prefix}:classes"
+        self._vtime = f"{self._prefix}:vtime"
+        self._wake = f"{self._prefix}:wake"
+        self._leases = f"{self._prefix}:leases"
+        self._inflight = f"{self._prefix}:inflight"
+        self._delayed = f"{self._prefix}:delayed"
+        self._deliveries = f"{self._prefix}:deliveries"
+        self._class_weights = json.dumps(dict(class_weights or {}))
+        self._submitter_weights = json.dumps(dict(submitter_weights or {}))
+        self._size_penalty_s_per_gib = size_penalty_s_per_gib
+        self.lease_s = lease_s
+        self._max_deliveries = max_deliveries
+        self._enqueue_script = client.register_script(_ENQUEUE_SCRIPT)
+        self._dequeue_script = client.register_script(_DEQUEUE_SCRIPT)
+        self._delay_script = client.register_script(_DELAY_SCRIPT)
+        self._extend_script = client.register_script(_EXTEND_SCRIPT)
+        self._reap_script = client.register_script(_REAP_SCRIPT)
 
     def enqueue(self, message: QueueMessage) -> None:
-        self._client.rpush(self._queue_name, message.to_json())
+        self.enqueue_many([message])
+
+    def enqueue_many(
+        self, messages: Sequence[QueueMessage], *, pipe: Pipeline | None = None
+    ) -> None:
+        """Schedule all messages in one round trip, optionally queued on a caller's pipeline."""
+        if not messages:
+            return
+        target = pipe if pipe is not None else self._client.pipeline(transaction=False)
+        now = time.time()
+        for i, message in enumerate(messages):
+            # The microsecond step keeps batch order; equal scores would sort by random id.
+            entry = self._entry(message, now, order=i * 1e-6)
+            self._enqueue_script(
+                keys=[self._classes, self._vtime, self._wake],
+                args=[self._prefix, entry["m"], entry["p"], entry["k"], entry["s"]],
+                client=target,
+            )
+        if pipe is None:
+            target.execute()
+
+    def enqueue_delayed(self, message: QueueMessage, delay_s: float) -> None:
+        """Hold ``message`` back for ``delay_s``; the first dequeue after that schedules it."""
+        # Local time only orders the entry among its submitter's jobs once it is promoted.
+        entry = self._entry(message, time.time() + delay_s)
+        self._delay_script(keys=[self._delayed], args=[int(delay_s * 1000), json.dumps(entry)])
+
+    def _entry(self, message: QueueMessage, at: float, *, order: float = 0.0) -> dict[str, Any]:
+        """The scheduled form of ``message``: class, submitter, score and sorted-set member."""
+        size_gib = _size_bytes(message) / 2**30
+        member = json.dumps(
+            {"id": uuid.uuid4().hex, "t": at, "c": 1 + size_gib, "m": message.to_dict()}
+        )
+        return {
+            "k": message_priority(message),
+            "s": str(message.payload.get("submitter") or "-"),
+            # A string, so Lua (cjson keeps 14 digits) does not round away the batch order.
+            "p": repr(at + order + size_gib * self._size_penalty_s_per_gib),
+            "m": member,
+        }
 
     def dequeue_blocking(self, timeout_s: int = 5) -> QueueMessage | None:
-        item = self._client.blpop(self._queue_name, timeout=timeout_s)
-        if not item:
-            return None
-        _, raw = item
-        return QueueMessage.from_json(raw.decode("utf-8"))
+        received = self._take(timeout_s, lease_ms=0)
+        return received.message if received is not None else None
+
+    def receive(self, *, timeout_s: float = 5) -> RedisReceived | None:
+        """Lease the next message for ``lease_s``; it is redelivered unless acked or extended."""
+        return self._take(timeout_s, lease_ms=int(self.lease_s * 1000))
+
+    def ack_batch(self, lease_ids: Sequence[str]) -> None:
+        if not lease_ids:
+            return
+        pipe = self._client.pipeline()
+        pipe.zrem(self._leases, *lease_ids)
+        pipe.hdel(self._inflight, *lease_ids)
+        pipe.execute()
+
+    def extend_batch(self, lease_ids: Sequence[str]) -> list[str]:
+        """Push the deadlines ``lease_s`` out; returns the ids that had already expired."""
+        if not lease_ids:
+            return []
+        lost = self._extend_script(keys=[self._leases], args=[int(self.lease_s * 1000), *lease_ids])
+        return [raw.decode("utf-8") for raw in lost]
+
+    def requeue_expired(self, max_items: int = 100) -> Reaped:
+        """Return up to ``max_items`` expired leases to the queue; safe to run from every worker."""
+        requeued, *dead = self._reap_script(
+            keys=[
+                self._leases,
+                self._inflight,
+                self._queue_name,
+                self._classes,
+                self._vtime,
+                self._wake,
+                self._deliveries,
+            ],
+            args=[self._prefix, max_items, self._max_deliveries],
+        )
+        messages = []
+        for priority, raw in zip(dead[::2], dead[1::2], strict=True):
+            if priority:
+                messages.append(QueueMessage.from_dict(json.loads(raw)["m"]))
+            else:
+                messages.append(QueueMessage.from_json(raw.decode("utf-8")))
+        return Reaped(requeued=int(requeued), dead_lettered=messages)
+
+    def _take(self, timeout_s: float, *, lease_ms: int) -> RedisReceived | None:
+        deadline = time.monotonic() + timeout_s
+        while True:
+            lease_id = uuid.uuid4().hex
+            picked = self._dequeue_script(
+                keys=[
+                    self._queue_name,
+                    self._classes,
+                    self._vtime,
+                    self._leases,
+                    self._inflight,
+                    self._delayed,
+                    self._deliveries,
+                ],
+                args=[
+                    self._prefix,
+                    self._class_weights,
+                    self._submitter_weights,
+                    lease_ms,
+                    lease_id,
+                ],
+            )
+            if picked:
+                priority, raw = (part.decode("utf-8") for part in picked)
+                if not priority:
+                    return RedisReceived(message=QueueMessage.from_json(raw), lease_id=lease_id)
+                entry = json.loads(raw)
+                queue_wait_seconds.labels(priority=priority).observe(
+                    max(0.0, time.time() - entry["t"])
+                )
+                return RedisReceived(message=QueueMessage.from_dict(entry["m"]), lease_id=lease_id)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            # Enqueues push a wake token; a token consumed by another worker just costs a retry.
+            self._client.blpop(self._wake, timeout=max(0.01, remaining))
+
+
+class RedisInFlight:
+    """Keeps Redis queue leases alive for messages a worker is processing, and reaps dead ones.
+
+    A background thread extends each tracked lease once a third of it is left
+    and, every ``reap_interval_s``, returns leases that expired on any worker
+    (a crashed or reclaimed spot task) to the queue. Messages the queue gives
+    up on are passed to ``on_dead_letter``. ``ack`` releases a lease
+    immediately.
+    """
+
+    def __init__(
+        self,
+        queue: RedisQueue,
+        *,
+        reap_interval_s: float = 15.0,
+        on_dead_letter: Callable[[QueueMessage], None] | None = None,
+    ):
+        self._queue = queue
+        self._on_dead_letter = on_dead_letter
+        self._tick_s = min(reap_interval_s, queue.lease_s / 3)
+        self._reap_interval_s = reap_interval_s
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._leases: dict[str, float] = {}
+        self._reaped_at = 0.0
+        self._thread = threading.Thread(target=self._loop, name="edvmp-redis-inflight", daemon=True)
+        self._thread.start()
+
+    def track(self, lease_id: str) -> None:
+        with self._lock:
+            self._leases[lease_id] = time.monotonic()
+
+    def ack(self, lease_id: str) -> None:
+        with self._lock:
+            self._leases.pop(lease_id, None)
+        self._queue.ack_batch([lease_id])
+
+    def _loop(self) -> None:
+        while not self._stopped.wait(timeout=self._tick_s):
+            try:
+                self._extend_leases()
+                if time.monotonic() - self._reaped_at >= self._reap_interval_s:
+                    self._reaped_at = time.monotonic()
+                    self._reap()
+            except Exception:
+                logger.exception("redis_inflight_maintenance_failed")
+
+    def _extend_leases(self) -> None:
+        renew_after = self._queue.lease_s * 2 / 3
+        now = time.monotonic()
+        with self._lock:
+            due = [i for i, renewed_at in self._leases.items() if now - renewed_at >= renew_after]
+            for i in due:
+                self._leases[i] = now
+        lost = self._queue.extend_batch(due)
+        if lost:
+            # Another worker may already be running these; finishing here yields a duplicate.
+            logger.warning("redis_lease_lost", extra={"count": len(lost)})
+
+    def _reap(self) -> None:
+        reaped = self._queue.requeue_expired()
+        if reaped.requeued:
+            queue_leases_expired_total.inc(reaped.requeued)
+            logger.warning("redis_leases_requeued", extra={"count": reaped.requeued})
+        for message in reaped.dead_lettered:
+            queue_dead_lettered_total.inc()
+            logger.error(
+                "redis_message_dead_lettered",
+                extra={
+                    "message_type": message.message_type,
+                    "job_id": message.payload.get("job_id"),
+                },
+            )
+            if self._on_dead_letter is None:
+                continue
+            try:
+                self._on_dead_letter(message)
+            except Exception:
+                logger.exception(
+                    "redis_dead_letter_failed", extra={"job_id": message.payload.get("job_id")}
+                )
+
+    def close(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+
+def message_priority(message: QueueMessage) -> str:
+    """The payload's scheduling class; missing or unknown values count as ``standard``."""
+    try:
+        return JobPriority(str(message.payload.get("priority"))).value
+    except ValueError:
+        return JobPriority.standard.value
+
+
+def _size_bytes(message: QueueMessage) -> int:
+    try:
+        return max(0, int(message.payload.get("size") or 0))
+    except (TypeError, ValueError):
+        return 0
 
 
 class RedisDlq:
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import gzip
+import json
+import zlib
+from collections.abc import Iterator
+from typing import Any
+
+from edvmp.shared.models import ResultProjection
+
+
+def _int(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _float(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def project_metadata(metadata: dict[str, Any]) -> ResultProjection:
+    """Pull the fields we list and filter on out of raw ffprobe output."""
+    fmt = metadata.get("format") or {}
+    streams: list[dict[str, Any]] = metadata.get("streams") or []
+    video = [s for s in streams if s.get("codec_type") == "video"]
+    audio = [s for s in streams if s.get("codec_type") == "audio"]
+    first_video = video[0] if video else {}
+    return ResultProjection(
+        duration_s=_float(fmt.get("duration")),
+        format_name=fmt.get("format_name"),
+        bit_rate=_int(fmt.get("bit_rate")),
+        video_codec=first_video.get("codec_name"),
+        width=_int(first_video.get("width")),
+        height=_int(first_video.get("height")),
+        audio_codec=(audio[0] if audio else {}).get("codec_name"),
+        stream_count=len(streams),
+        video_streams=len(video),
+        audio_streams=len(audio),
+    )
+
+
+def compress_metadata(metadata: dict[str, Any]) -> bytes:
+    # gzip rather than zstd: it ships with the standard library, and ffprobe JSON compresses ~10x either way.
+    raw = json.dumps(metadata, separators=(",", ":")).encode("utf-8")
+    return gzip.compress(raw, compresslevel=6, mtime=0)
+
+
+def decompress_metadata(blob: bytes) -> dict[str, Any]:
+    data: dict[str, Any] = json.loads(gzip.decompress(blob))
+    return data
+
+
+def iter_metadata_json(blob: bytes, *, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Inflate a compressed payload incrementally, yielding raw JSON bytes without parsing them."""
+    inflater = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+    data = blob
+    while data:
+        chunk = inflater.decompress(data, chunk_size)
+        if chunk:
+            yield chunk
+        data = inflater.unconsumed_tail
+    tail = inflater.flush()
+    if tail:
+        yield tail
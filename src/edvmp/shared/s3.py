@@ -35,3 +35,72 @@ def presign_put_url(s3, bucket: str, key: str, expires_in: int = 900) -> str:
         ExpiresIn=expires_in,
     )
     return cast(str, url)
+
+
+# S3 multipart limits: every part but the last is at least 5 MiB, and an upload has at most 10,000 parts.
+MULTIPART_MIN_PART_BYTES = 5 * 1024 * 1024
+MULTIPART_MAX_PART_BYTES = 5 * 1024 * 1024 * 1024
+MULTIPART_MAX_PARTS = 10_000
+
+
+def plan_multipart(size_bytes: int, part_size_bytes: int) -> tuple[int, int]:
+    """Return ``(part_size, part_count)`` for an object, growing the part size to fit 10,000 parts."""
+    part_size = max(MULTIPART_MIN_PART_BYTES, part_size_bytes, -(-size_bytes // MULTIPART_MAX_PARTS))
+    if part_size > MULTIPART_MAX_PART_BYTES:
+        raise ValueError(f"object of {size_bytes} bytes exceeds the S3 multipart limits")
+    return part_size, max(1, -(-size_bytes // part_size))
+
+
+def create_multipart_upload(s3, bucket: str, key: str, content_type: str | None = None) -> str:
+    params = {"Bucket": bucket, "Key": key}
+    if content_type:
+        params["ContentType"] = content_type
+    res = s3.create_multipart_upload(**params)
+    return cast(str, res["UploadId"])
+
+
+def presign_upload_part_urls(
+    s3, bucket: str, key: str, upload_id: str, part_numbers: list[int], expires_in: int = 3600
+) -> list[str]:
+    # Presigning is local signing; no request is sent per part.
+    return [
+        cast(
+            str,
+            s3.generate_presigned_url(
+                ClientMethod="upload_part",
+                Params={"Bucket": bucket, "Key": key, "UploadId": upload_id, "PartNumber": n},
+                ExpiresIn=expires_in,
+            ),
+        )
+        for n in part_numbers
+    ]
+
+
+def complete_multipart_upload(
+    s3, bucket: str, key: str, upload_id: str, parts: list[tuple[int, str]]
+) -> str:
+    """Stitch the uploaded parts (``(part_number, etag)``) into the final object; returns its ETag."""
+    res = s3.complete_multipart_upload(
+        Bucket=bucket,
+        Key=key,
+        UploadId=upload_id,
+        MultipartUpload={
+            "Parts": [{"PartNumber": n, "ETag": etag} for n, etag in sorted(parts)]
+        },
+    )
+    return cast(str, res.get("ETag", ""))
+
+
+def abort_multipart_upload(s3, bucket: str, key: str, upload_id: str) -> None:
+    s3.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+
+
+def get_object_range(s3, bucket: str, key: str, *, start: int, end: int) -> bytes:
+    """Fetch bytes ``start..end`` (inclusive, as in the HTTP Range header)."""
+    res = s3.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{end}")
+    return cast(bytes, res["Body"].read())
+
+
+def object_size(s3, bucket: str, key: str) -> int:
+    res = s3.head_object(Bucket=bucket, Key=key)
+    return int(res["ContentLength"])
@@ -1,35 +1,171 @@
 from __future__ import annotations
 
+import abc
 import json
+import os
 import sqlite3
-from collections.abc import Iterator
+import threading
+import weakref
+from collections.abc import Iterator, Mapping, Sequence
 from contextlib import contextmanager
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
-from edvmp.shared.models import JobRecord, JobResult, JobStatus
+from edvmp.shared.models import (
+    JobPriority,
+    JobRecord,
+    JobResult,
+    JobStatus,
+    ResultProjection,
+    SearchHit,
+)
+from edvmp.shared.pagination import (
+    InvalidCursor,
+    JobPage,
+    JobQuery,
+    ResultQuery,
+    RowPage,
+    SearchPage,
+    decode_cursor,
+    encode_cursor,
+    iso_utc,
+    json_timestamp,
+)
+from edvmp.shared.results import compress_metadata, decompress_metadata, project_metadata
 
 
 def _utc_now() -> datetime:
     return datetime.now(UTC)
 
 
-class LocalSqliteStore:
-    def __init__(self, db_path: str):
+class JobsPartiallyCreated(RuntimeError):
+    """``create_jobs`` failed after some jobs were stored; ``written`` holds their ids."""
+
+    def __init__(self, message: str, written: list[str]):
+        super().__init__(message)
+        self.written = written
+
+
+class _ThreadConnection:
+    """One thread's connection, held in that thread's ``threading.local`` slot.
+
+    The slot is dropped when its thread exits and the finalizer then closes
+    the connection, so short-lived threads do not leave descriptors and WAL
+    readers open until ``close()``.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.pid = os.getpid()
+        self.tx_depth = 0
+        self.close = weakref.finalize(self, _close_in_owner, conn, self.pid)
+
+
+def _close_in_owner(conn: sqlite3.Connection, pid: int) -> None:
+    # A forked child leaves its parent's connections alone, even on close.
+    if os.getpid() == pid:
+        conn.close()
+
+
+class SqliteDatabase(abc.ABC):
+    """Per-thread SQLite connections shared by the local-mode SQLite components.
+
+    Each thread keeps one open connection, created on first use with the WAL
+    journal and tuning pragmas applied once, so hot paths (API lookups, the
+    orchestrator loop, worker stages) do not pay a reconnect per call.
+    Subclasses create their tables in ``_init_schema``.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        busy_timeout_ms: int = 30_000,
+        cache_size_kib: int = 16 * 1024,
+        mmap_size_bytes: int = 256 * 1024 * 1024,
+    ):
         self._db_path = db_path
+        self._busy_timeout_ms = busy_timeout_ms
+        self._cache_size_kib = cache_size_kib
+        self._mmap_size_bytes = mmap_size_bytes
+        self._local = threading.local()
+        self._open: weakref.WeakSet[_ThreadConnection] = weakref.WeakSet()
+        self._open_lock = threading.Lock()
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         self._init_schema()
 
-    @contextmanager
-    def _conn(self) -> Iterator[sqlite3.Connection]:
-        conn = sqlite3.connect(self._db_path, timeout=30, isolation_level=None)
+    def _connect(self) -> sqlite3.Connection:
+        # Connections never leave their thread; check_same_thread=False only lets close() reap them.
+        conn = sqlite3.connect(
+            self._db_path,
+            timeout=self._busy_timeout_ms / 1000,
+            isolation_level=None,
+            check_same_thread=False,
+        )
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA journal_mode=WAL;")
+        # NORMAL is durable across application crashes in WAL mode; only an OS crash can drop the last commits.
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute(f"PRAGMA busy_timeout={int(self._busy_timeout_ms)};")
+        conn.execute(f"PRAGMA cache_size=-{int(self._cache_size_kib)};")
+        conn.execute(f"PRAGMA mmap_size={int(self._mmap_size_bytes)};")
+        conn.execute("PRAGMA temp_store=MEMORY;")
+        return conn
+
+    def _thread_connection(self) -> _ThreadConnection:
+        state: _ThreadConnection | None = getattr(self._local, "state", None)
+        # A forked child must not reuse its parent's connection.
+        if state is None or state.pid != os.getpid():
+            state = _ThreadConnection(self._connect())
+            self._local.state = state
+            with self._open_lock:
+                self._open.add(state)
+        return state
+
+    @contextmanager
+    def _conn(self) -> Iterator[sqlite3.Connection]:
+        yield self._thread_connection().conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group store calls made on this thread into one SQLite transaction.
+
+        Nested calls become savepoints, so an inner block can fail and roll back
+        on its own without aborting the outer transaction.
+        """
+        state = self._thread_connection()
+        conn, depth = state.conn, state.tx_depth
+        savepoint = f"sp{depth}"
+        conn.execute(f"SAVEPOINT {savepoint};" if depth else "BEGIN IMMEDIATE;")
+        state.tx_depth = depth + 1
         try:
-            yield conn
+            yield
+        except BaseException:
+            conn.execute(f"ROLLBACK TO {savepoint};" if depth else "ROLLBACK;")
+            if depth:
+                conn.execute(f"RELEASE {savepoint};")
+            raise
+        else:
+            conn.execute(f"RELEASE {savepoint};" if depth else "COMMIT;")
         finally:
-            conn.close()
+            state.tx_depth = depth
+
+    def close(self) -> None:
+        with self._open_lock:
+            states = list(self._open)
+            self._open.clear()
+        for state in states:
+            state.close()
+        self._local = threading.local()
+
+    @abc.abstractmethod
+    def _init_schema(self) -> None:
+        """Create this component's tables; runs once from ``__init__``."""
+
+
+class LocalSqliteStore(SqliteDatabase):
+    """SQLite-backed job/result store for local mode."""
 
     def _init_schema(self) -> None:
         with self._conn() as conn:
@@ -47,6 +183,7 @@ class LocalSqliteStore:
                 );
                 """
             )
+            _add_missing_columns(conn, "jobs", _JOB_COLUMNS)
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS results (
@@ -57,6 +194,27 @@ class LocalSqliteStore:
                 );
                 """
             )
+            # Compact results: projection columns plus the gzipped payload. metadata_json is
+            # only populated on rows written before these columns existed.
+            _add_missing_columns(conn, "results", _RESULT_COLUMNS)
+            _backfill_result_projections(conn)
+            # /search walks (completed_at, job_id) newest first. Codec filters are equality
+            # prefixes of that order; resolution and duration get their own range indexes,
+            # which the planner prefers when they are more selective than the codec.
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_results_completed ON results(completed_at, job_id)
+                WHERE completed_at IS NOT NULL;
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_results_video_codec ON results(video_codec, completed_at, job_id);"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_results_audio_codec ON results(audio_codec, completed_at, job_id);"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_results_height ON results(height, width);")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_results_duration ON results(duration_s);")
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS idempotency (
@@ -66,18 +224,68 @@ class LocalSqliteStore:
                 );
                 """
             )
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at);")
+            # New claims start at enqueued=0 until the orchestrator's enqueue pipeline has run;
+            # claims made before the column existed default to 1.
+            _add_missing_columns(conn, "idempotency", _IDEMPOTENCY_COLUMNS)
+            # Keyset pagination walks (created_at, job_id) in descending order; every
+            # filter has an index whose trailing columns match that order.
+            conn.execute("DROP INDEX IF EXISTS idx_jobs_created_at;")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_at, job_id);"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs(status, created_at, job_id);"
+            )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_jobs_error_created ON jobs(error_code, created_at, job_id)
+                WHERE error_code IS NOT NULL;
+                """
+            )
 
-    def create_job_if_missing(self, *, job_id: str, bucket: str, key: str, status: JobStatus) -> None:
+    def create_job_if_missing(
+        self,
+        *,
+        job_id: str,
+        bucket: str,
+        key: str,
+        status: JobStatus,
+        priority: JobPriority = JobPriority.standard,
+        submitter: str | None = None,
+    ) -> None:
         now = _utc_now().isoformat()
         with self._conn() as conn:
             conn.execute(
                 """
-                INSERT INTO jobs(job_id, status, created_at, updated_at, s3_bucket, s3_key)
-                VALUES(?, ?, ?, ?, ?, ?)
+                INSERT INTO jobs(job_id, status, created_at, updated_at, s3_bucket, s3_key, priority, submitter)
+                VALUES(?, ?, ?, ?, ?, ?, ?, ?)
                 ON CONFLICT(job_id) DO NOTHING;
                 """,
-                (job_id, status.value, now, now, bucket, key),
+                (job_id, status.value, now, now, bucket, key, priority.value, submitter),
+            )
+
+    def create_jobs(
+        self,
+        *,
+        bucket: str,
+        jobs: Mapping[str, str],
+        status: JobStatus,
+        priority: JobPriority = JobPriority.standard,
+        submitter: str | None = None,
+    ) -> None:
+        """Insert many jobs (``job_id -> s3 key``) in one transaction; existing job_ids are left as is."""
+        now = _utc_now().isoformat()
+        with self.transaction(), self._conn() as conn:
+            conn.executemany(
+                """
+                INSERT INTO jobs(job_id, status, created_at, updated_at, s3_bucket, s3_key, priority, submitter)
+                VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(job_id) DO NOTHING;
+                """,
+                [
+                    (job_id, status.value, now, now, bucket, key, priority.value, submitter)
+                    for job_id, key in jobs.items()
+                ],
             )
 
     def update_job(
@@ -101,68 +309,297 @@ class LocalSqliteStore:
 
     def get_job(self, job_id: str) -> JobRecord | None:
         with self._conn() as conn:
-            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?;", (job_id,)).fetchone()
+            row = conn.execute(
+                # Interpolates only JobRecord's field names; job_id is bound.
+                f"SELECT {_JOB_SELECT} FROM jobs WHERE job_id = ?;",  # nosec B608
+                (job_id,),
+            ).fetchone()
             if row is None:
                 return None
-            return JobRecord(
-                job_id=row["job_id"],
-                status=JobStatus(row["status"]),
-                created_at=datetime.fromisoformat(row["created_at"]),
-                updated_at=datetime.fromisoformat(row["updated_at"]),
-                s3_bucket=row["s3_bucket"],
-                s3_key=row["s3_key"],
-                error_code=row["error_code"],
-                error_message=row["error_message"],
-            )
+            return _row_to_job(row)
 
     def list_jobs(self, limit: int = 50) -> list[JobRecord]:
+        return self.list_jobs_page(limit=limit).items
+
+    def list_jobs_page(
+        self, *, limit: int = 50, cursor: str | None = None, query: JobQuery | None = None
+    ) -> JobPage:
+        """Newest-first page of jobs, resuming strictly after ``cursor`` (no OFFSET scans)."""
+        rows, next_cursor = self._select_jobs_page(limit, cursor, query or JobQuery())
+        return JobPage(items=[_row_to_job(r) for r in rows], next_cursor=next_cursor)
+
+    def list_job_rows(
+        self, *, limit: int = 50, cursor: str | None = None, query: JobQuery | None = None
+    ) -> RowPage:
+        """``list_jobs_page`` as JSON-ready dicts built straight from the rows, with no JobRecord."""
+        rows, next_cursor = self._select_jobs_page(limit, cursor, query or JobQuery())
+        return RowPage(items=[_row_to_json(r) for r in rows], next_cursor=next_cursor)
+
+    def _select_jobs_page(
+        self, limit: int, cursor: str | None, query: JobQuery
+    ) -> tuple[list[sqlite3.Row], str | None]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        if query.status is not None:
+            clauses.append("status = ?")
+            params.append(query.status.value)
+        if query.error_code is not None:
+            clauses.append("error_code = ?")
+            params.append(query.error_code)
+        if query.created_after is not None:
+            clauses.append("created_at >= ?")
+            params.append(iso_utc(query.created_after))
+        if query.created_before is not None:
+            clauses.append("created_at < ?")
+            params.append(iso_utc(query.created_before))
+        if cursor is not None:
+            position = decode_cursor(cursor)
+            if not isinstance(position.get("c"), str) or not isinstance(position.get("j"), str):
+                raise InvalidCursor("cursor is not valid for this store")
+            clauses.append("(created_at, job_id) < (?, ?)")
+            params.extend((position["c"], position["j"]))
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
         with self._conn() as conn:
             rows = conn.execute(
-                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?;",
-                (limit,),
+                # The WHERE clauses are fixed strings; every filter value is bound.
+                f"SELECT {_JOB_SELECT} FROM jobs {where}"
+                " ORDER BY created_at DESC, job_id DESC LIMIT ?;",  # nosec B608
+                (*params, limit + 1),
             ).fetchall()
-            return [
-                JobRecord(
-                    job_id=r["job_id"],
-                    status=JobStatus(r["status"]),
-                    created_at=datetime.fromisoformat(r["created_at"]),
-                    updated_at=datetime.fromisoformat(r["updated_at"]),
-                    s3_bucket=r["s3_bucket"],
-                    s3_key=r["s3_key"],
-                    error_code=r["error_code"],
-                    error_message=r["error_message"],
-                )
-                for r in rows
-            ]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor({"c": last["created_at"], "j": last["job_id"]})
+        return rows, next_cursor
 
     def store_result(self, *, job_id: str, metadata: dict[str, Any], summary: str) -> None:
+        projection = project_metadata(metadata).model_dump()
+        columns = [
+            "job_id",
+            "metadata_json",
+            "summary",
+            "metadata_gz",
+            "completed_at",
+            *_PROJECTION_COLUMNS,
+        ]
+        values = [job_id, "", summary, compress_metadata(metadata), _utc_now().isoformat()]
+        values.extend(projection[c] for c in _PROJECTION_COLUMNS)
+        updates = ", ".join(f"{c}=excluded.{c}" for c in columns[1:])
         with self._conn() as conn:
             conn.execute(
-                """
-                INSERT INTO results(job_id, metadata_json, summary)
-                VALUES(?, ?, ?)
-                ON CONFLICT(job_id) DO UPDATE SET
-                  metadata_json=excluded.metadata_json,
-                  summary=excluded.summary;
-                """,
-                (job_id, json.dumps(metadata), summary),
+                # Interpolates only column names from module constants; values are bound.
+                f"""
+                INSERT INTO results({", ".join(columns)})
+                VALUES({", ".join("?" for _ in columns)})
+                ON CONFLICT(job_id) DO UPDATE SET {updates};
+                """,  # nosec B608
+                values,
             )
 
-    def get_result(self, job_id: str) -> JobResult | None:
+    def get_result(self, job_id: str, *, full: bool = False) -> JobResult | None:
+        """Summary and projection; the compressed payload is only read and inflated when ``full``."""
+        row = self._select_result(job_id, payload=full)
+        if row is None:
+            return None
+        if row["legacy_json"]:
+            metadata = json.loads(row["legacy_json"])
+            return JobResult(
+                job_id=row["job_id"],
+                summary=row["summary"],
+                projection=project_metadata(metadata),
+                metadata=metadata if full else None,
+            )
+        return JobResult(
+            job_id=row["job_id"],
+            summary=row["summary"],
+            projection=ResultProjection(**{c: row[c] for c in _PROJECTION_COLUMNS}),
+            metadata=decompress_metadata(row["metadata_gz"]) if full else None,
+        )
+
+    def get_result_payload(self, job_id: str) -> tuple[JobResult, bytes] | None:
+        """The result without metadata, plus the still-compressed ffprobe payload for streaming."""
+        row = self._select_result(job_id, payload=True)
+        if row is None:
+            return None
+        if row["legacy_json"]:
+            metadata = json.loads(row["legacy_json"])
+            projection, blob = project_metadata(metadata), compress_metadata(metadata)
+        else:
+            projection = ResultProjection(**{c: row[c] for c in _PROJECTION_COLUMNS})
+            blob = row["metadata_gz"]
+        result = JobResult(job_id=row["job_id"], summary=row["summary"], projection=projection)
+        return result, blob
+
+    def _select_result(self, job_id: str, *, payload: bool) -> sqlite3.Row | None:
+        blob = "metadata_gz" if payload else "NULL AS metadata_gz"
         with self._conn() as conn:
-            row = conn.execute("SELECT * FROM results WHERE job_id = ?;", (job_id,)).fetchone()
-            if row is None:
-                return None
-            return JobResult(job_id=row["job_id"], metadata=json.loads(row["metadata_json"]), summary=row["summary"])
+            row: sqlite3.Row | None = conn.execute(
+                # Interpolates only column names from module constants; job_id is bound.
+                f"""
+                SELECT job_id, summary, {", ".join(_PROJECTION_COLUMNS)}, {blob},
+                       CASE WHEN metadata_gz IS NULL THEN metadata_json END AS legacy_json
+                FROM results WHERE job_id = ?;
+                """,  # nosec B608
+                (job_id,),
+            ).fetchone()
+        return row
+
+    def search_results(
+        self, *, limit: int = 50, cursor: str | None = None, query: ResultQuery | None = None
+    ) -> SearchPage:
+        """Newest-first page of results matching the projection filters, resuming after ``cursor``.
+
+        Results written before projections existed have no ``completed_at`` and
+        are not searchable.
+        """
+        query = query or ResultQuery()
+        clauses = ["completed_at IS NOT NULL"]
+        params: list[Any] = []
+        for column, op, value in query.filters():
+            clauses.append(f"{column} {op} ?")
+            params.append(value)
+        if cursor is not None:
+            position = decode_cursor(cursor)
+            if not isinstance(position.get("c"), str) or not isinstance(position.get("j"), str):
+                raise InvalidCursor("cursor is not valid for this store")
+            clauses.append("(completed_at, job_id) < (?, ?)")
+            params.extend((position["c"], position["j"]))
+
+        with self._conn() as conn:
+            rows = conn.execute(
+                # The WHERE clauses are fixed strings; every filter value is bound.
+                f"""
+                SELECT job_id, completed_at, summary, {", ".join(_PROJECTION_COLUMNS)}
+                FROM results WHERE {" AND ".join(clauses)}
+                ORDER BY completed_at DESC, job_id DESC LIMIT ?;
+                """,  # nosec B608
+                (*params, limit + 1),
+            ).fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor({"c": last["completed_at"], "j": last["job_id"]})
+        items = [
+            SearchHit(
+                job_id=r["job_id"],
+                completed_at=datetime.fromisoformat(r["completed_at"]),
+                summary=r["summary"],
+                projection=ResultProjection(**{c: r[c] for c in _PROJECTION_COLUMNS}),
+            )
+            for r in rows
+        ]
+        return SearchPage(items=items, next_cursor=next_cursor)
 
     def try_claim_idempotency(self, *, idempotency_key: str, job_id: str) -> bool:
         now = _utc_now().isoformat()
         with self._conn() as conn:
             cur = conn.execute(
                 """
-                INSERT OR IGNORE INTO idempotency(idempotency_key, job_id, created_at)
-                VALUES(?, ?, ?);
+                INSERT OR IGNORE INTO idempotency(idempotency_key, job_id, created_at, enqueued)
+                VALUES(?, ?, ?, 0);
                 """,
                 (idempotency_key, job_id, now),
             )
             return cur.rowcount == 1
+
+    def pending_idempotency_claim(self, idempotency_key: str) -> str | None:
+        """The job id of a claim whose job message was never confirmed enqueued, if any."""
+        with self._conn() as conn:
+            row = conn.execute(
+                "SELECT job_id FROM idempotency WHERE idempotency_key = ? AND enqueued = 0;",
+                (idempotency_key,),
+            ).fetchone()
+        return str(row["job_id"]) if row else None
+
+    def mark_idempotency_enqueued(self, idempotency_keys: Sequence[str]) -> None:
+        if not idempotency_keys:
+            return
+        with self._conn() as conn:
+            conn.executemany(
+                "UPDATE idempotency SET enqueued = 1 WHERE idempotency_key = ?;",
+                [(k,) for k in idempotency_keys],
+            )
+
+
+_JOB_COLUMNS = {
+    "priority": f"TEXT NOT NULL DEFAULT '{JobPriority.standard.value}'",
+    "submitter": "TEXT",
+}
+# Only the JobRecord fields are read, so columns added for internal use never reach API rows.
+_JOB_SELECT = ", ".join(JobRecord.model_fields)
+_IDEMPOTENCY_COLUMNS = {"enqueued": "INTEGER NOT NULL DEFAULT 1"}
+_PROJECTION_COLUMNS = tuple(ResultProjection.model_fields)
+_RESULT_COLUMNS = {
+    "metadata_gz": "BLOB",
+    "completed_at": "TEXT",
+    "duration_s": "REAL",
+    "format_name": "TEXT",
+    "bit_rate": "INTEGER",
+    "video_codec": "TEXT",
+    "width": "INTEGER",
+    "height": "INTEGER",
+    "audio_codec": "TEXT",
+    "stream_count": "INTEGER NOT NULL DEFAULT 0",
+    "video_streams": "INTEGER NOT NULL DEFAULT 0",
+    "audio_streams": "INTEGER NOT NULL DEFAULT 0",
+}
+
+
+def _add_missing_columns(conn: sqlite3.Connection, table: str, columns: Mapping[str, str]) -> None:
+    """Add columns introduced after ``table`` was first created; SQLite has no ADD COLUMN IF NOT EXISTS."""
+    existing = {r["name"] for r in conn.execute(f"PRAGMA table_info({table});")}
+    for column, decl in columns.items():
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl};")
+
+
+def _backfill_result_projections(conn: sqlite3.Connection) -> None:
+    """Fill the search columns of results stored before they existed, so /search finds them.
+
+    Such rows still hold their payload in ``metadata_json`` and have no
+    ``completed_at``; the job's ``updated_at`` stands in for it. Later startups
+    find nothing to do.
+    """
+    rows = conn.execute(
+        """
+        SELECT r.job_id, r.metadata_json, COALESCE(j.updated_at, ?) AS completed_at
+        FROM results r LEFT JOIN jobs j ON j.job_id = r.job_id
+        WHERE r.completed_at IS NULL;
+        """,
+        (_utc_now().isoformat(),),
+    ).fetchall()
+    updates = []
+    for row in rows:
+        projection = project_metadata(json.loads(row["metadata_json"])).model_dump()
+        updates.append(
+            (row["completed_at"], *(projection[c] for c in _PROJECTION_COLUMNS), row["job_id"])
+        )
+    assignments = ", ".join(f"{c}=?" for c in ("completed_at", *_PROJECTION_COLUMNS))
+    # Interpolates only column names from module constants; values are bound.
+    sql = f"UPDATE results SET {assignments} WHERE job_id=?;"  # nosec B608
+    conn.executemany(sql, updates)
+
+
+def _row_to_json(row: sqlite3.Row) -> dict[str, Any]:
+    data = {name: row[name] for name in JobRecord.model_fields}
+    data["created_at"] = json_timestamp(data["created_at"])
+    data["updated_at"] = json_timestamp(data["updated_at"])
+    return data
+
+
+def _row_to_job(row: sqlite3.Row) -> JobRecord:
+    return JobRecord(
+        job_id=row["job_id"],
+        status=JobStatus(row["status"]),
+        created_at=datetime.fromisoformat(row["created_at"]),
+        updated_at=datetime.fromisoformat(row["updated_at"]),
+        s3_bucket=row["s3_bucket"],
+        s3_key=row["s3_key"],
+        error_code=row["error_code"],
+        error_message=row["error_message"],
+        priority=JobPriority(row["priority"]),
+        submitter=row["submitter"],
+    )
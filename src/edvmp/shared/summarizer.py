@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Protocol
+
+from botocore.exceptions import ClientError
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+from edvmp.shared.bedrock import BedrockClient
+from edvmp.shared.cache import TtlLruCache
+from edvmp.shared.metrics import bedrock_invocations_total, summary_cache_requests_total
+
+logger = logging.getLogger("edvmp.summarizer")
+
+_THROTTLE_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+}
+
+
+class Summarizer(Protocol):
+    def summarize(self, *, metadata: dict[str, Any]) -> str: ...
+
+
+def _is_throttle(error: BaseException) -> bool:
+    return (
+        isinstance(error, ClientError)
+        and error.response.get("Error", {}).get("Code") in _THROTTLE_CODES
+    )
+
+
+class TokenBucket:
+    """Blocking token bucket: ``rate_per_s`` sustained calls with bursts up to ``burst``."""
+
+    def __init__(self, *, rate_per_s: float, burst: int):
+        self._rate = rate_per_s
+        self._capacity = max(1.0, float(burst))
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self._rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_s = (1 - self._tokens) / self._rate
+            time.sleep(wait_s)
+
+
+def metadata_fingerprint(metadata: dict[str, Any], *, duration_bucket_s: float) -> tuple[Any, ...]:
+    """Normalize ffprobe output to the fields a summary depends on.
+
+    Encodes with the same codecs, resolution and a duration within the same
+    bucket share a fingerprint and therefore a summary.
+    """
+    streams: list[dict[str, Any]] = metadata.get("streams") or []
+    video = next(
+        (s for s in streams if s.get("codec_type") == "video"), streams[0] if streams else {}
+    )
+    audio: dict[str, Any] = next((s for s in streams if s.get("codec_type") == "audio"), {})
+    raw_duration = (metadata.get("format") or {}).get("duration")
+    bucket: int | None = None
+    if raw_duration is not None:
+        try:
+            duration = float(raw_duration)
+            bucket = int(duration // duration_bucket_s) if duration_bucket_s > 0 else int(duration)
+        except ValueError:
+            pass
+    return (
+        video.get("codec_name"),
+        video.get("width"),
+        video.get("height"),
+        audio.get("codec_name"),
+        bucket,
+    )
+
+
+class SummarizationService:
+    """Bedrock summaries behind a fingerprint cache, a concurrency cap, a rate limit and throttle retries.
+
+    Concurrent requests for the same fingerprint share one model call. Bedrock
+    has no synchronous batch API for ``invoke_model``, so coalescing identical
+    in-flight requests stands in for micro-batching. Mock mode bypasses all of
+    this and keeps its exact, per-input summaries.
+    """
+
+    def __init__(
+        self,
+        client: BedrockClient,
+        *,
+        max_concurrency: int,
+        rate_per_s: float,
+        burst: int,
+        max_attempts: int,
+        cache_ttl_s: float,
+        cache_max_entries: int,
+        duration_bucket_s: float,
+    ):
+        self._client = client
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._bucket = TokenBucket(rate_per_s=rate_per_s, burst=burst)
+        self._retrying = Retrying(
+            retry=retry_if_exception(_is_throttle),
+            wait=wait_random_exponential(multiplier=0.5, max=20),
+            stop=stop_after_attempt(max(1, max_attempts)),
+            reraise=True,
+        )
+        self._cache: TtlLruCache[tuple[Any, ...], str] = TtlLruCache(
+            max_entries=cache_max_entries, ttl_s=cache_ttl_s
+        )
+        self._duration_bucket_s = duration_bucket_s
+        self._lock = threading.Lock()
+        self._in_flight: dict[tuple[Any, ...], Future[str]] = {}
+
+    def summarize(self, *, metadata: dict[str, Any]) -> str:
+        if self._client.mode != "aws":
+            return self._client.summarize(metadata=metadata)
+
+        key = metadata_fingerprint(metadata, duration_bucket_s=self._duration_bucket_s)
+        cached = self._cache.get(key)
+        if cached is not None:
+            summary_cache_requests_total.labels(result="hit").inc()
+            return cached
+
+        with self._lock:
+            leader = key not in self._in_flight
+            future = self._in_flight.setdefault(key, Future())
+        if not leader:
+            summary_cache_requests_total.labels(result="coalesced").inc()
+            return future.result()
+
+        summary_cache_requests_total.labels(result="miss").inc()
+        try:
+            summary = self._invoke(metadata)
+            self._cache.put(key, summary)
+            future.set_result(summary)
+            return summary
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _invoke(self, metadata: dict[str, Any]) -> str:
+        for attempt in self._retrying:
+            with attempt:
+                self._bucket.acquire()
+                with self._slots:
+                    try:
+                        summary = self._client.summarize(metadata=metadata)
+                    except Exception as e:
+                        outcome = "throttled" if _is_throttle(e) else "error"
+                        bedrock_invocations_total.labels(outcome=outcome).inc()
+                        if outcome == "throttled":
+                            logger.warning(
+                                "bedrock_throttled",
+                                extra={"attempt": attempt.retry_state.attempt_number},
+                            )
+                        raise
+                bedrock_invocations_total.labels(outcome="success").inc()
+                return summary
+        raise RuntimeError("unreachable: Retrying either returns or reraises")
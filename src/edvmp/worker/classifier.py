@@ -3,7 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
-from edvmp.worker.ffprobe import MediaProbeError
+from edvmp.shared.queue import RedeliveryLimitExceeded
+from edvmp.worker.ffprobe import MediaProbeError, ProbeTimeout
 
 
 @dataclass(frozen=True)
@@ -14,6 +15,17 @@ class Classification:
 
 def classify_failure(error: Exception, context: dict[str, Any] | None = None) -> Classification:
     msg = str(error).lower()
+    if isinstance(error, RedeliveryLimitExceeded):
+        return Classification(
+            category="poison_message",
+            recommendation="Every worker that took this job died or stalled (OOM, crash, hang); inspect the input and worker logs before replaying it.",
+        )
+    # Checked first: the message names ffprobe, which would otherwise read as bad media.
+    if isinstance(error, ProbeTimeout):
+        return Classification(
+            category="timeout",
+            recommendation="A probe hung or ran past its CPU budget; check WORKER_PROBE_TIMEOUT_S/WORKER_PROBE_MAX_CPU_S and inspect the file for pathological structure.",
+        )
     if isinstance(error, MediaProbeError) or "ffprobe" in msg or "codec" in msg or "moov" in msg:
         return Classification(
             category="bad_media",
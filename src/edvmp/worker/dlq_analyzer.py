@@ -48,15 +48,8 @@ def main() -> None:
 
     dlq = get_dlq(settings)
     messages: list[dict[str, Any]]
-    if isinstance(dlq, RedisDlq):
+    if isinstance(dlq, RedisDlq | SqsDlq):
         messages = dlq.drain(max_items=1000)
-    elif isinstance(dlq, SqsDlq):
-        received = dlq.receive(wait_time_s=2, max_messages=10)
-        messages = []
-        for rcv in received:
-            raw = rcv.message.payload
-            messages.append(raw)
-            dlq.delete(rcv.receipt_handle)
     else:
         raise RuntimeError("Unsupported DLQ backend")
     report = analyze_messages(messages)
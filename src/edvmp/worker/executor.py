@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import functools
+import logging
+import multiprocessing
+import signal
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from edvmp.shared.metrics import probe_duration, probe_kills_total
+from edvmp.worker.ffprobe import ProbeTimeout, ffprobe
+from edvmp.worker.native_probe import probe_native
+
+logger = logging.getLogger("edvmp.worker.executor")
+
+
+@contextmanager
+def _wall_clock(timeout_s: float | None) -> Iterator[None]:
+    """Raise ``ProbeTimeout`` in this (main) thread once ``timeout_s`` passes."""
+    if not timeout_s:
+        yield
+        return
+
+    def expire(_signum: int, _frame: Any) -> None:
+        raise ProbeTimeout(f"native probe timed out after {timeout_s}s", reason="timeout")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, timeout_s)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _probe_in_child(
+    path: Path, *, native: bool, timeout_s: float | None, **limits: Any
+) -> tuple[dict[str, Any], str]:
+    """Probe ``path`` inside a pool process; returns the metadata and the engine that produced it.
+
+    The native parser runs under the probe's wall-clock budget and ffprobe gets
+    what is left of it, so neither can tie up a job thread or outlast the budget.
+    """
+    start = time.monotonic()
+    if native:
+        try:
+            with _wall_clock(timeout_s):
+                return probe_native(path), "native"
+        except Exception as e:
+            # Unsupported or odd files are ffprobe's call, never a failed job.
+            logger.debug("native_probe_fallback", extra={"path": str(path), "reason": str(e)})
+    remaining = max(0.001, timeout_s - (time.monotonic() - start)) if timeout_s else None
+    return ffprobe(path, timeout_s=remaining, **limits), "ffprobe"
+
+
+class ProbePool:
+    """Bounded process pool for probes so header and JSON parsing stays off the job threads' GIL.
+
+    With ``native`` set, MP4/MOV and Matroska/WebM headers are parsed in the
+    pool process first and only other files go to ffprobe. Every probe runs
+    under the given wall-clock budget, and each ffprobe call also under the CPU,
+    memory and output limits (see ``ffprobe``); latency and kills are recorded
+    here, in the worker process that exports metrics.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        *,
+        timeout_s: float | None = None,
+        max_cpu_s: int | None = None,
+        max_memory_bytes: int | None = None,
+        max_output_bytes: int | None = None,
+        native: bool = False,
+    ):
+        self._pool = ProcessPoolExecutor(
+            max_workers=max(1, max_workers),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._probe = functools.partial(
+            _probe_in_child,
+            native=native,
+            timeout_s=timeout_s,
+            max_cpu_s=max_cpu_s,
+            max_memory_bytes=max_memory_bytes,
+            max_output_bytes=max_output_bytes,
+        )
+
+    def probe(self, path: Path) -> dict[str, Any]:
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            metadata, engine = self._pool.submit(self._probe, path).result()
+            outcome = "native" if engine == "native" else "ok"
+            return metadata
+        except ProbeTimeout as e:
+            outcome = e.reason
+            probe_kills_total.labels(reason=e.reason).inc()
+            raise
+        finally:
+            probe_duration.labels(outcome=outcome).observe(time.perf_counter() - start)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+
+class JobExecutor:
+    """Runs jobs on a thread pool with at most ``concurrency + backlog`` jobs in flight.
+
+    Callers poll their queue only when a slot is free, so messages are never
+    received (and their visibility clock started) before there is capacity to run them.
+    ``submit`` blocks while the executor is full, which is what gives pipeline stages backpressure.
+    """
+
+    def __init__(
+        self, concurrency: int, *, backlog: int = 0, thread_name_prefix: str = "edvmp-job"
+    ):
+        self._concurrency = max(1, concurrency)
+        self._capacity = self._concurrency + max(0, backlog)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self._concurrency, thread_name_prefix=thread_name_prefix
+        )
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._running = 0
+
+    @property
+    def in_flight(self) -> int:
+        with self._cond:
+            return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """Jobs accepted but still waiting for a thread."""
+        with self._cond:
+            return self._in_flight - self._running
+
+    def wait_for_capacity(self, timeout: float | None = None) -> int:
+        """Block until at least one slot is free; returns the number of free slots (0 on timeout)."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._in_flight < self._capacity, timeout=timeout)
+            return self._capacity - self._in_flight
+
+    def submit(self, fn: Callable[[], None]) -> Future[None]:
+        with self._cond:
+            self._cond.wait_for(lambda: self._in_flight < self._capacity)
+            self._in_flight += 1
+        future = self._pool.submit(self._run, fn)
+        future.add_done_callback(self._release)
+        return future
+
+    def _run(self, fn: Callable[[], None]) -> None:
+        with self._cond:
+            self._running += 1
+        try:
+            fn()
+        finally:
+            with self._cond:
+                self._running -= 1
+
+    def _release(self, _: Future[None]) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def drain(self) -> None:
+        """Wait for every in-flight job to finish, then stop the pool."""
+        self._pool.shutdown(wait=True)
@@ -1,16 +1,50 @@
 from __future__ import annotations
 
+import contextlib
 import json
+import os
+import resource
+import signal
 import subprocess
+import tempfile
+import threading
 from pathlib import Path
 from typing import Any, cast
 
+_READ_CHUNK = 64 * 1024
+
 
 class MediaProbeError(RuntimeError):
     pass
 
 
-def ffprobe(path: Path) -> dict[str, Any]:
+class ProbeTimeout(TimeoutError):
+    """ffprobe was killed for running past its wall-clock or CPU budget."""
+
+    def __init__(self, message: str, reason: str):
+        super().__init__(message)
+        self.reason = reason
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Raised inside ProbePool children; keep ``reason`` when pickled back to the parent.
+        return (ProbeTimeout, (str(self), self.reason))
+
+
+def ffprobe(
+    path: Path,
+    *,
+    timeout_s: float | None = None,
+    max_memory_bytes: int | None = None,
+    max_cpu_s: int | None = None,
+    max_output_bytes: int | None = None,
+) -> dict[str, Any]:
+    """Run ffprobe on ``path`` and return its JSON.
+
+    The child runs in its own session under ``RLIMIT_AS``/``RLIMIT_CPU`` and is
+    killed, with anything it spawned, once ``timeout_s`` passes or its output
+    exceeds ``max_output_bytes``. Output is read as bytes in chunks and parsed
+    once, never decoded to text first.
+    """
     cmd = [
         "ffprobe",
         "-v",
@@ -21,10 +55,75 @@ def ffprobe(path: Path) -> dict[str, Any]:
         "-show_streams",
         str(path),
     ]
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    if proc.returncode != 0:
-        raise MediaProbeError(proc.stderr.strip() or "ffprobe_failed")
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            start_new_session=True,
+            # Limits apply to the child only; ProbePool workers have no other threads yet.
+            preexec_fn=_limits(max_memory_bytes, max_cpu_s),
+        )
+        timed_out = threading.Event()
+        timer = threading.Timer(timeout_s or 0, _kill, args=(proc, timed_out))
+        if timeout_s:
+            timer.start()
+        try:
+            out, overflow = _read_capped(proc, max_output_bytes)
+            if overflow:
+                _kill(proc)
+            returncode = proc.wait()
+        finally:
+            timer.cancel()
+        stderr.seek(0)
+        err = stderr.read().decode("utf-8", errors="replace").strip()
+
+    if timed_out.is_set():
+        raise ProbeTimeout(f"ffprobe timed out after {timeout_s}s", reason="timeout")
+    # A child that ignores SIGXCPU gets SIGKILL at the hard limit; our own kills
+    # (wall clock, output cap) are ruled out above and below.
+    cpu_killed = returncode == -signal.SIGKILL and bool(max_cpu_s) and not overflow
+    if returncode == -signal.SIGXCPU or cpu_killed:
+        raise ProbeTimeout(f"ffprobe exceeded its {max_cpu_s}s CPU limit", reason="cpu_limit")
+    if overflow:
+        raise MediaProbeError(f"ffprobe output exceeded {max_output_bytes} bytes")
+    if returncode != 0:
+        raise MediaProbeError(err or "ffprobe_failed")
     try:
-        return cast(dict[str, Any], json.loads(proc.stdout))
+        return cast(dict[str, Any], json.loads(out))
     except json.JSONDecodeError as e:
         raise MediaProbeError("ffprobe_invalid_json") from e
+
+
+def _read_capped(proc: subprocess.Popen[bytes], limit: int | None) -> tuple[bytes, bool]:
+    """Read stdout to EOF; returns (bytes read, whether ``limit`` was exceeded)."""
+    if proc.stdout is None:
+        return b"", False
+    buf = bytearray()
+    with proc.stdout:
+        while chunk := proc.stdout.read(_READ_CHUNK):
+            buf += chunk
+            if limit is not None and len(buf) > limit:
+                return bytes(buf), True
+    return bytes(buf), False
+
+
+def _kill(proc: subprocess.Popen[bytes], flag: threading.Event | None = None) -> None:
+    if flag is not None:
+        flag.set()
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(proc.pid, signal.SIGKILL)
+
+
+def _limits(max_memory_bytes: int | None, max_cpu_s: int | None) -> Any:
+    if not max_memory_bytes and not max_cpu_s:
+        return None
+
+    def apply() -> None:
+        if max_memory_bytes:
+            resource.setrlimit(resource.RLIMIT_AS, (max_memory_bytes, max_memory_bytes))
+        if max_cpu_s:
+            # SIGXCPU at the soft limit, SIGKILL one second later if it is ignored.
+            resource.setrlimit(resource.RLIMIT_CPU, (max_cpu_s, max_cpu_s + 1))
+
+    return apply
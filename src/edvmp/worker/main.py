@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import functools
 import json
 import logging
 import os
+import shutil
+import signal
 import tempfile
+import threading
 import time
 from collections.abc import Callable
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -13,18 +18,30 @@ import httpx
 from prometheus_client import start_http_server
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from edvmp.shared.aws_sqs_queue import SqsDlq, SqsQueue
-from edvmp.shared.backends import get_dlq, get_queue, get_store
+from edvmp.shared.aws_sqs_queue import SqsDlq, SqsInFlight, SqsQueue
+from edvmp.shared.backends import get_content_cache, get_dlq, get_queue, get_store
 from edvmp.shared.bedrock import BedrockClient
 from edvmp.shared.config import Settings
+from edvmp.shared.content_cache import CachedAnalysis, ContentCache, content_key
 from edvmp.shared.eventbridge import put_event
 from edvmp.shared.logging import configure_logging
-from edvmp.shared.metrics import worker_job_duration, worker_jobs_total
+from edvmp.shared.metrics import worker_job_duration, worker_jobs_total, worker_retries_total
 from edvmp.shared.models import JobStatus
-from edvmp.shared.queue import QueueMessage, RedisDlq, RedisQueue
-from edvmp.shared.s3 import ensure_bucket_exists, s3_client
+from edvmp.shared.queue import (
+    QueueMessage,
+    RedeliveryLimitExceeded,
+    RedisDlq,
+    RedisInFlight,
+    RedisQueue,
+)
+from edvmp.shared.s3 import ensure_bucket_exists, object_size, s3_client
+from edvmp.shared.summarizer import SummarizationService, Summarizer
 from edvmp.worker.classifier import classify_failure
-from edvmp.worker.ffprobe import MediaProbeError, ffprobe
+from edvmp.worker.executor import ProbePool
+from edvmp.worker.ffprobe import MediaProbeError
+from edvmp.worker.pipeline import StagedPipeline, StageSpec
+from edvmp.worker.probe_window import ProbeWindowUnavailable, fetch_probe_window
+from edvmp.worker.retry import RetryPolicies, retry_policies
 
 logger = logging.getLogger("edvmp.worker")
 
@@ -39,6 +56,294 @@ def _post_job_completed(eventbus_url: str, payload: dict[str, Any]) -> None:
         client.post(f"{eventbus_url}/events/job-completed", json=payload).raise_for_status()
 
 
+@dataclass(frozen=True)
+class WorkerContext:
+    settings: Settings
+    store: Any
+    dlq: RedisDlq | SqsDlq
+    s3: Any
+    bedrock: Summarizer
+    probe: Callable[[Path], dict[str, Any]]
+    eventbus_url: str
+    content_cache: ContentCache | None = None
+    # Puts a message back on the jobs queue after a delay; without it retries stay in-process.
+    requeue: Callable[[QueueMessage, float], None] | None = None
+    retry_policies: RetryPolicies | None = None
+
+
+@dataclass
+class JobState:
+    """A job travelling through the worker pipeline; each stage fills in the next field."""
+
+    message: QueueMessage
+    ack: Callable[[], None]
+    job_id: str
+    bucket: str
+    key: str
+    size: int | None = None
+    content_key: str | None = None
+    cache_hit: bool = False
+    started_at: float = field(default_factory=time.time)
+    attempt: int = 0
+    workdir: Path | None = None
+    partial_input: bool = False
+    metadata: dict[str, Any] | None = None
+    summary: str | None = None
+
+    @classmethod
+    def from_message(cls, msg: QueueMessage, ack: Callable[[], None]) -> JobState:
+        size = int(msg.payload["size"]) if msg.payload.get("size") is not None else None
+        return cls(
+            message=msg,
+            ack=ack,
+            job_id=str(msg.payload["job_id"]),
+            bucket=str(msg.payload["bucket"]),
+            key=str(msg.payload["key"]),
+            size=size,
+            content_key=content_key(etag=msg.payload.get("etag"), size=size),
+            attempt=int(msg.payload.get("attempt") or 0),
+        )
+
+    def cleanup(self) -> None:
+        if self.workdir is not None:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+            self.workdir = None
+
+
+def _stage_download(ctx: WorkerContext, job: JobState) -> None:
+    if job.attempt == 0:
+        ctx.store.update_job(job_id=job.job_id, status=JobStatus.processing)
+    if ctx.content_cache is not None and job.content_key is not None:
+        cached = ctx.content_cache.get(job.content_key)
+        if cached is not None:
+            # Same bytes were analysed before: skip download, probe and summary.
+            job.metadata, job.summary, job.cache_hit = cached.metadata, cached.summary, True
+            logger.info("content_cache_hit", extra={"job_id": job.job_id, "content_key": job.content_key})
+            return
+    job.workdir = Path(tempfile.mkdtemp(prefix="edvmp-"))
+    dest = job.workdir / "input"
+    settings = ctx.settings
+    if settings.worker_probe_mode == "ranged":
+        size = job.size if job.size is not None else object_size(ctx.s3, job.bucket, job.key)
+        if size > settings.worker_probe_head_bytes + settings.worker_probe_tail_bytes:
+            try:
+                fetch_probe_window(
+                    ctx.s3,
+                    bucket=job.bucket,
+                    key=job.key,
+                    size=size,
+                    dest=dest,
+                    head_bytes=settings.worker_probe_head_bytes,
+                    tail_bytes=settings.worker_probe_tail_bytes,
+                    max_moov_bytes=settings.worker_probe_max_moov_bytes,
+                )
+                job.partial_input = True
+                return
+            except ProbeWindowUnavailable as e:
+                logger.info("probe_window_unavailable", extra={"job_id": job.job_id, "reason": str(e)})
+    _download(ctx.s3, bucket=job.bucket, key=job.key, dest=dest)
+    job.partial_input = False
+
+
+def _stage_probe(ctx: WorkerContext, job: JobState) -> None:
+    if job.cache_hit:
+        return
+    if job.workdir is None:
+        raise RuntimeError("probe stage reached without a downloaded input")
+    path = job.workdir / "input"
+    try:
+        try:
+            job.metadata = ctx.probe(path)
+        except MediaProbeError as e:
+            if not job.partial_input:
+                raise
+            logger.info("probe_window_fallback", extra={"job_id": job.job_id, "error": str(e)})
+            _download(ctx.s3, bucket=job.bucket, key=job.key, dest=path)
+            job.partial_input = False
+            job.metadata = ctx.probe(path)
+    finally:
+        # The media file is only needed for probing; free the disk before the slow stages.
+        job.cleanup()
+
+
+def _stage_summarize(ctx: WorkerContext, job: JobState) -> None:
+    if job.cache_hit:
+        return
+    if job.metadata is None:
+        raise RuntimeError("summarize stage reached without metadata")
+    job.summary = ctx.bedrock.summarize(metadata=job.metadata)
+
+
+def _stage_persist(ctx: WorkerContext, job: JobState) -> None:
+    if job.metadata is None or job.summary is None:
+        raise RuntimeError("persist stage reached without metadata and summary")
+    ctx.store.store_result(job_id=job.job_id, metadata=job.metadata, summary=job.summary)
+    ctx.store.update_job(job_id=job.job_id, status=JobStatus.succeeded)
+    if ctx.content_cache is not None and job.content_key is not None and not job.cache_hit:
+        try:
+            ctx.content_cache.put(job.content_key, CachedAnalysis(metadata=job.metadata, summary=job.summary))
+        except Exception:
+            logger.exception("content_cache_put_failed", extra={"job_id": job.job_id})
+
+
+def _on_job_succeeded(ctx: WorkerContext, job: JobState) -> None:
+    settings = ctx.settings
+    worker_jobs_total.labels(status="succeeded").inc()
+    duration = time.time() - job.started_at
+    worker_job_duration.observe(duration)
+
+    if ctx.eventbus_url:
+        _post_job_completed(
+            ctx.eventbus_url,
+            {
+                "event_type": "JobCompleted",
+                "job_id": job.job_id,
+                "status": "SUCCEEDED",
+            },
+        )
+    if not ctx.eventbus_url and settings.app_env == "aws":
+        put_event(
+            region_name=settings.s3_region,
+            bus_name=settings.eventbridge_bus_name,
+            source="edvmp.worker",
+            detail_type="JobCompleted",
+            detail=json.dumps({"job_id": job.job_id, "status": "SUCCEEDED"}),
+        )
+    logger.info("job_succeeded", extra={"job_id": job.job_id, "duration_s": duration})
+    job.ack()
+
+
+def _on_job_error(ctx: WorkerContext, job: JobState, error: Exception) -> float | None:
+    job.cleanup()
+    settings = ctx.settings
+    category = classify_failure(error).category
+    policy = (ctx.retry_policies or retry_policies(settings)).for_category(category)
+    job.attempt += 1
+    retrying = job.attempt < policy.max_attempts
+    delay_s = policy.delay_s(job.attempt) if retrying else 0.0
+    logger.warning(
+        "job_attempt_failed",
+        extra={
+            "job_id": job.job_id,
+            "attempt": job.attempt,
+            "category": category,
+            "delay_s": delay_s,
+            "error": str(error),
+        },
+    )
+    if retrying:
+        worker_retries_total.labels(category=category).inc()
+        if ctx.requeue is None:
+            return delay_s
+        # The retry travels through the queue with its attempt count, so the backoff holds
+        # no pipeline capacity and survives this worker going away.
+        retry = QueueMessage(
+            job.message.message_type, {**job.message.payload, "attempt": job.attempt}
+        )
+        try:
+            ctx.requeue(retry, delay_s)
+        except Exception:
+            logger.exception("job_requeue_failed", extra={"job_id": job.job_id})
+            return delay_s
+        job.ack()
+        return None
+
+    _handle_failure(settings, ctx.store, ctx.dlq, ctx.eventbus_url, job.job_id, job.bucket, job.key, error)
+    job.ack()
+    return None
+
+
+def build_pipeline(ctx: WorkerContext) -> StagedPipeline[JobState]:
+    settings = ctx.settings
+    default_workers = settings.worker_concurrency
+    queue_size = settings.worker_stage_queue_size
+    stages: list[StageSpec[JobState]] = [
+        StageSpec(
+            "download",
+            functools.partial(_stage_download, ctx),
+            settings.worker_download_workers or default_workers,
+            queue_size,
+        ),
+        StageSpec(
+            "probe",
+            functools.partial(_stage_probe, ctx),
+            settings.worker_probe_workers or default_workers,
+            queue_size,
+        ),
+        StageSpec(
+            "summarize",
+            functools.partial(_stage_summarize, ctx),
+            settings.worker_summarize_workers or default_workers,
+            queue_size,
+        ),
+        StageSpec(
+            "persist",
+            functools.partial(_stage_persist, ctx),
+            settings.worker_persist_workers or default_workers,
+            queue_size,
+        ),
+    ]
+    return StagedPipeline(
+        stages,
+        on_complete=functools.partial(_on_job_succeeded, ctx),
+        on_error=functools.partial(_on_job_error, ctx),
+    )
+
+
+def _install_shutdown_handler(stop: threading.Event) -> None:
+    def _handle(signum: int, _frame: Any) -> None:
+        logger.info("worker_draining", extra={"signal": signal.Signals(signum).name})
+        stop.set()
+
+    signal.signal(signal.SIGTERM, _handle)
+    signal.signal(signal.SIGINT, _handle)
+
+
+def _is_job(msg: QueueMessage) -> bool:
+    if msg.message_type == "ProcessVideo":
+        return True
+    logger.warning("unknown_message_type", extra={"message_type": msg.message_type})
+    return False
+
+
+def _on_dead_letter(ctx: WorkerContext, msg: QueueMessage) -> None:
+    """Fail a message's job once the Redis queue stops redelivering it."""
+    error = RedeliveryLimitExceeded(
+        f"Lease expired {ctx.settings.redis_queue_max_deliveries} times without an ack"
+    )
+    if msg.message_type != "ProcessVideo":
+        if isinstance(ctx.dlq, RedisDlq):
+            payload = {**msg.to_dict(), "error_code": "poison_message", "error_message": str(error)}
+            ctx.dlq.push(payload)
+        return
+    job = JobState.from_message(msg, ack=lambda: None)
+    _handle_failure(ctx.settings, ctx.store, ctx.dlq, ctx.eventbus_url, job.job_id, job.bucket, job.key, error)
+
+
+def _poll(
+    queue: RedisQueue | SqsQueue, *, capacity: int, inflight: RedisInFlight | SqsInFlight
+) -> list[tuple[QueueMessage, Callable[[], None]]]:
+    if isinstance(queue, RedisQueue) and isinstance(inflight, RedisInFlight):
+        received = queue.receive(timeout_s=5)
+        # Untracked, an unknown message's lease runs out and the reaper dead-letters it
+        # once it has been delivered REDIS_QUEUE_MAX_DELIVERIES times.
+        if received is None or not _is_job(received.message):
+            return []
+        inflight.track(received.lease_id)
+        return [(received.message, functools.partial(inflight.ack, received.lease_id))]
+    if isinstance(queue, SqsQueue) and isinstance(inflight, SqsInFlight):
+        out: list[tuple[QueueMessage, Callable[[], None]]] = []
+        for rcv in queue.receive(wait_time_s=10, max_messages=capacity):
+            # Left untracked, an unknown message reappears after the visibility timeout
+            # and reaches the DLQ through the queue's maxReceiveCount redrive.
+            if not _is_job(rcv.message):
+                continue
+            inflight.track(rcv.receipt_handle)
+            out.append((rcv.message, functools.partial(inflight.ack, rcv.receipt_handle)))
+        return out
+    raise RuntimeError("Unsupported queue backend")
+
+
 def main() -> None:
     settings = Settings()
     configure_logging(settings.log_level)
@@ -58,14 +363,61 @@ def main() -> None:
     )
     ensure_bucket_exists(s3, settings.s3_bucket)
 
-    bedrock = BedrockClient(
-        mode=settings.bedrock_mode,
-        model_id=settings.bedrock_model_id,
-        region_name=settings.s3_region,
+    bedrock = SummarizationService(
+        BedrockClient(
+            mode=settings.bedrock_mode,
+            model_id=settings.bedrock_model_id,
+            region_name=settings.s3_region,
+        ),
+        max_concurrency=settings.bedrock_max_concurrency,
+        rate_per_s=settings.bedrock_rate_per_s,
+        burst=settings.bedrock_burst,
+        max_attempts=settings.bedrock_max_attempts,
+        cache_ttl_s=settings.summary_cache_ttl_s,
+        cache_max_entries=settings.summary_cache_max_entries,
+        duration_bucket_s=settings.summary_duration_bucket_s,
     )
 
     eventbus_url = settings.eventbus_url or os.environ.get("EVENTBUS_URL") or ""
 
+    probe_pool = ProbePool(
+        settings.worker_probe_processes,
+        timeout_s=settings.worker_probe_timeout_s,
+        max_cpu_s=settings.worker_probe_max_cpu_s,
+        max_memory_bytes=settings.worker_probe_max_memory_mb * 2**20,
+        max_output_bytes=settings.worker_probe_max_output_mb * 2**20,
+        native=settings.worker_probe_engine == "native",
+    )
+    ctx = WorkerContext(
+        settings=settings,
+        store=store,
+        dlq=dlq,
+        s3=s3,
+        bedrock=bedrock,
+        probe=probe_pool.probe,
+        eventbus_url=eventbus_url,
+        content_cache=get_content_cache(settings),
+        requeue=queue.enqueue_delayed,
+        retry_policies=retry_policies(settings),
+    )
+    pipeline = build_pipeline(ctx)
+    inflight: RedisInFlight | SqsInFlight
+    if isinstance(queue, SqsQueue):
+        inflight = SqsInFlight(
+            queue,
+            visibility_timeout_s=settings.sqs_visibility_timeout_s,
+            flush_interval_s=settings.sqs_ack_flush_interval_s,
+        )
+    else:
+        inflight = RedisInFlight(
+            queue,
+            reap_interval_s=settings.redis_queue_reap_interval_s,
+            on_dead_letter=functools.partial(_on_dead_letter, ctx),
+        )
+
+    stop = threading.Event()
+    _install_shutdown_handler(stop)
+
     logger.info(
         "worker_started",
         extra={
@@ -74,93 +426,22 @@ def main() -> None:
             "dlq": settings.sqs_dlq_url if settings.queue_backend == "sqs" else settings.redis_dlq,
             "metrics_port": settings.worker_metrics_port,
             "bedrock_mode": settings.bedrock_mode,
+            "concurrency": settings.worker_concurrency,
+            "probe_processes": settings.worker_probe_processes,
         },
     )
 
-    while True:
-        msg: QueueMessage | None = None
-        ack: Callable[[], None]
-        if isinstance(queue, RedisQueue):
-            msg = queue.dequeue_blocking(timeout_s=5)
-            def ack_noop() -> None:
-                return None
-
-            ack = ack_noop
-        elif isinstance(queue, SqsQueue):
-            received = queue.receive(wait_time_s=10, max_messages=1)
-            if not received:
-                continue
-            msg = received[0].message
-            receipt_handle = received[0].receipt_handle
-
-            def ack_sqs(receipt_handle: str = receipt_handle) -> None:
-                queue.delete(receipt_handle)
-
-            ack = ack_sqs
-        else:
-            raise RuntimeError("Unsupported queue backend")
-
-        if msg is None:
+    while not stop.is_set():
+        capacity = pipeline.wait_for_capacity(timeout=1)
+        if not capacity:
             continue
-        if msg.message_type != "ProcessVideo":
-            logger.warning("unknown_message_type", extra={"message_type": msg.message_type})
-            continue
-
-        job_id = str(msg.payload["job_id"])
-        bucket = str(msg.payload["bucket"])
-        key = str(msg.payload["key"])
-
-        store.update_job(job_id=job_id, status=JobStatus.processing)
-
-        start = time.time()
-        last_error: Exception | None = None
-        for attempt in range(settings.worker_max_attempts):
-            try:
-                with tempfile.TemporaryDirectory() as td:
-                    path = Path(td) / "input"
-                    _download(s3, bucket=bucket, key=key, dest=path)
-                    metadata = ffprobe(path)
-                    summary = bedrock.summarize(metadata=metadata)
-                    store.store_result(job_id=job_id, metadata=metadata, summary=summary)
-                store.update_job(job_id=job_id, status=JobStatus.succeeded)
-
-                worker_jobs_total.labels(status="succeeded").inc()
-                duration = time.time() - start
-                worker_job_duration.observe(duration)
-
-                if eventbus_url:
-                    _post_job_completed(
-                        eventbus_url,
-                        {
-                            "event_type": "JobCompleted",
-                            "job_id": job_id,
-                            "status": "SUCCEEDED",
-                        },
-                    )
-                if not eventbus_url and settings.app_env == "aws":
-                    put_event(
-                        region_name=settings.s3_region,
-                        bus_name=settings.eventbridge_bus_name,
-                        source="edvmp.worker",
-                        detail_type="JobCompleted",
-                        detail=json.dumps({"job_id": job_id, "status": "SUCCEEDED"}),
-                    )
-                logger.info("job_succeeded", extra={"job_id": job_id, "duration_s": duration})
-                ack()
-                last_error = None
-                break
-            except Exception as e:
-                last_error = e
-                sleep_s = settings.worker_backoff_seconds * (2**attempt)
-                logger.warning(
-                    "job_attempt_failed",
-                    extra={"job_id": job_id, "attempt": attempt + 1, "sleep_s": sleep_s, "error": str(e)},
-                )
-                time.sleep(sleep_s)
+        for msg, ack in _poll(queue, capacity=capacity, inflight=inflight):
+            pipeline.submit(JobState.from_message(msg, ack))
 
-        if last_error is not None:
-            _handle_failure(settings, store, dlq, eventbus_url, job_id, bucket, key, last_error)
-            ack()
+    pipeline.drain()
+    inflight.close()
+    probe_pool.shutdown()
+    logger.info("worker_stopped")
 
 
 def _handle_failure(
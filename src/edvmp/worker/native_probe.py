@@ -0,0 +1,437 @@
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from collections.abc import Iterator
+from fractions import Fraction
+from pathlib import Path
+from typing import Any, BinaryIO
+
+# The sample entry fourccs and Matroska codec ids we can name the way ffprobe does; anything
+# else goes to ffprobe rather than being guessed.
+_MP4_CODECS = {
+    b"avc1": "h264", b"avc3": "h264", b"hvc1": "hevc", b"hev1": "hevc", b"av01": "av1",
+    b"vp09": "vp9", b"vp08": "vp8", b"mp4v": "mpeg4", b"apch": "prores", b"apcn": "prores",
+    b"apcs": "prores", b"apco": "prores", b"ap4h": "prores", b"jpeg": "mjpeg",
+    b"ac-3": "ac3", b"ec-3": "eac3", b"Opus": "opus", b"fLaC": "flac", b"alac": "alac",
+    b"tx3g": "mov_text", b"wvtt": "webvtt",
+}  # fmt: skip
+# mp4a carries its codec in the esds objectTypeIndication.
+_MP4A_OBJECT_TYPES = {0x40: "aac", 0x66: "aac", 0x67: "aac", 0x68: "aac", 0x69: "mp3", 0x6B: "mp3"}
+_MP4_HANDLERS = {b"vide": "video", b"soun": "audio", b"sbtl": "subtitle", b"text": "subtitle"}
+_MKV_CODECS = {
+    "V_MPEG4/ISO/AVC": "h264", "V_MPEGH/ISO/HEVC": "hevc", "V_AV1": "av1", "V_VP8": "vp8",
+    "V_VP9": "vp9", "V_MPEG4/ISO/ASP": "mpeg4", "V_MPEG2": "mpeg2video", "V_THEORA": "theora",
+    "V_PRORES": "prores", "A_AAC": "aac", "A_OPUS": "opus", "A_VORBIS": "vorbis",
+    "A_AC3": "ac3", "A_EAC3": "eac3", "A_DTS": "dts", "A_FLAC": "flac", "A_MPEG/L3": "mp3",
+    "A_MPEG/L2": "mp2", "S_TEXT/UTF8": "subrip", "S_TEXT/ASS": "ass", "S_TEXT/SSA": "ass",
+    "S_TEXT/WEBVTT": "webvtt", "S_HDMV/PGS": "hdmv_pgs_subtitle", "S_VOBSUB": "dvd_subtitle",
+}  # fmt: skip
+_MKV_TRACK_TYPES = {1: "video", 2: "audio", 0x11: "subtitle"}
+
+_MAX_TOP_LEVEL_BOXES = 64
+_MAX_MOOV_BYTES = 64 * 1024 * 1024
+# array typecode for big-endian u32 table entries once byte-swapped ("I" is 4 bytes nearly everywhere).
+_U32 = "I" if array("I").itemsize == 4 else "L"
+_MKV_HEAD_BYTES = 1024 * 1024
+
+# EBML element ids (marker bits kept, as written in the spec).
+_EBML, _DOC_TYPE, _SEGMENT, _CLUSTER = 0x1A45DFA3, 0x4282, 0x18538067, 0x1F43B675
+_INFO, _TIMESTAMP_SCALE, _DURATION, _TITLE = 0x1549A966, 0x2AD7B1, 0x4489, 0x7BA9
+_TRACKS, _TRACK_ENTRY, _TRACK_TYPE, _CODEC_ID = 0x1654AE6B, 0xAE, 0x83, 0x86
+_NAME, _LANGUAGE, _VIDEO, _AUDIO = 0x536E, 0x22B59C, 0xE0, 0xE1
+_PIXEL_WIDTH, _PIXEL_HEIGHT, _SAMPLING_FREQUENCY, _CHANNELS = 0xB0, 0xBA, 0xB5, 0x9F
+
+
+class NativeProbeUnsupported(Exception):
+    """The file is not a container (or a variant of one) the native parser handles."""
+
+
+def probe_native(path: Path) -> dict[str, Any]:
+    """Read container headers and return ffprobe-shaped ``format``/``streams`` metadata.
+
+    Covers MP4/MOV (``moov``) and Matroska/WebM (EBML ``Info``/``Tracks``) with
+    the fields the projection and summaries use. Fragmented, encrypted or
+    otherwise unusual files raise ``NativeProbeUnsupported`` so the caller can
+    fall back to ffprobe.
+    """
+    size = path.stat().st_size
+    with path.open("rb") as f:
+        head = f.read(16)
+        if head[4:8] in (b"ftyp", b"styp", b"moov", b"wide", b"free", b"mdat"):
+            return _probe_mp4(f, path, size)
+        if head[:4] == _EBML.to_bytes(4, "big"):
+            f.seek(0)
+            return _probe_matroska(f.read(_MKV_HEAD_BYTES), path, size)
+    raise NativeProbeUnsupported("unrecognised container")
+
+
+def _format(
+    path: Path, size: int, streams: list[dict[str, Any]], *, name: str, long_name: str
+) -> dict[str, Any]:
+    return {
+        "filename": str(path),
+        "nb_streams": len(streams),
+        "nb_programs": 0,
+        "format_name": name,
+        "format_long_name": long_name,
+        "start_time": "0.000000",
+        "size": str(size),
+        "probe_score": 100,
+    }
+
+
+def _set_duration(fmt: dict[str, Any], duration_s: float, size: int) -> None:
+    if duration_s <= 0:
+        raise NativeProbeUnsupported("container has no duration")
+    fmt["duration"] = f"{duration_s:.6f}"
+    fmt["bit_rate"] = str(int(size * 8 / duration_s))
+
+
+# --- MP4 / MOV ---------------------------------------------------------------------------
+
+
+def _boxes(data: bytes, start: int, end: int) -> Iterator[tuple[bytes, int, int]]:
+    """Yield ``(type, payload start, box end)`` for each box in ``data[start:end]``."""
+    offset = start
+    while offset + 8 <= end:
+        size, kind = struct.unpack_from(">I4s", data, offset)
+        header = 8
+        if size == 1:
+            (size,) = struct.unpack_from(">Q", data, offset + 8)
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header or offset + size > end:
+            raise NativeProbeUnsupported(f"truncated {kind!r} box")
+        yield kind, offset + header, offset + size
+        offset += size
+
+
+def _child(data: bytes, start: int, end: int, kind: bytes) -> tuple[int, int]:
+    for k, payload, box_end in _boxes(data, start, end):
+        if k == kind:
+            return payload, box_end
+    raise NativeProbeUnsupported(f"missing {kind!r} box")
+
+
+def _read_top_level(f: BinaryIO, size: int) -> tuple[bytes | None, bytes]:
+    """Return the ``ftyp`` payload (if any) and the whole ``moov`` box, seeking over the rest."""
+    ftyp = None
+    offset = 0
+    for _ in range(_MAX_TOP_LEVEL_BOXES):
+        if offset + 8 > size:
+            break
+        f.seek(offset)
+        header = f.read(16)
+        box_size, kind = struct.unpack_from(">I4s", header)
+        header_len = 8
+        if box_size == 1:
+            (box_size,) = struct.unpack_from(">Q", header, 8)
+            header_len = 16
+        elif box_size == 0:
+            box_size = size - offset
+        if box_size < header_len:
+            break
+        if kind == b"moof":
+            raise NativeProbeUnsupported("fragmented MP4")
+        if kind == b"ftyp":
+            ftyp = header[header_len:] + f.read(max(0, box_size - 16))
+        if kind == b"moov":
+            if box_size > _MAX_MOOV_BYTES:
+                raise NativeProbeUnsupported("moov box too large")
+            f.seek(offset)
+            return ftyp, f.read(box_size)
+        offset += box_size
+    raise NativeProbeUnsupported("moov box not found")
+
+
+def _probe_mp4(f: BinaryIO, path: Path, size: int) -> dict[str, Any]:
+    ftyp, moov = _read_top_level(f, size)
+    _, _, moov_end = next(_boxes(moov, 0, len(moov)))
+    header = 16 if struct.unpack_from(">I", moov)[0] == 1 else 8
+
+    streams: list[dict[str, Any]] = []
+    movie_duration = 0.0
+    for kind, payload, end in _boxes(moov, header, moov_end):
+        if kind == b"mvhd":
+            timescale, duration = _mvhd(moov, payload)
+            movie_duration = duration / timescale if timescale else 0.0
+        elif kind == b"trak":
+            streams.append(_mp4_stream(moov, payload, end, index=len(streams)))
+        elif kind == b"mvex":
+            # Samples live in moof fragments; ffprobe sums them, the header alone cannot.
+            raise NativeProbeUnsupported("fragmented MP4")
+
+    fmt = _format(path, size, streams, name="mov,mp4,m4a,3gp,3g2,mj2", long_name="QuickTime / MOV")
+    if ftyp is not None and len(ftyp) >= 8:
+        brands = [ftyp[i : i + 4] for i in range(8, len(ftyp) - 3, 4)]
+        fmt["tags"] = {
+            "major_brand": ftyp[:4].decode("latin-1"),
+            "minor_version": str(struct.unpack_from(">I", ftyp, 4)[0]),
+            "compatible_brands": b"".join(brands).decode("latin-1"),
+        }
+    stream_duration = max((float(s.get("duration", 0)) for s in streams), default=0.0)
+    _set_duration(fmt, movie_duration or stream_duration, size)
+    return {"format": fmt, "streams": streams}
+
+
+def _mvhd(data: bytes, payload: int) -> tuple[int, int]:
+    if data[payload] == 1:
+        return struct.unpack_from(">IQ", data, payload + 20)
+    return struct.unpack_from(">II", data, payload + 12)
+
+
+def _mp4_stream(data: bytes, start: int, end: int, *, index: int) -> dict[str, Any]:
+    mdia, mdia_end = _child(data, start, end, b"mdia")
+    mdhd, _ = _child(data, mdia, mdia_end, b"mdhd")
+    if data[mdhd] == 1:
+        timescale, duration_ts = struct.unpack_from(">IQ", data, mdhd + 20)
+        (lang,) = struct.unpack_from(">H", data, mdhd + 32)
+    else:
+        timescale, duration_ts, lang = struct.unpack_from(">IIH", data, mdhd + 12)
+    hdlr, _ = _child(data, mdia, mdia_end, b"hdlr")
+    codec_type = _MP4_HANDLERS.get(data[hdlr + 8 : hdlr + 12])
+    if codec_type is None or not timescale:
+        raise NativeProbeUnsupported("unsupported track handler")
+
+    minf, minf_end = _child(data, mdia, mdia_end, b"minf")
+    stbl, stbl_end = _child(data, minf, minf_end, b"stbl")
+    stsd, stsd_end = _child(data, stbl, stbl_end, b"stsd")
+    fourcc, entry, entry_end = next(_boxes(data, stsd + 8, stsd_end))
+    codec_name = _MP4_CODECS.get(fourcc)
+    if fourcc == b"mp4a":
+        codec_name = _mp4a_codec(data, entry, entry_end)
+    if codec_name is None:
+        raise NativeProbeUnsupported(f"unsupported sample entry {fourcc!r}")
+
+    stream: dict[str, Any] = {
+        "index": index,
+        "codec_name": codec_name,
+        "codec_type": codec_type,
+        "codec_tag_string": fourcc.decode("latin-1"),
+        "codec_tag": f"0x{int.from_bytes(fourcc, 'little'):08x}",
+    }
+    if codec_type == "video":
+        stream["width"], stream["height"] = struct.unpack_from(">HH", data, entry + 24)
+    elif codec_type == "audio":
+        channels, _, _, _, rate = struct.unpack_from(">HHHHI", data, entry + 16)
+        stream["sample_rate"] = str(rate >> 16)
+        stream["channels"] = channels
+
+    duration_s = duration_ts / timescale
+    stream["time_base"] = f"1/{timescale}"
+    stream["duration_ts"] = duration_ts
+    stream["duration"] = f"{duration_s:.6f}"
+    sample_count, total_bytes = _stsz(data, stbl, stbl_end)
+    if duration_s > 0 and sample_count:
+        stream["bit_rate"] = str(int(total_bytes * 8 / duration_s))
+        stream["nb_frames"] = str(sample_count)
+        if codec_type == "video":
+            rate_q = Fraction(sample_count * timescale, duration_ts)
+            stream["avg_frame_rate"] = f"{rate_q.numerator}/{rate_q.denominator}"
+    stream["tags"] = {"language": _mp4_language(lang)}
+    return stream
+
+
+def _mp4a_codec(data: bytes, entry: int, entry_end: int) -> str | None:
+    version = struct.unpack_from(">H", data, entry + 8)[0]
+    if version > 1:
+        return None
+    children = entry + (28 if version == 0 else 44)
+    for kind, payload, end in _boxes(data, children, entry_end):
+        if kind == b"wave":
+            for inner, inner_payload, inner_end in _boxes(data, payload, end):
+                if inner == b"esds":
+                    return _esds_codec(data, inner_payload + 4, inner_end)
+        if kind == b"esds":
+            return _esds_codec(data, payload + 4, end)
+    return None
+
+
+def _esds_codec(data: bytes, pos: int, end: int) -> str | None:
+    """Follow ES_Descriptor -> DecoderConfigDescriptor to its objectTypeIndication."""
+
+    def descriptor(at: int) -> tuple[int, int]:
+        tag, at = data[at], at + 1
+        length = 0
+        for _ in range(4):
+            byte, at = data[at], at + 1
+            length = (length << 7) | (byte & 0x7F)
+            if not byte & 0x80:
+                break
+        return tag, at
+
+    tag, pos = descriptor(pos)
+    if tag != 0x03:
+        return None
+    flags = data[pos + 2]
+    pos += 3
+    if flags & 0x80:
+        pos += 2
+    if flags & 0x40:
+        pos += 1 + data[pos]
+    if flags & 0x20:
+        pos += 2
+    tag, pos = descriptor(pos)
+    if tag != 0x04 or pos >= end:
+        return None
+    return _MP4A_OBJECT_TYPES.get(data[pos])
+
+
+def _stsz(data: bytes, stbl: int, stbl_end: int) -> tuple[int, int]:
+    """Return ``(sample count, total sample bytes)`` from the sample size table."""
+    try:
+        stsz, _ = _child(data, stbl, stbl_end, b"stsz")
+    except NativeProbeUnsupported:
+        return 0, 0
+    sample_size, count = struct.unpack_from(">II", data, stsz + 4)
+    if sample_size:
+        return count, sample_size * count
+    # Long files have millions of entries: an array keeps them as 4-byte machine words
+    # instead of a tuple of Python ints.
+    table = memoryview(data)[stsz + 12 : stsz + 12 + 4 * count]
+    if len(table) != 4 * count:
+        raise NativeProbeUnsupported("truncated stsz")
+    sizes = array(_U32)
+    sizes.frombytes(table)
+    if sys.byteorder == "little":
+        sizes.byteswap()
+    return count, sum(sizes)
+
+
+def _mp4_language(packed: int) -> str:
+    if not packed or packed == 0x7FFF:
+        return "und"
+    return "".join(chr(((packed >> shift) & 0x1F) + 0x60) for shift in (10, 5, 0))
+
+
+# --- Matroska / WebM ---------------------------------------------------------------------
+
+
+def _vint(data: bytes, pos: int, *, keep_marker: bool) -> tuple[int | None, int]:
+    """Decode an EBML variable-length integer; ``None`` for the reserved "unknown size"."""
+    if pos >= len(data) or data[pos] == 0:
+        raise NativeProbeUnsupported("invalid EBML varint")
+    length = 9 - data[pos].bit_length()
+    value = data[pos] if keep_marker else data[pos] & (0xFF >> length)
+    for byte in data[pos + 1 : pos + length]:
+        value = (value << 8) | byte
+    if pos + length > len(data):
+        raise NativeProbeUnsupported("truncated EBML varint")
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        return None, pos + length
+    return value, pos + length
+
+
+def _elements(data: bytes, start: int, end: int) -> Iterator[tuple[int, int, int]]:
+    """Yield ``(id, payload start, payload end)``; unknown sizes run to ``end``."""
+    pos = start
+    while pos < end:
+        element_id, pos = _vint(data, pos, keep_marker=True)
+        size, pos = _vint(data, pos, keep_marker=False)
+        payload_end = end if size is None else pos + size
+        yield element_id or 0, pos, min(payload_end, end)
+        pos = payload_end
+
+
+def _uint(data: bytes, start: int, end: int) -> int:
+    return int.from_bytes(data[start:end], "big")
+
+
+def _ebml_float(data: bytes, start: int, end: int) -> float:
+    if end - start == 4:
+        return float(struct.unpack_from(">f", data, start)[0])
+    if end - start == 8:
+        return float(struct.unpack_from(">d", data, start)[0])
+    raise NativeProbeUnsupported("invalid EBML float")
+
+
+def _text(data: bytes, start: int, end: int) -> str:
+    return data[start:end].rstrip(b"\0").decode("utf-8", errors="replace")
+
+
+def _probe_matroska(data: bytes, path: Path, size: int) -> dict[str, Any]:
+    elements = _elements(data, 0, len(data))
+    element_id, start, end = next(elements)
+    doc_type = next(
+        (_text(data, s, e) for i, s, e in _elements(data, start, end) if i == _DOC_TYPE),
+        "matroska",
+    )
+    if element_id != _EBML or doc_type not in ("matroska", "webm"):
+        raise NativeProbeUnsupported("not a Matroska/WebM file")
+    element_id, start, end = next(elements)
+    if element_id != _SEGMENT:
+        raise NativeProbeUnsupported("missing Segment")
+
+    info = tracks = None
+    for element_id, s, e in _elements(data, start, end):
+        if element_id == _INFO:
+            info = (s, e)
+        elif element_id == _TRACKS:
+            tracks = (s, e)
+        elif element_id == _CLUSTER or (info and tracks):
+            break
+    if info is None or tracks is None:
+        raise NativeProbeUnsupported("Info/Tracks not in the file head")
+
+    scale, duration, title = 1_000_000, 0.0, None
+    for element_id, s, e in _elements(data, *info):
+        if element_id == _TIMESTAMP_SCALE:
+            scale = _uint(data, s, e)
+        elif element_id == _DURATION:
+            duration = _ebml_float(data, s, e)
+        elif element_id == _TITLE:
+            title = _text(data, s, e)
+
+    streams = [
+        _mkv_stream(data, s, e, index=index)
+        for index, (s, e) in enumerate(
+            (s, e) for element_id, s, e in _elements(data, *tracks) if element_id == _TRACK_ENTRY
+        )
+    ]
+    fmt = _format(path, size, streams, name="matroska,webm", long_name="Matroska / WebM")
+    if title:
+        fmt["tags"] = {"title": title}
+    _set_duration(fmt, duration * scale / 1e9, size)
+    return {"format": fmt, "streams": streams}
+
+
+def _mkv_stream(data: bytes, start: int, end: int, *, index: int) -> dict[str, Any]:
+    fields: dict[int, tuple[int, int]] = {i: (s, e) for i, s, e in _elements(data, start, end)}
+    codec_type = _MKV_TRACK_TYPES.get(
+        _uint(data, *fields[_TRACK_TYPE]) if _TRACK_TYPE in fields else 0
+    )
+    codec_id = _text(data, *fields[_CODEC_ID]) if _CODEC_ID in fields else ""
+    codec_name = _MKV_CODECS.get(codec_id) or ("aac" if codec_id.startswith("A_AAC") else None)
+    if codec_type is None or codec_name is None:
+        raise NativeProbeUnsupported(f"unsupported track {codec_id!r}")
+
+    stream: dict[str, Any] = {
+        "index": index,
+        "codec_name": codec_name,
+        "codec_type": codec_type,
+        "time_base": "1/1000",
+    }
+    if codec_type == "video" and _VIDEO in fields:
+        video = {i: (s, e) for i, s, e in _elements(data, *fields[_VIDEO])}
+        if _PIXEL_WIDTH in video and _PIXEL_HEIGHT in video:
+            stream["width"] = _uint(data, *video[_PIXEL_WIDTH])
+            stream["height"] = _uint(data, *video[_PIXEL_HEIGHT])
+    elif codec_type == "audio":
+        audio = (
+            {i: (s, e) for i, s, e in _elements(data, *fields[_AUDIO])} if _AUDIO in fields else {}
+        )
+        rate = (
+            _ebml_float(data, *audio[_SAMPLING_FREQUENCY])
+            if _SAMPLING_FREQUENCY in audio
+            else 8000.0
+        )
+        stream["sample_rate"] = str(int(rate))
+        stream["channels"] = _uint(data, *audio[_CHANNELS]) if _CHANNELS in audio else 1
+    tags = {"language": _text(data, *fields[_LANGUAGE]) if _LANGUAGE in fields else "eng"}
+    if _NAME in fields:
+        tags["title"] = _text(data, *fields[_NAME])
+    stream["tags"] = tags
+    return stream
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import functools
+import logging
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+from edvmp.shared.metrics import worker_stage_duration, worker_stage_queue_depth
+from edvmp.worker.executor import JobExecutor
+
+logger = logging.getLogger("edvmp.worker.pipeline")
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class StageSpec(Generic[T]):
+    name: str
+    fn: Callable[[T], None]
+    workers: int
+    queue_size: int
+
+
+class _Stage(Generic[T]):
+    def __init__(self, spec: StageSpec[T]):
+        self.name = spec.name
+        self.fn = spec.fn
+        self.executor = JobExecutor(
+            spec.workers, backlog=spec.queue_size, thread_name_prefix=f"edvmp-{spec.name}"
+        )
+
+    def report_depth(self) -> None:
+        worker_stage_queue_depth.labels(stage=self.name).set(self.executor.queued)
+
+
+class StagedPipeline(Generic[T]):
+    """Moves items through stages joined by bounded queues, each with its own thread count.
+
+    A stage hands an item to the next one with a blocking submit, so a slow stage
+    fills its queue and stalls the stage before it; throughput is bounded by the
+    slowest stage rather than the sum of all of them.
+
+    ``on_error`` returns a retry delay in seconds, or ``None`` once it has handled
+    the failure itself. Retries re-enter the first stage from a timer thread so a
+    backoff never occupies a stage worker.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[StageSpec[T]],
+        *,
+        on_complete: Callable[[T], None],
+        on_error: Callable[[T, Exception], float | None],
+    ):
+        if not stages:
+            raise ValueError("pipeline needs at least one stage")
+        self._stages = [_Stage(spec) for spec in stages]
+        self._on_complete = on_complete
+        self._on_error = on_error
+        self._cond = threading.Condition()
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        with self._cond:
+            return self._in_flight
+
+    def wait_for_capacity(self, timeout: float | None = None) -> int:
+        return self._stages[0].executor.wait_for_capacity(timeout=timeout)
+
+    def submit(self, item: T) -> None:
+        with self._cond:
+            self._in_flight += 1
+        self._enter(0, item)
+
+    def _enter(self, index: int, item: T) -> None:
+        stage = self._stages[index]
+        stage.executor.submit(functools.partial(self._run, index, item))
+        stage.report_depth()
+
+    def _run(self, index: int, item: T) -> None:
+        stage = self._stages[index]
+        stage.report_depth()
+        start = time.perf_counter()
+        try:
+            stage.fn(item)
+        except Exception as e:
+            worker_stage_duration.labels(stage=stage.name).observe(time.perf_counter() - start)
+            self._fail(item, e)
+            return
+        worker_stage_duration.labels(stage=stage.name).observe(time.perf_counter() - start)
+
+        if index + 1 < len(self._stages):
+            self._enter(index + 1, item)
+            return
+        try:
+            self._on_complete(item)
+        except Exception:
+            logger.exception("pipeline_on_complete_failed")
+        self._done()
+
+    def _fail(self, item: T, error: Exception) -> None:
+        try:
+            delay = self._on_error(item, error)
+        except Exception:
+            logger.exception("pipeline_on_error_failed")
+            delay = None
+        if delay is None:
+            self._done()
+            return
+        timer = threading.Timer(delay, self._enter, args=(0, item))
+        timer.daemon = True
+        timer.start()
+
+    def _done(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def drain(self) -> None:
+        """Wait until every submitted item has completed or failed for good, then stop the stages."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._in_flight == 0)
+        for stage in self._stages:
+            stage.executor.drain()
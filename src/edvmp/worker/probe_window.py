@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import logging
+import struct
+from pathlib import Path
+
+from tenacity import retry, stop_after_attempt, wait_exponential
+
+from edvmp.shared.s3 import get_object_range
+
+logger = logging.getLogger("edvmp.worker.probe_window")
+
+# Top-level ISO BMFF box types we are willing to skip over while looking for `moov`.
+_MP4_TOP_LEVEL = {
+    b"ftyp", b"styp", b"moov", b"mdat", b"free", b"skip", b"wide", b"uuid",
+    b"pdin", b"moof", b"mfra", b"meta", b"sidx", b"prft",
+}  # fmt: skip
+_MAX_TOP_LEVEL_BOXES = 64
+
+
+class ProbeWindowUnavailable(RuntimeError):
+    """The object layout needs more than a few byte ranges; fall back to a full download."""
+
+
+@retry(wait=wait_exponential(multiplier=1, min=0.5, max=10), stop=stop_after_attempt(3))
+def _fetch(s3, bucket: str, key: str, start: int, end: int) -> bytes:
+    return get_object_range(s3, bucket, key, start=start, end=end)
+
+
+def fetch_probe_window(
+    s3,
+    *,
+    bucket: str,
+    key: str,
+    size: int,
+    dest: Path,
+    head_bytes: int,
+    tail_bytes: int,
+    max_moov_bytes: int,
+) -> int:
+    """Write a sparse local copy of the object holding only the ranges ffprobe reads.
+
+    The file has the object's real length (so ffprobe's size-derived bitrate is
+    right) but only the head, and either the MP4 `moov` box or the tail, are
+    populated. Returns the number of bytes fetched.
+    """
+    head = _fetch(s3, bucket, key, 0, min(size, head_bytes) - 1)
+    fetched = len(head)
+    with dest.open("wb") as f:
+        f.truncate(size)
+        f.write(head)
+
+        if head[4:8] in (b"ftyp", b"styp"):
+            moov_offset, moov_size, header_bytes = _locate_moov(s3, bucket, key, size, head)
+            fetched += header_bytes
+            if moov_size > max_moov_bytes:
+                raise ProbeWindowUnavailable(
+                    f"moov box too large for ranged probe ({moov_size} bytes)"
+                )
+            if moov_offset + moov_size > len(head):
+                start = max(moov_offset, len(head))
+                chunk = _fetch(s3, bucket, key, start, moov_offset + moov_size - 1)
+                f.seek(start)
+                f.write(chunk)
+                fetched += len(chunk)
+        elif size > len(head):
+            start = max(len(head), size - tail_bytes)
+            chunk = _fetch(s3, bucket, key, start, size - 1)
+            f.seek(start)
+            f.write(chunk)
+            fetched += len(chunk)
+
+    logger.info(
+        "probe_window_fetched",
+        extra={"bucket": bucket, "key": key, "object_bytes": size, "fetched_bytes": fetched},
+    )
+    return fetched
+
+
+def _locate_moov(s3, bucket: str, key: str, size: int, head: bytes) -> tuple[int, int, int]:
+    """Walk top-level MP4 boxes, fetching only box headers past the head window.
+
+    Returns the moov offset and size plus the bytes spent on header reads.
+    """
+    offset = 0
+    header_bytes = 0
+    for _ in range(_MAX_TOP_LEVEL_BOXES):
+        if offset + 8 > size:
+            break
+        if offset + 16 <= len(head):
+            header = head[offset : offset + 16]
+        else:
+            header = _fetch(s3, bucket, key, offset, min(size, offset + 16) - 1)
+            header_bytes += len(header)
+        box_size, box_type = struct.unpack(">I4s", header[:8])
+        if box_size == 1:
+            if len(header) < 16:
+                break
+            (box_size,) = struct.unpack(">Q", header[8:16])
+        elif box_size == 0:
+            box_size = size - offset
+        if box_type not in _MP4_TOP_LEVEL or box_size < 8:
+            break
+        if box_type == b"moov":
+            return offset, box_size, header_bytes
+        offset += box_size
+    raise ProbeWindowUnavailable("moov box not found in top-level MP4 boxes")
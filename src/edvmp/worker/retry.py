@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from edvmp.shared.config import Settings
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int
+    base_delay_s: float
+    max_delay_s: float
+
+    def delay_s(self, attempt: int) -> float:
+        """Backoff before retry number ``attempt`` (1-based): exponential, with equal jitter."""
+        ceiling = min(self.max_delay_s, self.base_delay_s * 2.0 ** (attempt - 1))
+        # Jitter only spreads retries out; it needs no cryptographic randomness.
+        return ceiling / 2 + random.uniform(0, ceiling / 2)  # nosec B311
+
+
+# Keyed by classify_failure category. Bad media fails the same way every time; a
+# dependency outage or provider throttling is worth waiting out.
+DEFAULT_RETRY_POLICIES: dict[str, RetryPolicy] = {
+    "bad_media": RetryPolicy(max_attempts=1, base_delay_s=0.0, max_delay_s=0.0),
+    "timeout": RetryPolicy(max_attempts=3, base_delay_s=10.0, max_delay_s=120.0),
+    "provider_error": RetryPolicy(max_attempts=5, base_delay_s=15.0, max_delay_s=600.0),
+    "dependency_unavailable": RetryPolicy(max_attempts=8, base_delay_s=5.0, max_delay_s=900.0),
+}
+
+
+class RetryPolicies:
+    """Retry policy per failure category; ``overrides`` replace individual fields of a policy."""
+
+    def __init__(
+        self,
+        *,
+        default: RetryPolicy,
+        overrides: Mapping[str, Mapping[str, float]] | None = None,
+    ):
+        self._default = default
+        self._policies = dict(DEFAULT_RETRY_POLICIES)
+        for category, fields in (overrides or {}).items():
+            base = self._policies.get(category, default)
+            self._policies[category] = RetryPolicy(
+                max_attempts=int(fields.get("max_attempts", base.max_attempts)),
+                base_delay_s=float(fields.get("base_delay_s", base.base_delay_s)),
+                max_delay_s=float(fields.get("max_delay_s", base.max_delay_s)),
+            )
+
+    def for_category(self, category: str) -> RetryPolicy:
+        return self._policies.get(category, self._default)
+
+
+def retry_policies(settings: Settings) -> RetryPolicies:
+    default = RetryPolicy(
+        max_attempts=settings.worker_max_attempts,
+        base_delay_s=settings.worker_backoff_seconds,
+        max_delay_s=900.0,
+    )
+    return RetryPolicies(default=default, overrides=settings.worker_retry_policies)
@@ -64,6 +64,7 @@ def test_end_to_end_job_completes(tmp_path: Path) -> None:
         payload = result.json()
         assert payload["job_id"] == job_id
         assert "metadata" in payload
+        assert "projection" in payload
         assert "summary" in payload
 
         history = client.get("/history?limit=10", headers=headers)
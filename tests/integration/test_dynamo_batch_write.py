@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import pytest
+
+from edvmp.shared.aws_dynamo_store import AwsDynamoStore
+from edvmp.shared.models import JobStatus
+from edvmp.shared.store import JobsPartiallyCreated
+
+
+class FakeBatchWriter:
+    """Reports the first three writes of the first request as unprocessed, like a throttled table."""
+
+    def __init__(self) -> None:
+        self.calls: list[int] = []
+        self.written: set[str] = set()
+
+    def batch_write_item(self, *, RequestItems):  # noqa: N803
+        writes = RequestItems["jobs"]
+        self.calls.append(len(writes))
+        unprocessed = writes[:3] if len(self.calls) == 1 else []
+        for w in writes[len(unprocessed) :]:
+            self.written.add(w["PutRequest"]["Item"]["job_id"]["S"])
+        return {"UnprocessedItems": {"jobs": unprocessed} if unprocessed else {}}
+
+
+def _store() -> AwsDynamoStore:
+    return AwsDynamoStore(
+        region_name="us-east-1",
+        jobs_table="jobs",
+        results_table="results",
+        idempotency_table="idem",
+    )
+
+
+def test_create_jobs_chunks_by_25_and_retries_unprocessed(monkeypatch) -> None:
+    monkeypatch.setattr("edvmp.shared.aws_dynamo_store.time.sleep", lambda _: None)
+    store = _store()
+    fake = FakeBatchWriter()
+    store._ddb = fake
+    jobs = {f"j{i:02d}": f"uploads/j{i:02d}/a.mp4" for i in range(30)}
+
+    store.create_jobs(bucket="b", jobs=jobs, status=JobStatus.awaiting_upload)
+
+    assert fake.calls == [25, 3, 5]
+    assert fake.written == set(jobs)
+
+
+class FailingBatchWriter(FakeBatchWriter):
+    """Accepts the first chunk, then leaves two writes unprocessed and fails the retry."""
+
+    def batch_write_item(self, *, RequestItems):  # noqa: N803
+        writes = RequestItems["jobs"]
+        self.calls.append(len(writes))
+        if len(self.calls) == 3:
+            raise RuntimeError("ProvisionedThroughputExceededException")
+        unprocessed = writes[:2] if len(self.calls) == 2 else []
+        for w in writes[len(unprocessed) :]:
+            self.written.add(w["PutRequest"]["Item"]["job_id"]["S"])
+        return {"UnprocessedItems": {"jobs": unprocessed} if unprocessed else {}}
+
+
+def test_create_jobs_reports_the_jobs_written_before_a_failure(monkeypatch) -> None:
+    monkeypatch.setattr("edvmp.shared.aws_dynamo_store.time.sleep", lambda _: None)
+    store = _store()
+    fake = FailingBatchWriter()
+    store._ddb = fake
+    jobs = {f"j{i:02d}": f"uploads/j{i:02d}/a.mp4" for i in range(30)}
+
+    with pytest.raises(JobsPartiallyCreated) as exc:
+        store.create_jobs(bucket="b", jobs=jobs, status=JobStatus.awaiting_upload)
+
+    assert set(exc.value.written) == fake.written
+    assert len(fake.written) == 28
+
+
+def test_create_jobs_reraises_when_nothing_was_written() -> None:
+    store = _store()
+    fake = FailingBatchWriter()
+    fake.calls = [0, 0]
+    store._ddb = fake
+
+    with pytest.raises(RuntimeError, match="Provisioned") as exc:
+        store.create_jobs(
+            bucket="b", jobs={"j": "uploads/j/a.mp4"}, status=JobStatus.awaiting_upload
+        )
+
+    assert not isinstance(exc.value, JobsPartiallyCreated)
@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from botocore.stub import ANY, Stubber
+
+from edvmp.shared.aws_dynamo_store import AwsDynamoStore
+from edvmp.shared.models import JobStatus
+from edvmp.shared.pagination import (
+    InvalidCursor,
+    JobQuery,
+    ResultQuery,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def _item(i: int) -> dict:
+    ts = f"2024-01-01T00:00:{59 - i:02d}+00:00"
+    return {
+        "job_id": {"S": f"j{i}"},
+        "status": {"S": "FAILED"},
+        "created_at": {"S": ts},
+        "updated_at": {"S": ts},
+        "s3_bucket": {"S": "b"},
+        "s3_key": {"S": f"uploads/j{i}/a.mp4"},
+        "error_code": {"S": "PROBE_FAILED"},
+    }
+
+
+def _store(**options) -> AwsDynamoStore:
+    return AwsDynamoStore(
+        region_name="us-east-1",
+        jobs_table="jobs",
+        results_table="results",
+        idempotency_table="idem",
+        **options,
+    )
+
+
+def test_filtered_page_is_topped_up_and_cursor_resumes_after_last_item() -> None:
+    store = _store(history_shards=1)
+    stubber = Stubber(store._ddb)
+    # The status filter drops items server-side, so the first query returns a short page.
+    stubber.add_response(
+        "query",
+        {"Items": [_item(0)], "LastEvaluatedKey": {"job_id": {"S": "j1"}}},
+        {
+            "TableName": "jobs",
+            "IndexName": "gsi3",
+            "KeyConditionExpression": "#pk = :pk",
+            "FilterExpression": "#st = :st",
+            "ExpressionAttributeNames": {"#pk": "gsi3pk", "#sk": "created_at", "#st": "status"},
+            "ExpressionAttributeValues": {
+                ":pk": {"S": "ERR#PROBE_FAILED#0"},
+                ":st": {"S": "FAILED"},
+            },
+            "ScanIndexForward": False,
+            "Limit": 2,
+        },
+    )
+    stubber.add_response(
+        "query", {"Items": [_item(2)], "LastEvaluatedKey": {"job_id": {"S": "j2"}}}
+    )
+
+    with stubber:
+        page = store.list_jobs_page(
+            limit=2, query=JobQuery(status=JobStatus.failed, error_code="PROBE_FAILED")
+        )
+    stubber.assert_no_pending_responses()
+
+    assert [j.job_id for j in page.items] == ["j0", "j2"]
+    assert page.next_cursor is not None
+    position = decode_cursor(page.next_cursor)
+    assert position["i"] == "gsi3"
+    assert position["p"]["ERR#PROBE_FAILED#0"]["job_id"] == {"S": "j2"}
+
+    with pytest.raises(InvalidCursor):
+        store.list_jobs_page(limit=2, cursor=page.next_cursor)
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        {"job_id": {"S": "j2"}},
+        {"job_id": {"N": "2"}, "gsi3pk": {"S": "ERR#PROBE_FAILED#0"}, "created_at": {"S": "t"}},
+        {"job_id": {"S": "j2"}, "gsi3pk": {"S": "ERR#OTHER#0"}, "created_at": {"S": "t"}},
+        "j2",
+    ],
+)
+def test_forged_resume_keys_are_rejected_before_any_query(key) -> None:
+    store = _store(history_shards=1)
+    cursor = encode_cursor({"i": "gsi3", "p": {"ERR#PROBE_FAILED#0": key}})
+
+    with Stubber(store._ddb) as stubber, pytest.raises(InvalidCursor):
+        store.list_jobs_page(limit=2, cursor=cursor, query=JobQuery(error_code="PROBE_FAILED"))
+    stubber.assert_no_pending_responses()
+
+
+def test_status_and_error_keys_follow_the_job_and_are_backfilled() -> None:
+    store = _store(history_shards=4)
+    shard = store._shard("j0")
+    stubber = Stubber(store._ddb)
+    stubber.add_response(
+        "update_item",
+        {},
+        {
+            "TableName": "jobs",
+            "Key": {"job_id": {"S": "j0"}},
+            "UpdateExpression": (
+                "SET #s = :s, gsi2pk = :g2, updated_at = :u, error_message = :em,"
+                " error_code = :ec, gsi3pk = :g3"
+            ),
+            "ExpressionAttributeNames": {"#s": "status"},
+            "ExpressionAttributeValues": {
+                ":s": {"S": "FAILED"},
+                ":g2": {"S": f"STATUS#FAILED#{shard}"},
+                ":u": ANY,
+                ":em": {"S": "boom"},
+                ":ec": {"S": "timeout"},
+                ":g3": {"S": f"ERR#timeout#{shard}"},
+            },
+        },
+    )
+    # Jobs written before the indexes were sharded carry neither key.
+    stubber.add_response("scan", {"Items": [_item(0)]})
+    stubber.add_response(
+        "update_item",
+        {},
+        {
+            "TableName": "jobs",
+            "Key": {"job_id": {"S": "j0"}},
+            "UpdateExpression": "SET gsi2pk = :g2, gsi3pk = :g3",
+            "ConditionExpression": "#s = :s AND error_code = :ec",
+            "ExpressionAttributeNames": {"#s": "status"},
+            "ExpressionAttributeValues": {
+                ":g2": {"S": f"STATUS#FAILED#{shard}"},
+                ":s": {"S": "FAILED"},
+                ":g3": {"S": f"ERR#PROBE_FAILED#{shard}"},
+                ":ec": {"S": "PROBE_FAILED"},
+            },
+        },
+    )
+
+    with stubber:
+        store.update_job(
+            job_id="j0", status=JobStatus.failed, error_code="timeout", error_message="boom"
+        )
+        assert store.backfill_filter_shards() == 1
+    stubber.assert_no_pending_responses()
+
+
+class FakeJobsIndex:
+    """Just enough of DynamoDB's Query/UpdateItem on gsi1 to exercise scatter-gather."""
+
+    def __init__(self) -> None:
+        self.items: dict[str, dict] = {}
+        self.queries = 0
+
+    def put_item(self, *, TableName, Item, ConditionExpression):  # noqa: N803
+        self.items[Item["job_id"]["S"]] = Item
+
+    def query(self, **kwargs):
+        self.queries += 1
+        pk = kwargs["ExpressionAttributeValues"][":pk"]["S"]
+        rows = sorted(
+            (i for i in self.items.values() if i.get("gsi1pk", {}).get("S") == pk),
+            key=lambda i: (i["gsi1sk"]["S"], i["job_id"]["S"]),
+            reverse=True,
+        )
+        start = kwargs.get("ExclusiveStartKey")
+        if start:
+            ids = [r["job_id"]["S"] for r in rows]
+            rows = rows[ids.index(start["job_id"]["S"]) + 1 :]
+        limit = kwargs.get("Limit", len(rows))
+        out = {"Items": rows[:limit]}
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            out["LastEvaluatedKey"] = {
+                "job_id": last["job_id"],
+                "gsi1pk": last["gsi1pk"],
+                "gsi1sk": last["gsi1sk"],
+            }
+        return out
+
+    def update_item(self, *, Key, ExpressionAttributeValues, **_):  # noqa: N803
+        item = self.items[Key["job_id"]["S"]]
+        if item["gsi1pk"] != ExpressionAttributeValues[":legacy"]:
+            raise AssertionError("conditional update should have failed")
+        item["gsi1pk"] = ExpressionAttributeValues[":shard"]
+
+
+def test_sharded_history_merges_shards_newest_first_across_pages() -> None:
+    store = _store(history_shards=4)
+    fake = FakeJobsIndex()
+    store._ddb = fake
+    for i in range(23):
+        store.create_job_if_missing(
+            job_id=f"j{i:02d}", bucket="b", key="k", status=JobStatus.submitted
+        )
+        fake.items[f"j{i:02d}"]["gsi1sk"] = {"S": f"2024-01-01T00:00:{i:02d}+00:00"}
+    assert len({i["gsi1pk"]["S"] for i in fake.items.values()}) > 1
+    # Two items written before sharding still live under the legacy partition.
+    for i in (3, 17):
+        fake.items[f"j{i:02d}"]["gsi1pk"] = {"S": "HISTORY"}
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        page = store.list_jobs_page(limit=5, cursor=cursor)
+        seen.extend(j.job_id for j in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == [f"j{i:02d}" for i in reversed(range(23))]
+
+    assert store.backfill_history_shards() == 2
+    assert all(i["gsi1pk"]["S"] != "HISTORY" for i in fake.items.values())
+    migrated = _store(history_shards=4, read_legacy_history=False)
+    migrated._ddb = fake
+    assert [j.job_id for j in migrated.list_jobs(limit=3)] == ["j22", "j21", "j20"]
+
+
+class FakeResultsIndexes:
+    """Query over the results-table GSIs with the simple ``#f op :f`` filters /search emits."""
+
+    _OPS = {"=": lambda a, b: a == b, ">=": lambda a, b: a >= b, "<=": lambda a, b: a <= b}
+
+    def __init__(self) -> None:
+        self.items: dict[str, dict] = {}
+
+    def put_item(self, *, TableName, Item):  # noqa: N803
+        self.items[Item["job_id"]["S"]] = Item
+
+    def scan(self, **kwargs):
+        # The backfill's filter: items missing one of the search keys.
+        return {
+            "Items": [
+                i
+                for i in self.items.values()
+                if "catalog_pk" not in i or ("video_codec" in i and "video_codec_pk" not in i)
+            ]
+        }
+
+    def get_item(self, *, TableName, Key, ProjectionExpression):  # noqa: N803
+        return {"Item": {"updated_at": {"S": "2023-06-01T00:00:00+00:00"}}}
+
+    def update_item(self, *, Key, UpdateExpression, ExpressionAttributeNames, **kwargs):  # noqa: N803
+        values = kwargs["ExpressionAttributeValues"]
+        item = self.items[Key["job_id"]["S"]]
+        for assignment in UpdateExpression.removeprefix("SET ").split(", "):
+            name, placeholder = assignment.split(" = ")
+            item[ExpressionAttributeNames[name]] = values[placeholder]
+
+    def query(self, **kwargs):
+        names, values = kwargs["ExpressionAttributeNames"], kwargs["ExpressionAttributeValues"]
+        pk_attr, sk_attr = names["#pk"], names["#sk"]
+
+        def value(attr: dict):
+            return float(attr["N"]) if "N" in attr else attr["S"]
+
+        def matches(item: dict) -> bool:
+            if item.get(pk_attr) != values[":pk"]:
+                return False
+            for term in filter(None, kwargs.get("FilterExpression", "").split(" AND ")):
+                name, op, placeholder = term.split()
+                attr = item.get(names[name])
+                if attr is None or not self._OPS[op](value(attr), value(values[placeholder])):
+                    return False
+            return True
+
+        rows = sorted(
+            (i for i in self.items.values() if i.get(pk_attr) == values[":pk"]),
+            key=lambda i: (i[sk_attr]["S"], i["job_id"]["S"]),
+            reverse=True,
+        )
+        start = kwargs.get("ExclusiveStartKey")
+        if start:
+            ids = [r["job_id"]["S"] for r in rows]
+            rows = rows[ids.index(start["job_id"]["S"]) + 1 :]
+        # Like DynamoDB, Limit caps items evaluated, before the filter is applied.
+        evaluated = rows[: kwargs["Limit"]]
+        out = {"Items": [r for r in evaluated if matches(r)]}
+        if len(rows) > len(evaluated):
+            last = evaluated[-1]
+            out["LastEvaluatedKey"] = {k: last[k] for k in ("job_id", pk_attr, sk_attr)}
+        return out
+
+
+def test_search_merges_codec_or_catalog_shards() -> None:
+    store = _store(history_shards=3)
+    fake = FakeResultsIndexes()
+    store._ddb = fake
+    for i in range(12):
+        metadata = {
+            "format": {"duration": str(60.0 * i)},
+            "streams": [
+                {
+                    "codec_type": "video",
+                    "codec_name": "hevc" if i % 2 else "h264",
+                    "height": 2160 if i % 3 else 1080,
+                }
+            ],
+        }
+        store.store_result(job_id=f"j{i:02d}", metadata=metadata, summary="s")
+        fake.items[f"j{i:02d}"]["completed_at"] = {"S": f"2024-01-01T00:00:{i:02d}+00:00"}
+
+    def search_all(query: ResultQuery) -> list[str]:
+        seen: list[str] = []
+        cursor = None
+        while True:
+            page = store.search_results(limit=2, cursor=cursor, query=query)
+            seen.extend(hit.job_id for hit in page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                return seen
+
+    assert search_all(ResultQuery(video_codec="hevc", min_height=2160, min_duration_s=300)) == [
+        "j11",
+        "j07",
+        "j05",
+    ]
+    assert search_all(ResultQuery(min_height=2160)) == [
+        f"j{i:02d}" for i in reversed(range(12)) if i % 3
+    ]
+    page = store.search_results(limit=1, query=ResultQuery(max_duration_s=0))
+    assert [hit.projection.video_codec for hit in page.items] == ["h264"]
+    item = fake.items["j07"]
+    assert item["video_codec_pk"]["S"] == f"hevc#{store._shard('j07')}"
+
+
+def test_backfill_makes_results_stored_before_search_findable() -> None:
+    store = _store(history_shards=2)
+    fake = FakeResultsIndexes()
+    store._ddb = fake
+    metadata = {"streams": [{"codec_type": "video", "codec_name": "vp9", "height": 720}]}
+    fake.items["old"] = {
+        "job_id": {"S": "old"},
+        "summary": {"S": "s"},
+        "metadata_json": {"S": json.dumps(metadata)},
+    }
+    assert store.search_results(query=ResultQuery(video_codec="vp9")).items == []
+
+    assert store.backfill_result_search_keys() == 1
+    assert store.backfill_result_search_keys() == 0
+    hits = store.search_results(query=ResultQuery(video_codec="vp9")).items
+    assert [(h.job_id, h.projection.height) for h in hits] == [("old", 720)]
+    assert hits[0].completed_at.year == 2023
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from edvmp.worker.ffprobe import ffprobe
+from edvmp.worker.native_probe import probe_native
+
+pytestmark = pytest.mark.skipif(
+    not (shutil.which("ffmpeg") and shutil.which("ffprobe")),
+    reason="ffmpeg/ffprobe are not installed",
+)
+
+_SOURCES = [
+    "-f", "lavfi", "-i", "testsrc2=size=640x360:rate=25:duration=3",
+    "-f", "lavfi", "-i", "sine=frequency=440:sample_rate=48000:duration=3",
+    "-ac", "2",
+]  # fmt: skip
+
+_SAMPLES = {
+    "h264-aac.mp4": ["-c:v", "libx264", "-c:a", "aac"],
+    "h264-aac-faststart.mp4": ["-c:v", "libx264", "-c:a", "aac", "-movflags", "+faststart"],
+    "mpeg4-aac.mov": ["-c:v", "mpeg4", "-c:a", "aac"],
+    "h264-aac.mkv": ["-c:v", "libx264", "-c:a", "aac"],
+    "vp9-opus.webm": ["-c:v", "libvpx-vp9", "-deadline", "realtime", "-c:a", "libopus"],
+}
+
+_STREAM_FIELDS = ("codec_type", "codec_name", "width", "height", "sample_rate", "channels")
+
+
+@pytest.mark.parametrize("name", sorted(_SAMPLES))
+def test_native_probe_agrees_with_ffprobe(tmp_path: Path, name: str) -> None:
+    path = tmp_path / name
+    cmd = ["ffmpeg", "-v", "error", "-y", *_SOURCES, *_SAMPLES[name], "-t", "3", str(path)]
+    if subprocess.run(cmd, capture_output=True).returncode != 0:
+        pytest.skip(f"this ffmpeg build cannot encode {name}")
+
+    native, reference = probe_native(path), ffprobe(path)
+
+    assert native["format"]["format_name"] == reference["format"]["format_name"]
+    assert native["format"]["nb_streams"] == reference["format"]["nb_streams"]
+    assert float(native["format"]["duration"]) == pytest.approx(
+        float(reference["format"]["duration"]), abs=0.05
+    )
+    for ours, theirs in zip(native["streams"], reference["streams"], strict=True):
+        assert {f: ours.get(f) for f in _STREAM_FIELDS} == {
+            f: theirs.get(f) for f in _STREAM_FIELDS
+        }
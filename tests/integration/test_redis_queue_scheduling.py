@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import os
+import time
+import uuid
+from collections.abc import Iterator
+
+import pytest
+import redis
+from redis.crc import key_slot
+
+from edvmp.shared.queue import QueueMessage, RedisQueue
+
+
+@pytest.fixture
+def client() -> Iterator[redis.Redis]:
+    # The scheduler is Lua inside Redis, so these tests need a real server (make up).
+    r = redis.Redis.from_url(os.environ.get("REDIS_URL", "redis://localhost:6379/0"))
+    try:
+        r.ping()
+    except redis.ConnectionError:
+        pytest.skip("Redis is not reachable")
+    yield r
+    r.close()
+
+
+@pytest.fixture
+def queue_name(client: redis.Redis) -> Iterator[str]:
+    name = f"test-jobs-{uuid.uuid4().hex[:8]}"
+    yield name
+    keys = [*client.scan_iter(name), *client.scan_iter(f"{{{name}}}:*")]
+    if keys:
+        client.delete(*keys)
+
+
+def _msg(job_id: str, *, priority: str, submitter: str, size: int = 0) -> QueueMessage:
+    payload = {"job_id": job_id, "priority": priority, "submitter": submitter, "size": size}
+    return QueueMessage(message_type="ProcessVideo", payload=payload)
+
+
+def _drain(queue: RedisQueue) -> list[str]:
+    out = []
+    while (msg := queue.dequeue_blocking(timeout_s=0)) is not None:
+        out.append(msg.payload["job_id"])
+    return out
+
+
+def test_interactive_jobs_overtake_a_bulk_backlog(client: redis.Redis, queue_name: str) -> None:
+    queue = RedisQueue(client, queue_name, class_weights={"interactive": 4, "bulk": 1})
+    queue.enqueue_many([_msg(f"b{i}", priority="bulk", submitter="bot") for i in range(10)])
+    queue.enqueue_many([_msg(f"i{i}", priority="interactive", submitter="ann") for i in range(4)])
+
+    order = _drain(queue)
+
+    # Bulk keeps a 1-in-5 share instead of being starved, and interactive never waits behind it.
+    assert order[:6] == ["b0", "i0", "i1", "i2", "i3", "b1"]
+    assert sorted(order) == sorted([f"b{i}" for i in range(10)] + [f"i{i}" for i in range(4)])
+
+
+def test_submitters_share_a_class_by_weight(client: redis.Redis, queue_name: str) -> None:
+    queue = RedisQueue(client, queue_name, submitter_weights={"bot": 0.5})
+    queue.enqueue_many([_msg(f"bot{i}", priority="bulk", submitter="bot") for i in range(20)])
+    queue.enqueue_many([_msg(f"ann{i}", priority="bulk", submitter="ann") for i in range(4)])
+
+    order = _drain(queue)
+
+    # ann arrived last with 20 bot jobs ahead, yet gets two turns for each of bot's.
+    assert order[:7] == ["ann0", "bot0", "ann1", "ann2", "bot1", "ann3", "bot2"]
+
+
+def test_small_files_overtake_a_large_one_queued_just_before(
+    client: redis.Redis, queue_name: str
+) -> None:
+    queue = RedisQueue(client, queue_name, size_penalty_s_per_gib=60)
+    queue.enqueue(_msg("huge", priority="standard", submitter="ann", size=20 * 2**30))
+    queue.enqueue(_msg("small", priority="standard", submitter="ann", size=2**20))
+
+    assert _drain(queue) == ["small", "huge"]
+
+
+def test_every_queue_key_shares_one_cluster_slot(client: redis.Redis, queue_name: str) -> None:
+    queue = RedisQueue(client, queue_name, lease_s=60)
+    queue.enqueue_many([_msg(f"a{i}", priority="bulk", submitter="ann") for i in range(2)])
+    queue.enqueue_delayed(_msg("b", priority="bulk", submitter="bot"), delay_s=60)
+    assert queue.receive(timeout_s=0) is not None
+
+    keys = [queue_name.encode(), *client.scan_iter(f"{{{queue_name}}}:*")]
+    assert f"{{{queue_name}}}:c:bulk:s:ann".encode() in keys
+    assert {key_slot(k) for k in keys} == {key_slot(queue_name.encode())}
+
+
+def test_legacy_list_is_drained_first_and_blocking_dequeue_times_out(
+    client: redis.Redis, queue_name: str
+) -> None:
+    queue = RedisQueue(client, queue_name)
+    client.rpush(queue_name, QueueMessage("ProcessVideo", {"job_id": "old"}).to_json())
+    queue.enqueue(_msg("new", priority="interactive", submitter="ann"))
+
+    assert _drain(queue) == ["old", "new"]
+    assert queue.dequeue_blocking(timeout_s=0) is None
+
+
+def test_unacked_lease_is_redelivered_and_acked_lease_is_not(
+    client: redis.Redis, queue_name: str
+) -> None:
+    queue = RedisQueue(client, queue_name, lease_s=0.05)
+    queue.enqueue_many([_msg(f"j{i}", priority="standard", submitter="ann") for i in range(3)])
+    client.rpush(queue_name, QueueMessage("ProcessVideo", {"job_id": "old"}).to_json())
+
+    leased = [queue.receive(timeout_s=0) for _ in range(4)]
+    assert [r.message.payload["job_id"] for r in leased if r] == ["old", "j0", "j1", "j2"]
+    assert queue.receive(timeout_s=0) is None
+
+    # The worker holding j1 dies; the others finish.
+    queue.ack_batch([r.lease_id for r in leased if r and r.message.payload["job_id"] != "j1"])
+    time.sleep(0.1)
+    assert queue.requeue_expired().requeued == 1
+
+    again = queue.receive(timeout_s=0)
+    assert again is not None and again.message.payload["job_id"] == "j1"
+    assert queue.receive(timeout_s=0) is None
+
+
+def test_message_is_dead_lettered_after_max_deliveries(
+    client: redis.Redis, queue_name: str
+) -> None:
+    queue = RedisQueue(client, queue_name, lease_s=0.05, max_deliveries=2)
+    queue.enqueue(_msg("crashes", priority="standard", submitter="ann"))
+
+    for expected in ([], ["crashes"]):
+        assert queue.receive(timeout_s=0) is not None
+        time.sleep(0.1)
+        reaped = queue.requeue_expired()
+        assert [m.payload["job_id"] for m in reaped.dead_lettered] == expected
+
+    assert queue.receive(timeout_s=0) is None
+    assert not client.exists(f"{{{queue_name}}}:deliveries")
+
+
+def test_extended_lease_survives_the_reaper(client: redis.Redis, queue_name: str) -> None:
+    queue = RedisQueue(client, queue_name, lease_s=0.2)
+    queue.enqueue(_msg("slow", priority="standard", submitter="ann"))
+    held = queue.receive(timeout_s=0)
+    assert held is not None
+
+    time.sleep(0.12)
+    assert queue.extend_batch([held.lease_id]) == []
+    time.sleep(0.12)
+    assert queue.requeue_expired().requeued == 0
+
+    time.sleep(0.1)
+    assert queue.requeue_expired().requeued == 1
+    assert queue.extend_batch([held.lease_id]) == [held.lease_id]
+
+
+def test_delayed_retry_waits_until_due_then_keeps_its_class(
+    client: redis.Redis, queue_name: str
+) -> None:
+    queue = RedisQueue(client, queue_name)
+    queue.enqueue_delayed(_msg("retry", priority="interactive", submitter="ann"), delay_s=0.2)
+    queue.enqueue(_msg("fresh", priority="bulk", submitter="bot"))
+
+    assert _drain(queue) == ["fresh"]
+    time.sleep(0.25)
+    retried = queue.receive(timeout_s=0)
+    assert retried is not None and retried.message.payload["job_id"] == "retry"
+    assert queue.receive(timeout_s=0) is None
+
+
+def test_delayed_retry_is_due_by_the_redis_clock_not_the_workers(
+    client: redis.Redis, queue_name: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    queue = RedisQueue(client, queue_name)
+    skewed = time.time() + 3600
+    monkeypatch.setattr("edvmp.shared.queue.time.time", lambda: skewed)
+    queue.enqueue_delayed(_msg("retry", priority="standard", submitter="ann"), delay_s=0.1)
+
+    time.sleep(0.15)
+    retried = queue.receive(timeout_s=0)
+    assert retried is not None and retried.message.payload["job_id"] == "retry"
@@ -3,7 +3,13 @@ from __future__ import annotations
 import boto3
 from botocore.stub import Stubber
 
-from edvmp.shared.s3 import ensure_bucket_exists
+from edvmp.shared.s3 import (
+    complete_multipart_upload,
+    create_multipart_upload,
+    ensure_bucket_exists,
+    plan_multipart,
+    presign_upload_part_urls,
+)
 
 
 def test_ensure_bucket_exists_creates_on_missing() -> None:
@@ -19,3 +25,45 @@ def test_ensure_bucket_exists_creates_on_missing() -> None:
     with stubber:
         ensure_bucket_exists(s3, "b")
 
+
+def test_plan_multipart_respects_s3_part_limits() -> None:
+    mib = 1024 * 1024
+    assert plan_multipart(50 * 1024 * mib, 64 * mib) == (64 * mib, 800)
+    assert plan_multipart(3 * mib, 1 * mib) == (5 * mib, 1)
+    part_size, parts = plan_multipart(1024 * 1024 * mib, 64 * mib)  # 1 TiB
+    assert parts <= 10_000
+    assert part_size * parts >= 1024 * 1024 * mib
+
+
+def test_multipart_round_trip_presigns_locally_and_sorts_parts() -> None:
+    s3 = boto3.client(
+        "s3",
+        region_name="us-east-1",
+        aws_access_key_id="x",
+        aws_secret_access_key="y",
+    )
+    stubber = Stubber(s3)
+    stubber.add_response(
+        "create_multipart_upload",
+        {"UploadId": "u1"},
+        {"Bucket": "b", "Key": "k", "ContentType": "video/mp4"},
+    )
+    stubber.add_response(
+        "complete_multipart_upload",
+        {"ETag": '"abc-2"'},
+        {
+            "Bucket": "b",
+            "Key": "k",
+            "UploadId": "u1",
+            "MultipartUpload": {
+                "Parts": [{"PartNumber": 1, "ETag": "e1"}, {"PartNumber": 2, "ETag": "e2"}]
+            },
+        },
+    )
+    with stubber:
+        upload_id = create_multipart_upload(s3, "b", "k", "video/mp4")
+        urls = presign_upload_part_urls(s3, "b", "k", upload_id, [1, 2])
+        etag = complete_multipart_upload(s3, "b", "k", upload_id, [(2, "e2"), (1, "e1")])
+    assert all("uploadId=u1" in u for u in urls)
+    assert "partNumber=2" in urls[1]
+    assert etag == '"abc-2"'
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from botocore.stub import ANY, Stubber
+
+from edvmp.shared.aws_sqs_queue import SqsDlq, SqsInFlight, SqsQueue
+from edvmp.shared.queue import QueueMessage
+from edvmp.worker.main import _poll
+
+QUEUE_URL = "https://sqs.us-east-1.amazonaws.com/123456789012/jobs"
+
+
+def _messages(start: int, count: int) -> list[dict]:
+    return [
+        {
+            "MessageId": f"m{i}",
+            "ReceiptHandle": f"rh{i}",
+            "Body": QueueMessage(message_type="DLQ", payload={"job_id": f"j{i}"}).to_json(),
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def _count_calls(client) -> list[str]:
+    calls: list[str] = []
+    client.meta.events.register(
+        "provide-client-params.sqs.*", lambda params, model, **_: calls.append(model.name)
+    )
+    return calls
+
+
+def test_dlq_drain_uses_full_batches() -> None:
+    dlq = SqsDlq(region_name="us-east-1", queue_url=QUEUE_URL)
+    calls = _count_calls(dlq._sqs)
+    stubber = Stubber(dlq._sqs)
+    batches = [_messages(0, 10), _messages(10, 10), _messages(20, 5), []]
+    for batch in batches:
+        stubber.add_response("receive_message", {"Messages": batch} if batch else {})
+        if batch:
+            stubber.add_response(
+                "delete_message_batch",
+                {"Successful": [{"Id": str(i)} for i in range(len(batch))], "Failed": []},
+                expected_params={
+                    "QueueUrl": QUEUE_URL,
+                    "Entries": [
+                        {"Id": str(i), "ReceiptHandle": m["ReceiptHandle"]}
+                        for i, m in enumerate(batch)
+                    ],
+                },
+            )
+
+    with stubber:
+        items = dlq.drain(max_items=1000)
+        stubber.assert_no_pending_responses()
+
+    assert [i["job_id"] for i in items] == [f"j{i}" for i in range(25)]
+    # 4 receives + 3 batch deletes, versus 25 receives + 25 deletes one message at a time.
+    assert calls.count("ReceiveMessage") == 4
+    assert calls.count("DeleteMessageBatch") == 3
+    assert len(calls) == 7
+
+
+def test_inflight_acks_flush_as_one_batch_delete() -> None:
+    queue = SqsQueue(region_name="us-east-1", queue_url=QUEUE_URL)
+    stubber = Stubber(queue._sqs)
+    handles = [f"rh{i}" for i in range(10)]
+    stubber.add_response(
+        "delete_message_batch",
+        {"Successful": [{"Id": str(i)} for i in range(10)], "Failed": []},
+        expected_params={"QueueUrl": QUEUE_URL, "Entries": ANY},
+    )
+
+    with stubber:
+        inflight = SqsInFlight(queue, visibility_timeout_s=300, flush_interval_s=60)
+        for h in handles:
+            inflight.track(h)
+            inflight.ack(h)
+        inflight.close()
+        stubber.assert_no_pending_responses()
+
+
+def test_poll_leaves_unknown_messages_to_the_visibility_timeout() -> None:
+    queue = SqsQueue(region_name="us-east-1", queue_url=QUEUE_URL)
+    stubber = Stubber(queue._sqs)
+    job = QueueMessage(message_type="ProcessVideo", payload={"job_id": "j1"})
+    stubber.add_response(
+        "receive_message",
+        {
+            "Messages": [
+                *_messages(0, 1),
+                {"MessageId": "m1", "ReceiptHandle": "rh1", "Body": job.to_json()},
+            ]
+        },
+    )
+
+    with stubber:
+        inflight = SqsInFlight(queue, visibility_timeout_s=300, flush_interval_s=60)
+        polled = _poll(queue, capacity=2, inflight=inflight)
+        # Only the job is tracked; the unknown message's lease is never extended.
+        assert [msg for msg, _ in polled] == [job]
+        assert list(inflight._leases) == ["rh1"]
+        inflight.close()
+
+
+def test_send_batch_chunks_by_ten() -> None:
+    queue = SqsQueue(region_name="us-east-1", queue_url=QUEUE_URL)
+    stubber = Stubber(queue._sqs)
+    for size in (10, 10, 3):
+        stubber.add_response(
+            "send_message_batch",
+            {
+                "Successful": [
+                    {"Id": str(i), "MessageId": "x", "MD5OfMessageBody": "x"} for i in range(size)
+                ],
+                "Failed": [],
+            },
+            expected_params={"QueueUrl": QUEUE_URL, "Entries": ANY},
+        )
+
+    with stubber:
+        queue.enqueue_batch(
+            [
+                QueueMessage(message_type="ProcessVideo", payload={"job_id": str(i)})
+                for i in range(23)
+            ]
+        )
+        stubber.assert_no_pending_responses()
+
+
+def test_delayed_retry_keeps_its_submitters_message_group() -> None:
+    queue = SqsQueue(region_name="us-east-1", queue_url=QUEUE_URL)
+    stubber = Stubber(queue._sqs)
+    retry = QueueMessage("ProcessVideo", {"job_id": "j1", "submitter": "ann", "attempt": 1})
+    stubber.add_response(
+        "send_message",
+        {"MessageId": "x", "MD5OfMessageBody": "x"},
+        {
+            "QueueUrl": QUEUE_URL,
+            "MessageBody": retry.to_json(),
+            "DelaySeconds": 30,
+            "MessageGroupId": "ann",
+        },
+    )
+    stubber.add_response(
+        "send_message",
+        {"MessageId": "y", "MD5OfMessageBody": "y"},
+        {"QueueUrl": QUEUE_URL, "MessageBody": ANY, "DelaySeconds": 30},
+    )
+
+    with stubber:
+        queue.enqueue_delayed(retry, 30)
+        queue.enqueue_delayed(QueueMessage("ProcessVideo", {"job_id": "j2"}), 30)
+        stubber.assert_no_pending_responses()
+
+
+def test_failed_lease_extension_is_counted_and_retried() -> None:
+    from edvmp.shared.metrics import queue_lease_extensions_failed_total
+
+    queue = SqsQueue(region_name="us-east-1", queue_url=QUEUE_URL)
+    stubber = Stubber(queue._sqs)
+    stubber.add_client_error(
+        "change_message_visibility_batch", service_error_code="AccessDenied", http_status_code=403
+    )
+    stubber.add_response(
+        "change_message_visibility_batch",
+        {"Successful": [{"Id": "0"}], "Failed": []},
+        expected_params={"QueueUrl": QUEUE_URL, "Entries": ANY},
+    )
+    before = queue_lease_extensions_failed_total._value.get()
+
+    with stubber:
+        inflight = SqsInFlight(queue, visibility_timeout_s=0, flush_interval_s=60)
+        inflight.track("rh0")
+        inflight._extend_leases()
+        assert queue_lease_extensions_failed_total._value.get() == before + 1
+        # The lease stays due, so the next tick tries again.
+        inflight._extend_leases()
+        inflight.close()
+        stubber.assert_no_pending_responses()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from edvmp.api import main as api_main
+
+
+@pytest.fixture(scope="session")
+def db_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return tmp_path_factory.mktemp("api") / "app.db"
+
+
+class FakeEventsRedis:
+    """An events stream whose ``entries`` are published just before the next XREAD.
+
+    So they always land after the fan-out resolved its start id, like events for
+    a job that completes while its client is watching.
+    """
+
+    def __init__(self) -> None:
+        self.entries: list[dict[str, Any]] = []
+        self._log: list[tuple[int, dict[str, Any]]] = []
+
+    async def xrevrange(self, name: str, max: str, min: str, count: int):
+        if not self._log:
+            return []
+        seq, event = self._log[-1]
+        return [(f"{seq}-0".encode(), {b"event": json.dumps(event).encode()})]
+
+    async def xread(self, streams: dict[str, str], count: int, block: int):
+        batch, self.entries = self.entries, []
+        self._log.extend((len(self._log) + 1 + i, event) for i, event in enumerate(batch))
+        after = int(next(iter(streams.values())).split("-")[0])
+        out = [
+            (f"{seq}-0".encode(), {b"event": json.dumps(event).encode()})
+            for seq, event in self._log
+            if seq > after
+        ][:count]
+        if not out:
+            await asyncio.sleep(0.01)
+            return []
+        return [(b"events", out)]
+
+    async def aclose(self) -> None:
+        return None
+
+
+@pytest.fixture(scope="session")
+def events_redis() -> FakeEventsRedis:
+    return FakeEventsRedis()
+
+
+@pytest.fixture(scope="session")
+def client(db_path: Path, events_redis: FakeEventsRedis) -> Iterator[TestClient]:
+    # One app per session: create_app registers the API metrics in the global registry.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("DB_PATH", str(db_path))
+        mp.setenv("STORE_BACKEND", "sqlite")
+        mp.setenv("API_BATCH_MAX_JOBS", "50")
+        mp.setenv("AWS_ACCESS_KEY_ID", "test")
+        mp.setenv("AWS_SECRET_ACCESS_KEY", "test")
+        mp.setenv("QUEUE_BACKEND", "redis")
+        mp.setenv("API_SSE_HEARTBEAT_S", "0.05")
+        mp.setattr(api_main, "ensure_bucket_exists", lambda *_: None)
+        mp.setattr(api_main.redis.asyncio.Redis, "from_url", lambda *_, **__: events_redis)
+        with TestClient(api_main.create_app()) as client:
+            token = client.post("/auth/login", json={"username": "demo", "password": "demo"}).json()
+            client.headers["Authorization"] = f"Bearer {token['access_token']}"
+            yield client
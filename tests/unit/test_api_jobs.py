@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from botocore.exceptions import ClientError
+from fastapi.testclient import TestClient
+
+from edvmp.api import main as api_main
+from edvmp.shared.store import LocalSqliteStore
+
+
+def test_multipart_upload_lifecycle(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(api_main, "create_multipart_upload", lambda *_: "upload-1")
+
+    def missing_upload(*_):
+        raise ClientError({"Error": {"Code": "NoSuchUpload"}}, "CompleteMultipartUpload")
+
+    monkeypatch.setattr(api_main, "complete_multipart_upload", missing_upload)
+    monkeypatch.setattr(api_main, "abort_multipart_upload", lambda *_: None)
+
+    mib = 1024 * 1024
+    res = client.post(
+        "/jobs:multipart",
+        json={"filename": "master.mov", "size_bytes": 200 * mib, "part_size_bytes": 64 * mib},
+    )
+    assert res.status_code == 200
+    body = res.json()
+    assert body["upload_id"] == "upload-1"
+    assert [p["part_number"] for p in body["parts"]] == [1, 2, 3, 4]
+    assert all("uploadId=upload-1" in p["url"] for p in body["parts"])
+
+    job_id = body["job_id"]
+    resumed = client.post(
+        f"/jobs/{job_id}/multipart:presign", json={"upload_id": "upload-1", "part_numbers": [3]}
+    )
+    assert [p["part_number"] for p in resumed.json()["parts"]] == [3]
+
+    done = client.post(
+        f"/jobs/{job_id}/multipart:complete",
+        json={"upload_id": "upload-1", "parts": [{"part_number": 1, "etag": "e1"}]},
+    )
+    assert done.status_code == 404
+
+    aborted = client.post(f"/jobs/{job_id}/multipart:abort", json={"upload_id": "upload-1"})
+    assert aborted.status_code == 200
+    job = client.get(f"/jobs/{job_id}").json()
+    assert (job["status"], job["error_code"]) == ("FAILED", "upload_aborted")
+
+    for action, body in [
+        ("presign", {"upload_id": "upload-1", "part_numbers": [1]}),
+        ("complete", {"upload_id": "upload-1", "parts": [{"part_number": 1, "etag": "e1"}]}),
+        ("abort", {"upload_id": "upload-1"}),
+    ]:
+        assert client.post(f"/jobs/{job_id}/multipart:{action}", json=body).status_code == 409
+
+
+def test_unexpected_multipart_errors_map_to_bad_gateway(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def throttled(*_):
+        raise ClientError({"Error": {"Code": "SlowDown"}}, "AbortMultipartUpload")
+
+    monkeypatch.setattr(api_main, "abort_multipart_upload", throttled)
+    job_id = client.post("/jobs", json={"filename": "clip.mp4"}).json()["job_id"]
+
+    res = client.post(f"/jobs/{job_id}/multipart:abort", json={"upload_id": "u"})
+    assert res.status_code == 502
+    assert client.get(f"/jobs/{job_id}").json()["status"] == "AWAITING_UPLOAD"
+
+
+def test_job_events_pushes_snapshot_then_completion(client: TestClient, events_redis: Any) -> None:
+    job_id = client.post("/jobs", json={"filename": "clip.mp4"}).json()["job_id"]
+    events_redis.entries.extend(
+        [
+            {"event_type": "JobCompleted", "job_id": "someone-else", "status": "FAILED"},
+            {"event_type": "JobCompleted", "job_id": job_id, "status": "SUCCEEDED"},
+        ]
+    )
+
+    with client.stream("GET", f"/jobs/{job_id}/events") as res:
+        assert res.headers["content-type"].startswith("text/event-stream")
+        data = [json.loads(line[6:]) for line in res.iter_lines() if line.startswith("data: ")]
+
+    assert [(d["job_id"], d["status"]) for d in data] == [
+        (job_id, "AWAITING_UPLOAD"),
+        (job_id, "SUCCEEDED"),
+    ]
+    assert data[1].keys() == data[0].keys()
+    assert client.get("/jobs/missing/events").status_code == 404
+
+
+def test_job_lookup_supports_etag_revalidation(client: TestClient) -> None:
+    job_id = client.post("/jobs", json={"filename": "clip.mp4"}).json()["job_id"]
+
+    first = client.get(f"/jobs/{job_id}")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    again = client.get(f"/jobs/{job_id}", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert client.get(f"/jobs/{job_id}", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_search_returns_matching_results(client: TestClient, db_path: Path) -> None:
+    store = LocalSqliteStore(str(db_path))
+    video = {"codec_type": "video", "codec_name": "hevc", "width": 3840, "height": 2160}
+    store.store_result(
+        job_id="search-4k",
+        metadata={"format": {"duration": "900"}, "streams": [video]},
+        summary="s",
+    )
+    store.close()
+
+    res = client.get("/search", params={"video_codec": "HEVC", "min_height": 2160})
+    assert res.status_code == 200
+    assert [hit["job_id"] for hit in res.json()["items"]] == ["search-4k"]
+    assert client.get("/search", params={"min_duration_s": 901}).json()["items"] == []
+    assert client.get("/search", params={"cursor": "%%%"}).status_code == 400
+
+
+def test_history_rows_match_job_records_in_json_and_ndjson(client: TestClient) -> None:
+    job_id = client.post("/jobs", json={"filename": "clip.mp4"}).json()["job_id"]
+
+    page = client.get("/history", params={"limit": 2}).json()
+    assert page["items"][0] == client.get(f"/jobs/{job_id}").json()
+    assert page["next_cursor"] is not None
+
+    res = client.get("/history", params={"limit": 2}, headers={"Accept": "application/x-ndjson"})
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line) for line in res.iter_lines()] == page["items"]
+    assert res.headers["x-next-cursor"] == page["next_cursor"]
+
+
+def test_full_result_streams_stored_payload(client: TestClient, db_path: Path) -> None:
+    metadata = {"format": {"duration": "5"}, "streams": [{"index": i} for i in range(20_000)]}
+    store = LocalSqliteStore(str(db_path))
+    store.store_result(job_id="full-payload", metadata=metadata, summary="s")
+    store.close()
+
+    res = client.get("/jobs/full-payload/result", params={"full": "true"})
+    assert res.status_code == 200
+    body = res.json()
+    assert body["metadata"] == metadata
+    assert body["projection"]["duration_s"] == 5.0
+    assert client.get("/jobs/full-payload/result").json()["metadata"] is None
+
+    cached = client.get(
+        "/jobs/full-payload/result",
+        params={"full": "true"},
+        headers={"If-None-Match": res.headers["etag"]},
+    )
+    assert cached.status_code == 304
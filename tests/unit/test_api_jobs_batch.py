@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from edvmp.shared.store import LocalSqliteStore
+
+
+def test_batch_creates_every_job_with_its_own_upload_url(client: TestClient, db_path: Path) -> None:
+    res = client.post("/jobs:batch", json={"jobs": [{"filename": f"v{i}.mp4"} for i in range(40)]})
+    assert res.status_code == 200
+    items = res.json()["items"]
+    assert len(items) == 40
+    assert len({i["upload_url"] for i in items}) == 40
+    assert all(i["s3_key"] == f"uploads/{i['job_id']}/v{n}.mp4" for n, i in enumerate(items))
+
+    store = LocalSqliteStore(str(db_path))
+    assert all(store.get_job(i["job_id"]) is not None for i in items)
+    store.close()
+
+
+def test_jobs_record_priority_and_submitter(client: TestClient, db_path: Path) -> None:
+    single = client.post("/jobs", json={"filename": "a.mp4"}).json()
+    batch = client.post(
+        "/jobs:batch",
+        json={"jobs": [{"filename": "b.mp4"}, {"filename": "c.mp4", "priority": "standard"}]},
+    ).json()["items"]
+
+    store = LocalSqliteStore(str(db_path))
+    jobs = [store.get_job(j["job_id"]) for j in [single, *batch]]
+    store.close()
+    assert [j.priority for j in jobs if j] == ["interactive", "bulk", "standard"]
+    assert {j.submitter for j in jobs if j} == {"demo"}
+
+
+def test_batch_rejects_oversized_requests(client: TestClient) -> None:
+    res = client.post("/jobs:batch", json={"jobs": [{"filename": "v.mp4"}] * 51})
+    assert res.status_code == 422
+    assert client.post("/jobs:batch", json={"jobs": []}).status_code == 422
+
+
+def test_partially_created_batch_returns_the_jobs_that_exist(
+    client: TestClient, db_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    create_jobs = LocalSqliteStore.create_jobs
+
+    def fail_after_first_group(self, **kwargs):
+        if kwargs["priority"] != "bulk":
+            raise RuntimeError("throttled")
+        create_jobs(self, **kwargs)
+
+    monkeypatch.setattr(LocalSqliteStore, "create_jobs", fail_after_first_group)
+    res = client.post(
+        "/jobs:batch",
+        json={"jobs": [{"filename": "a.mp4"}, {"filename": "b.mp4", "priority": "standard"}]},
+    )
+
+    assert res.status_code == 503
+    items = res.json()["detail"]["items"]
+    assert [i["s3_key"].rsplit("/", 1)[-1] for i in items] == ["a.mp4"]
+    store = LocalSqliteStore(str(db_path))
+    assert store.get_job(items[0]["job_id"]) is not None
+    store.close()
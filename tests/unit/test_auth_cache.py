@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import time
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from edvmp.api import auth
+from edvmp.api.auth import TokenVerifier, issue_token
+from edvmp.shared.config import Settings
+
+
+@pytest.fixture()
+def decodes(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+    real_decode = jwt.decode
+
+    def counting_decode(token, *args, **kwargs):
+        calls.append(token)
+        return real_decode(token, *args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", counting_decode)
+    return calls
+
+
+def test_repeated_token_skips_decode_until_exp(
+    decodes: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings = Settings()
+    verifier = TokenVerifier(settings, max_entries=100, cache_ttl_s=300)
+    token = issue_token(settings, subject="alice", ttl_seconds=30).access_token
+
+    assert [verifier.verify(token) for _ in range(5)] == ["alice"] * 5
+    assert len(decodes) == 1
+
+    # The entry lives only until the token's own exp (30s), not the 300s cap.
+    now = time.monotonic()
+    monkeypatch.setattr("edvmp.shared.cache.time.monotonic", lambda: now + 31)
+    verifier.verify(token)
+    assert len(decodes) == 2
+
+
+def test_rejected_tokens_are_never_cached(decodes: list[str]) -> None:
+    settings = Settings()
+    verifier = TokenVerifier(settings, max_entries=100, cache_ttl_s=300)
+    forged = jwt.encode({"sub": "mallory", "iss": settings.jwt_issuer}, "wrong", algorithm="HS256")
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc:
+            verifier.verify(forged)
+        assert exc.value.status_code == 401
+    assert len(decodes) == 2
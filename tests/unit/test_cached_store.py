@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from edvmp.shared.cached_store import CachedStore
+from edvmp.shared.models import JobStatus
+from edvmp.shared.store import LocalSqliteStore
+
+
+class CountingStore(LocalSqliteStore):
+    def __init__(self, db_path: str):
+        super().__init__(db_path)
+        self.reads = 0
+
+    def get_job(self, job_id: str):
+        self.reads += 1
+        return super().get_job(job_id)
+
+    def get_result(self, job_id: str, *, full: bool = False):
+        self.reads += 1
+        return super().get_result(job_id, full=full)
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+        self.expires_at: dict[str, float] = {}
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    def get(self, key: str):
+        if self.expires_at.get(key, 0) <= time.monotonic():
+            self.delete(key)
+        return self.data.get(key)
+
+    def pttl(self, key: str) -> int:
+        if self.get(key) is None:
+            return -2
+        return int((self.expires_at[key] - time.monotonic()) * 1000)
+
+    def set(self, key: str, value: str, px: int) -> None:
+        self.data[key] = value
+        self.expires_at[key] = time.monotonic() + px / 1000
+
+    def delete(self, key: str) -> None:
+        self.data.pop(key, None)
+        self.expires_at.pop(key, None)
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis) -> None:
+        self._redis = redis
+        self._calls: list[tuple[str, str]] = []
+
+    def get(self, key: str) -> None:
+        self._calls.append(("get", key))
+
+    def pttl(self, key: str) -> None:
+        self._calls.append(("pttl", key))
+
+    def execute(self) -> list:
+        return [getattr(self._redis, name)(key) for name, key in self._calls]
+
+
+@pytest.fixture()
+def backend(tmp_path: Path) -> CountingStore:
+    store = CountingStore(str(tmp_path / "app.db"))
+    store.create_job_if_missing(job_id="j1", bucket="b", key="k", status=JobStatus.submitted)
+    return store
+
+
+def test_terminal_records_and_results_are_served_from_memory(backend: CountingStore) -> None:
+    cached = CachedStore(backend, max_entries=100, active_ttl_s=0)
+
+    cached.get_job("j1")
+    cached.get_job("j1")
+    assert backend.reads == 2  # in-flight records are not kept with active_ttl_s=0
+
+    cached.store_result(job_id="j1", metadata={"format": {"duration": "1.0"}}, summary="s")
+    cached.update_job(job_id="j1", status=JobStatus.succeeded)
+    backend.reads = 0
+    for _ in range(3):
+        assert cached.get_job("j1").status == JobStatus.succeeded
+        assert cached.get_result("j1").summary == "s"
+    assert backend.reads == 2
+
+
+def test_writes_invalidate_both_tiers_and_replicas_share_redis(backend: CountingStore) -> None:
+    redis_tier = FakeRedis()
+    api_a = CachedStore(backend, max_entries=100, active_ttl_s=60, redis_client=redis_tier)
+    api_b = CachedStore(backend, max_entries=100, active_ttl_s=60, redis_client=redis_tier)
+
+    assert api_a.get_job("j1").status == JobStatus.submitted
+    backend.reads = 0
+    assert api_b.get_job("j1").status == JobStatus.submitted
+    assert backend.reads == 0  # answered by the shared Redis tier
+
+    api_a.update_job(job_id="j1", status=JobStatus.failed, error_code="E")
+    assert api_a.get_job("j1").status == JobStatus.failed
+    assert "store-cache:v2:job:j1" in redis_tier.data
+    # Passthrough for everything the cache does not wrap.
+    assert [j.job_id for j in api_a.list_jobs(limit=5)] == ["j1"]
+
+
+def test_unreadable_redis_entries_are_misses(backend: CountingStore) -> None:
+    redis_tier = FakeRedis()
+    redis_tier.set("store-cache:v2:job:j1", '{"job_id": "j1", "status": "RETIRED"}', px=60_000)
+    cached = CachedStore(backend, max_entries=100, active_ttl_s=60, redis_client=redis_tier)
+
+    assert cached.get_job("j1").status == JobStatus.submitted
+    assert backend.reads == 1
+
+
+def test_terminal_entries_expire_when_another_process_rewrites_them(
+    backend: CountingStore, tmp_path: Path
+) -> None:
+    redis_tier = FakeRedis()
+    api_a = CachedStore(
+        backend, max_entries=100, active_ttl_s=0, terminal_ttl_s=0.2, redis_client=redis_tier
+    )
+    api_b = CachedStore(
+        backend, max_entries=100, active_ttl_s=0, terminal_ttl_s=0.2, redis_client=redis_tier
+    )
+    backend.update_job(job_id="j1", status=JobStatus.failed, error_code="E")
+    assert api_a.get_job("j1").status == JobStatus.failed
+
+    time.sleep(0.1)
+    # api_b copies the Redis entry with its remaining TTL, not a fresh one.
+    assert api_b.get_job("j1").status == JobStatus.failed
+    # A reprocess run by a worker writes behind both caches.
+    LocalSqliteStore(str(tmp_path / "app.db")).update_job(job_id="j1", status=JobStatus.succeeded)
+
+    time.sleep(0.15)
+    assert api_a.get_job("j1").status == JobStatus.succeeded
+    assert api_b.get_job("j1").status == JobStatus.succeeded
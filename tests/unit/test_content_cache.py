@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from edvmp.shared.config import Settings
+from edvmp.shared.content_cache import CachedAnalysis, SqliteContentCache, content_key
+from edvmp.shared.metrics import content_cache_requests_total
+from edvmp.shared.models import JobStatus
+from edvmp.shared.queue import QueueMessage
+from edvmp.shared.store import LocalSqliteStore
+from edvmp.worker.main import JobState, WorkerContext, build_pipeline
+
+ANALYSIS = CachedAnalysis(metadata={"format": {"duration": "3.0"}}, summary="cached summary")
+
+
+def _hits(result: str) -> float:
+    return content_cache_requests_total.labels(result=result)._value.get()
+
+
+def test_content_key_requires_etag_and_size() -> None:
+    assert content_key(etag='"abc"', size=10) == "abc:10"
+    assert content_key(etag=None, size=10) is None
+    assert content_key(etag="abc", size=None) is None
+
+
+def test_sqlite_cache_hit_miss_ttl_and_lru_eviction(tmp_path: Path) -> None:
+    cache = SqliteContentCache(str(tmp_path / "app.db"), ttl_s=60, max_entries=2)
+    hits, misses = _hits("hit"), _hits("miss")
+
+    assert cache.get("a:1") is None
+    cache.put("a:1", ANALYSIS)
+    assert cache.get("a:1") == ANALYSIS
+    assert (_hits("hit") - hits, _hits("miss") - misses) == (1, 1)
+
+    time.sleep(0.01)
+    cache.put("b:1", ANALYSIS)
+    time.sleep(0.01)
+    cache.get("a:1")  # a is now more recently used than b
+    time.sleep(0.01)
+    cache.put("c:1", ANALYSIS)
+    assert cache.get("b:1") is None
+    assert cache.get("a:1") is not None and cache.get("c:1") is not None
+
+    expired = SqliteContentCache(str(tmp_path / "app.db"), ttl_s=-1, max_entries=10)
+    expired.put("d:1", ANALYSIS)
+    assert expired.get("d:1") is None
+
+
+def test_worker_skips_download_probe_and_summary_on_cache_hit(tmp_path: Path) -> None:
+    store = LocalSqliteStore(str(tmp_path / "app.db"))
+    store.create_job_if_missing(
+        job_id="j2", bucket="videos", key="uploads/j2/a.mp4", status=JobStatus.submitted
+    )
+    cache = SqliteContentCache(str(tmp_path / "app.db"), ttl_s=60, max_entries=10)
+    cache.put("abc:10", ANALYSIS)
+
+    def unexpected(*_: object, **__: object) -> dict:
+        pytest.fail("cache hit must not touch S3, ffprobe or Bedrock")
+
+    class Untouchable:
+        __getattr__ = unexpected
+
+    ctx = WorkerContext(
+        settings=Settings(APP_ENV="local", EVENTBUS_URL=""),
+        store=store,
+        dlq=Untouchable(),  # type: ignore[arg-type]
+        s3=Untouchable(),
+        bedrock=Untouchable(),  # type: ignore[arg-type]
+        probe=unexpected,
+        eventbus_url="",
+        content_cache=cache,
+    )
+    acked: list[str] = []
+    msg = QueueMessage(
+        message_type="ProcessVideo",
+        payload={
+            "job_id": "j2",
+            "bucket": "videos",
+            "key": "uploads/j2/a.mp4",
+            "size": 10,
+            "etag": '"abc"',
+        },
+    )
+    pipeline = build_pipeline(ctx)
+    pipeline.submit(JobState.from_message(msg, lambda: acked.append("j2")))
+    pipeline.drain()
+
+    assert acked == ["j2"]
+    job = store.get_job("j2")
+    assert job is not None and job.status == JobStatus.succeeded
+    result = store.get_result("j2")
+    assert result is not None and result.summary == "cached summary"
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any
+
+from edvmp.shared.events import EventFanout, RedisEventStream
+
+
+def _entry(message_id: str, event: dict[str, Any]) -> tuple[bytes, dict[bytes, bytes]]:
+    return message_id.encode(), {b"event": json.dumps(event).encode()}
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.autoclaim_calls: list[dict[str, Any]] = []
+        self.autoclaim_results: list[list[Any]] = []
+        self.pending_summary: dict[str, Any] = {
+            "pending": 0,
+            "min": None,
+            "max": None,
+            "consumers": [],
+        }
+        self.consumers: list[dict[str, Any]] = []
+        self.deleted_consumers: list[str] = []
+        self.deliveries: dict[str, int] = {}
+        self.acked: list[str] = []
+        self.lists: dict[str, list[str]] = {}
+        self._results: list[Any] = []
+
+    def pipeline(self, transaction: bool = True) -> FakeRedis:
+        return self
+
+    def execute(self) -> list[Any]:
+        results, self._results = self._results, []
+        return results
+
+    def xpending_range(self, name, groupname, min, max, count):
+        delivered = self.deliveries.get(min, 1)
+        self._results.append([{"message_id": min.encode(), "times_delivered": delivered}])
+
+    def rpush(self, name, value):
+        self.lists.setdefault(name, []).append(value)
+
+    def xack(self, name, groupname, *ids):
+        self.acked.extend(ids)
+
+    def xautoclaim(
+        self, name, groupname, consumername, min_idle_time, start_id="0-0", count=None, justid=False
+    ):
+        self.autoclaim_calls.append(
+            {"consumer": consumername, "min_idle_time": min_idle_time, "start_id": start_id}
+        )
+        return self.autoclaim_results.pop(0)
+
+    def xpending(self, name, groupname):
+        return self.pending_summary
+
+    def xinfo_consumers(self, name, groupname):
+        return self.consumers
+
+    def xgroup_delconsumer(self, name, groupname, consumername):
+        self.deleted_consumers.append(consumername)
+        return 0
+
+
+def test_claim_pending_walks_the_pel_with_a_cursor() -> None:
+    r = FakeRedis()
+    r.autoclaim_results = [
+        [b"5-0", [_entry("1-0", {"event_type": "ObjectCreated"}), (b"2-0", None)], []],
+        [b"0-0", [_entry("5-0", {"event_type": "JobCompleted"})], []],
+    ]
+    stream = RedisEventStream(r, "events")  # type: ignore[arg-type]
+
+    first = stream.claim_pending(group_name="orchestrator", consumer_name="b", min_idle_ms=60_000)
+    second = stream.claim_pending(group_name="orchestrator", consumer_name="b", min_idle_ms=60_000)
+
+    assert first == [("1-0", {"event_type": "ObjectCreated"})]
+    assert second == [("5-0", {"event_type": "JobCompleted"})]
+    assert [c["start_id"] for c in r.autoclaim_calls] == ["0-0", "5-0"]
+    # The trimmed entry cannot be processed; it is acked instead of left pending forever.
+    assert r.acked == ["2-0"]
+
+
+def test_entries_past_max_deliveries_are_dead_lettered() -> None:
+    r = FakeRedis()
+    r.autoclaim_results = [
+        [
+            b"0-0",
+            [_entry("1-0", {"event_type": "ObjectCreated"}), _entry("2-0", {"job_id": "j"})],
+            [],
+        ]
+    ]
+    r.deliveries = {"1-0": 2, "2-0": 6}
+    stream = RedisEventStream(r, "events")  # type: ignore[arg-type]
+
+    claimed = stream.claim_pending(
+        group_name="orchestrator",
+        consumer_name="b",
+        min_idle_ms=0,
+        max_deliveries=5,
+        dlq_name="dlq",
+    )
+
+    assert claimed == [("1-0", {"event_type": "ObjectCreated"})]
+    assert r.acked == ["2-0"]
+    [dead] = [json.loads(raw) for raw in r.lists["dlq"]]
+    assert (dead["job_id"], dead["event_id"], dead["error_code"]) == ("j", "2-0", "poison_event")
+
+
+def test_pending_stats_reports_oldest_entry_age() -> None:
+    r = FakeRedis()
+    created_ms = int((time.time() - 90) * 1000)
+    r.pending_summary = {
+        "pending": 3,
+        "min": f"{created_ms}-0".encode(),
+        "max": b"9-0",
+        "consumers": [],
+    }
+    stats = RedisEventStream(r, "events").pending_stats("orchestrator")  # type: ignore[arg-type]
+
+    assert stats.count == 3
+    assert 89 <= stats.oldest_age_s <= 95
+
+
+def test_only_idle_consumers_without_pending_entries_are_removed() -> None:
+    r = FakeRedis()
+    r.consumers = [
+        {"name": b"gone", "pending": 0, "idle": 7_200_000},
+        {"name": b"crashed", "pending": 4, "idle": 7_200_000},
+        {"name": b"live", "pending": 0, "idle": 10},
+    ]
+    removed = RedisEventStream(r, "events").remove_idle_consumers(
+        "orchestrator", min_idle_ms=3_600_000
+    )  # type: ignore[arg-type]
+
+    assert removed == ["gone"]
+    assert r.deleted_consumers == ["gone"]
+
+
+class FakeStream:
+    def __init__(self, entries: list[tuple[str, dict[str, Any]]]) -> None:
+        self.entries = entries
+        self.read_from: list[str] = []
+
+    async def latest_id(self) -> str:
+        return self.entries[-1][0] if self.entries else "0-0"
+
+    async def read(
+        self, last_id: str, *, count: int, block_ms: int
+    ) -> list[tuple[str, dict[str, Any]]]:
+        self.read_from.append(last_id)
+        await asyncio.sleep(0.01)
+        after = [e for e in self.entries if int(e[0].split("-")[0]) > int(last_id.split("-")[0])]
+        return after[:count]
+
+
+async def test_fanout_reads_forward_from_a_concrete_id_and_stops_with_the_last_subscriber() -> None:
+    stream = FakeStream([("1-0", {"job_id": "j1", "status": "RUNNING"})])
+    fanout = EventFanout(stream, block_ms=10)  # type: ignore[arg-type]
+
+    queue = await fanout.subscribe("j1")
+    # Published before the reader's first XREAD: still delivered, the older entry is not.
+    stream.entries.append(("2-0", {"job_id": "j1", "status": "SUCCEEDED"}))
+    event = await asyncio.wait_for(queue.get(), 1.0)
+
+    assert event["status"] == "SUCCEEDED"
+    assert stream.read_from[0] == "1-0"
+    assert "$" not in stream.read_from
+
+    fanout.unsubscribe("j1", queue)
+    await asyncio.sleep(0)
+    assert fanout.subscriber_count == 0
+    assert fanout._reader is None
+    await fanout.aclose()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import httpx
+import pytest
+
+from edvmp.eventbus import main as eventbus_main
+from edvmp.shared.events import AsyncRedisEventStream, PublishBatcher
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeAsyncRedis):
+        self._redis = redis
+        self._commands: list[dict[str, Any]] = []
+
+    def xadd(self, name: str, fields: dict[str, str], **_: Any) -> None:
+        self._commands.append(json.loads(fields["event"]))
+
+    async def execute(self) -> list[bytes]:
+        self._redis.round_trips += 1
+        start = len(self._redis.events)
+        self._redis.events.extend(self._commands)
+        return [f"{start + i}-0".encode() for i in range(len(self._commands))]
+
+
+class FakeAsyncRedis:
+    def __init__(self) -> None:
+        self.events: list[dict[str, Any]] = []
+        self.round_trips = 0
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def aclose(self) -> None:
+        return None
+
+
+def _webhook(keys: list[str]) -> dict[str, Any]:
+    return {
+        "Records": [
+            {"s3": {"bucket": {"name": "videos"}, "object": {"key": k, "size": 10, "eTag": "abc"}}}
+            for k in keys
+        ]
+    }
+
+
+async def test_webhook_records_are_published_in_one_round_trip(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake = FakeAsyncRedis()
+    monkeypatch.setattr(eventbus_main.redis.asyncio.Redis, "from_url", lambda url: fake)
+    app = eventbus_main.create_app()
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://eventbus"
+    ) as client:
+        res = await client.post(
+            "/minio/webhook", json=_webhook([f"uploads/j{i}/a.mp4" for i in range(25)])
+        )
+
+    assert res.json() == {"published": 25}
+    assert fake.round_trips == 1
+    assert [e["key"] for e in fake.events] == [f"uploads/j{i}/a.mp4" for i in range(25)]
+
+
+async def test_batcher_coalesces_concurrent_publishes() -> None:
+    fake = FakeAsyncRedis()
+    batcher = PublishBatcher(AsyncRedisEventStream(fake, "events"), window_s=0.01)  # type: ignore[arg-type]
+
+    await asyncio.gather(*(batcher.publish_many([{"n": i}, {"n": i}]) for i in range(20)))
+
+    assert fake.round_trips == 1
+    assert len(fake.events) == 40
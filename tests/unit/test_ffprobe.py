@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from edvmp.worker.classifier import classify_failure
+from edvmp.worker.ffprobe import MediaProbeError, ProbeTimeout, ffprobe
+
+
+@pytest.fixture
+def fake_ffprobe(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Install an ``ffprobe`` on PATH that runs the given shell body."""
+
+    def install(body: str) -> None:
+        script = tmp_path / "bin" / "ffprobe"
+        script.parent.mkdir(exist_ok=True)
+        script.write_text(f"#!/bin/sh\n{body}\n")
+        script.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{script.parent}:/usr/bin:/bin")
+
+    return install
+
+
+def test_probe_output_is_parsed(fake_ffprobe) -> None:
+    fake_ffprobe('echo \'{"format": {"duration": "1.5"}, "streams": []}\'')
+
+    assert ffprobe(Path("in.mp4"), timeout_s=5)["format"]["duration"] == "1.5"
+
+
+def test_hung_probe_is_killed_and_classified_as_timeout(fake_ffprobe) -> None:
+    fake_ffprobe("sleep 30")
+
+    start = time.monotonic()
+    with pytest.raises(ProbeTimeout) as excinfo:
+        ffprobe(Path("in.mp4"), timeout_s=0.3)
+
+    assert time.monotonic() - start < 5
+    assert excinfo.value.reason == "timeout"
+    assert classify_failure(excinfo.value).category == "timeout"
+
+
+def test_runaway_output_is_cut_off(fake_ffprobe) -> None:
+    fake_ffprobe("yes '{}'")
+
+    with pytest.raises(MediaProbeError, match="exceeded"):
+        ffprobe(Path("in.mp4"), timeout_s=5, max_output_bytes=1 << 20)
+
+
+def test_cpu_limit_stops_a_busy_probe(fake_ffprobe) -> None:
+    fake_ffprobe("while :; do :; done")
+
+    with pytest.raises(ProbeTimeout) as excinfo:
+        ffprobe(Path("in.mp4"), timeout_s=10, max_cpu_s=1, max_memory_bytes=512 << 20)
+
+    assert excinfo.value.reason == "cpu_limit"
+
+
+def test_probe_ignoring_sigxcpu_is_killed_at_the_hard_cpu_limit(fake_ffprobe) -> None:
+    fake_ffprobe("trap '' XCPU; while :; do :; done")
+
+    with pytest.raises(ProbeTimeout) as excinfo:
+        ffprobe(Path("in.mp4"), timeout_s=10, max_cpu_s=1, max_memory_bytes=512 << 20)
+
+    assert excinfo.value.reason == "cpu_limit"
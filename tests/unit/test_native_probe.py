@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import struct
+import time
+from pathlib import Path
+
+import pytest
+
+from edvmp.shared.results import project_metadata
+from edvmp.worker.executor import ProbePool, _probe_in_child
+from edvmp.worker.ffprobe import ProbeTimeout
+from edvmp.worker.native_probe import NativeProbeUnsupported, probe_native
+
+
+def _box(kind: bytes, *payload: bytes) -> bytes:
+    body = b"".join(payload)
+    return struct.pack(">I4s", 8 + len(body), kind) + body
+
+
+def _full(kind: bytes, *payload: bytes) -> bytes:
+    return _box(kind, b"\0\0\0\0", *payload)
+
+
+def _lang(code: str) -> int:
+    a, b, c = (ord(ch) - 0x60 for ch in code)
+    return (a << 10) | (b << 5) | c
+
+
+def _trak(handler: bytes, timescale: int, duration: int, entry: bytes, sizes: list[int]) -> bytes:
+    stsz = struct.pack(f">II{len(sizes)}I", 0, len(sizes), *sizes)
+    return _box(
+        b"trak",
+        _box(
+            b"mdia",
+            _full(b"mdhd", struct.pack(">IIIIHH", 0, 0, timescale, duration, _lang("eng"), 0)),
+            _full(b"hdlr", b"\0\0\0\0", handler, bytes(12), b"\0"),
+            _box(
+                b"minf",
+                _box(
+                    b"stbl",
+                    _full(b"stsd", struct.pack(">I", 1), entry),
+                    _full(b"stsz", stsz),
+                ),
+            ),
+        ),
+    )
+
+
+def _mp4(*, moov_last: bool = False, fragmented: bool = False) -> bytes:
+    avc1 = _box(b"avc1", bytes(6), b"\0\1", bytes(16), struct.pack(">HH", 1920, 1080), bytes(50))
+    esds = _full(b"esds", bytes([0x03, 0x0D, 0, 1, 0, 0x04, 0x08, 0x40]), bytes(7))
+    mp4a = _box(
+        b"mp4a", bytes(6), b"\0\1", bytes(8), struct.pack(">HHHHI", 2, 16, 0, 0, 48000 << 16), esds
+    )
+    moov = _box(
+        b"moov",
+        _full(b"mvhd", struct.pack(">IIII", 0, 0, 1000, 10_000), bytes(80)),
+        _trak(b"vide", 12800, 128_000, avc1, [1000] * 250),
+        _trak(b"soun", 48000, 480_000, mp4a, [400] * 469),
+        _box(b"mvex", _full(b"trex", bytes(20))) if fragmented else b"",
+    )
+    ftyp = _box(b"ftyp", b"isom", struct.pack(">I", 512), b"isomiso2avc1mp41")
+    mdat = _box(b"mdat", bytes(4096))
+    tail = _box(b"moof", bytes(8)) if fragmented else b""
+    return ftyp + (mdat + moov if moov_last else moov + mdat) + tail
+
+
+def _el(element_id: int, *payload: bytes) -> bytes:
+    body = b"".join(payload)
+    size = (1 << 56 | len(body)).to_bytes(8, "big")
+    return element_id.to_bytes((element_id.bit_length() + 7) // 8, "big") + size + body
+
+
+def _mkv(doc_type: bytes = b"webm") -> bytes:
+    header = _el(0x1A45DFA3, _el(0x4282, doc_type))
+    info = _el(
+        0x1549A966,
+        _el(0x2AD7B1, (1_000_000).to_bytes(3, "big")),
+        _el(0x4489, struct.pack(">d", 12_500.0)),
+    )
+    video = _el(
+        0xAE,
+        _el(0xD7, b"\1"),
+        _el(0x83, b"\1"),
+        _el(0x86, b"V_VP9"),
+        _el(0xE0, _el(0xB0, (1280).to_bytes(2, "big")), _el(0xBA, (720).to_bytes(2, "big"))),
+    )
+    audio = _el(
+        0xAE,
+        _el(0xD7, b"\2"),
+        _el(0x83, b"\2"),
+        _el(0x86, b"A_OPUS"),
+        _el(0x22B59C, b"fre"),
+        _el(0xE1, _el(0xB5, struct.pack(">f", 48000.0)), _el(0x9F, b"\6")),
+    )
+    cluster = _el(0x1F43B675, bytes(2048))
+    # Live-written files leave the Segment size unknown.
+    segment = (
+        bytes.fromhex("1853806701ffffffffffffff") + info + _el(0x1654AE6B, video, audio) + cluster
+    )
+    return header + segment
+
+
+@pytest.mark.parametrize("moov_last", [False, True])
+def test_mp4_headers_match_ffprobe_shape(tmp_path: Path, moov_last: bool) -> None:
+    path = tmp_path / "in.mp4"
+    path.write_bytes(_mp4(moov_last=moov_last))
+
+    metadata = probe_native(path)
+
+    fmt = metadata["format"]
+    assert fmt["format_name"] == "mov,mp4,m4a,3gp,3g2,mj2"
+    assert fmt["duration"] == "10.000000"
+    assert fmt["tags"]["compatible_brands"] == "isomiso2avc1mp41"
+    video, audio = metadata["streams"]
+    assert video | {"tags": None} == video | {
+        "codec_name": "h264",
+        "codec_type": "video",
+        "width": 1920,
+        "height": 1080,
+        "avg_frame_rate": "25/1",
+        "bit_rate": "200000",
+        "nb_frames": "250",
+        "tags": None,
+    }
+    assert (audio["codec_name"], audio["sample_rate"], audio["channels"]) == ("aac", "48000", 2)
+    assert audio["tags"] == {"language": "eng"}
+    projection = project_metadata(metadata)
+    assert (projection.video_codec, projection.audio_codec, projection.duration_s) == (
+        "h264",
+        "aac",
+        10.0,
+    )
+
+
+def test_matroska_headers_match_ffprobe_shape(tmp_path: Path) -> None:
+    path = tmp_path / "in.webm"
+    path.write_bytes(_mkv())
+
+    metadata = probe_native(path)
+
+    assert metadata["format"]["format_name"] == "matroska,webm"
+    assert metadata["format"]["duration"] == "12.500000"
+    video, audio = metadata["streams"]
+    assert (video["codec_name"], video["width"], video["height"]) == ("vp9", 1280, 720)
+    assert (audio["codec_name"], audio["sample_rate"], audio["channels"]) == ("opus", "48000", 6)
+    assert audio["tags"] == {"language": "fre"}
+
+
+@pytest.mark.parametrize(
+    "data",
+    [_mp4(fragmented=True), _mkv(doc_type=b"other"), b"RIFF\0\0\0\0AVI LIST" + bytes(64)],
+    ids=["fragmented-mp4", "unknown-doctype", "avi"],
+)
+def test_unsupported_inputs_are_left_to_ffprobe(tmp_path: Path, data: bytes) -> None:
+    path = tmp_path / "in.bin"
+    path.write_bytes(data)
+
+    with pytest.raises(NativeProbeUnsupported):
+        probe_native(path)
+
+
+def test_probe_pool_falls_back_to_ffprobe(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    script = tmp_path / "bin" / "ffprobe"
+    script.parent.mkdir()
+    script.write_text('#!/bin/sh\necho \'{"format": {"format_name": "avi"}, "streams": []}\'\n')
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{script.parent}:/usr/bin:/bin")
+    mp4, avi = tmp_path / "in.mp4", tmp_path / "in.avi"
+    mp4.write_bytes(_mp4())
+    avi.write_bytes(b"RIFF\0\0\0\0AVI LIST" + bytes(64))
+
+    pool = ProbePool(max_workers=1, native=True)
+    try:
+        assert pool.probe(mp4)["format"]["duration"] == "10.000000"
+        assert pool.probe(avi)["format"]["format_name"] == "avi"
+    finally:
+        pool.shutdown()
+
+
+def test_native_probe_shares_the_wall_clock_budget(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    script = tmp_path / "bin" / "ffprobe"
+    script.parent.mkdir()
+    script.write_text("#!/bin/sh\nsleep 5\n")
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{script.parent}:/usr/bin:/bin")
+    monkeypatch.setattr("edvmp.worker.executor.probe_native", lambda _: time.sleep(5))
+    mp4 = tmp_path / "in.mp4"
+    mp4.write_bytes(_mp4())
+
+    start = time.monotonic()
+    with pytest.raises(ProbeTimeout):
+        _probe_in_child(mp4, native=True, timeout_s=0.2)
+    assert time.monotonic() - start < 2
+
+
+def test_truncated_sample_size_table_is_left_to_ffprobe(tmp_path: Path) -> None:
+    data = _mp4()
+    # Claim a million more samples than the stsz box holds.
+    at = data.index(b"stsz") + 12
+    (count,) = struct.unpack_from(">I", data, at)
+    path = tmp_path / "in.mp4"
+    path.write_bytes(data[:at] + struct.pack(">I", count + 1_000_000) + data[at + 4 :])
+
+    with pytest.raises(NativeProbeUnsupported):
+        probe_native(path)
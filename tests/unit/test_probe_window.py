@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import io
+import struct
+from pathlib import Path
+
+import pytest
+
+from edvmp.worker.probe_window import ProbeWindowUnavailable, fetch_probe_window
+
+
+class FakeS3:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.ranges: list[tuple[int, int]] = []
+
+    def get_object(self, *, Bucket: str, Key: str, Range: str) -> dict:
+        start_s, end_s = Range.removeprefix("bytes=").split("-")
+        start, end = int(start_s), int(end_s)
+        self.ranges.append((start, end))
+        return {"Body": io.BytesIO(self.data[start : end + 1])}
+
+    @property
+    def bytes_fetched(self) -> int:
+        return sum(end - start + 1 for start, end in self.ranges)
+
+
+def _box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def _fetch(s3: FakeS3, dest: Path, **overrides: int) -> int:
+    kwargs = {"head_bytes": 64, "tail_bytes": 64, "max_moov_bytes": 1 << 20} | overrides
+    return fetch_probe_window(s3, bucket="b", key="k", size=len(s3.data), dest=dest, **kwargs)
+
+
+def test_tail_moov_is_fetched_without_reading_mdat(tmp_path: Path) -> None:
+    moov = _box(b"moov", b"\x01" * 200)
+    data = _box(b"ftyp", b"isom\x00\x00\x02\x00") + _box(b"mdat", b"\x00" * 100_000) + moov
+    s3 = FakeS3(data)
+    dest = tmp_path / "input"
+
+    fetched = _fetch(s3, dest)
+
+    local = dest.read_bytes()
+    assert len(local) == len(data)
+    assert local.endswith(moov)
+    assert fetched == s3.bytes_fetched
+    assert fetched < 1_000
+
+
+def test_non_mp4_gets_head_and_tail(tmp_path: Path) -> None:
+    data = b"\x1a\x45\xdf\xa3" + bytes(range(256)) * 40
+    s3 = FakeS3(data)
+    dest = tmp_path / "input"
+
+    _fetch(s3, dest)
+
+    local = dest.read_bytes()
+    assert local[:64] == data[:64]
+    assert local[-64:] == data[-64:]
+    assert s3.ranges == [(0, 63), (len(data) - 64, len(data) - 1)]
+
+
+def test_oversized_moov_requests_full_download(tmp_path: Path) -> None:
+    data = _box(b"ftyp", b"isom") + _box(b"mdat", b"\x00" * 1_000) + _box(b"moov", b"\x01" * 500)
+    with pytest.raises(ProbeWindowUnavailable):
+        _fetch(FakeS3(data), tmp_path / "input", max_moov_bytes=100)
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from edvmp.shared.models import JobStatus
+from edvmp.shared.pagination import InvalidCursor, JobQuery, ResultQuery
+from edvmp.shared.store import LocalSqliteStore
+
+
+def test_connection_is_reused_per_thread_with_pragmas(tmp_path: Path) -> None:
+    store = LocalSqliteStore(str(tmp_path / "app.db"))
+    with store._conn() as first, store._conn() as second:
+        assert first is second
+        assert first.execute("PRAGMA journal_mode;").fetchone()[0] == "wal"
+        assert first.execute("PRAGMA synchronous;").fetchone()[0] == 1  # NORMAL
+
+    other: list[sqlite3.Connection] = []
+
+    def grab() -> None:
+        with store._conn() as conn:
+            other.append(conn)
+
+    t = threading.Thread(target=grab)
+    t.start()
+    t.join()
+    assert other[0] is not first
+    # The exited thread's connection is closed with it, not kept until store.close().
+    with pytest.raises(sqlite3.ProgrammingError):
+        other[0].execute("SELECT 1;")
+    store.close()
+
+
+def test_writes_from_worker_threads_are_visible(tmp_path: Path) -> None:
+    store = LocalSqliteStore(str(tmp_path / "app.db"))
+
+    def create(i: int) -> None:
+        store.create_job_if_missing(
+            job_id=f"j{i}", bucket="b", key=f"uploads/j{i}/a.mp4", status=JobStatus.submitted
+        )
+
+    threads = [threading.Thread(target=create, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(store.list_jobs(limit=50)) == 8
+    store.close()
+
+
+def test_history_pages_walk_every_job_once_with_filters(tmp_path: Path) -> None:
+    store = LocalSqliteStore(str(tmp_path / "app.db"))
+    for i in range(25):
+        store.create_job_if_missing(
+            job_id=f"j{i:02d}", bucket="b", key=f"uploads/j{i}/a.mp4", status=JobStatus.submitted
+        )
+        if i % 3 == 0:
+            store.update_job(job_id=f"j{i:02d}", status=JobStatus.failed, error_code="PROBE_FAILED")
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        page = store.list_jobs_page(limit=7, cursor=cursor)
+        seen.extend(j.job_id for j in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == 25
+
+    failed = store.list_jobs_page(
+        limit=50, query=JobQuery(status=JobStatus.failed, error_code="PROBE_FAILED")
+    )
+    assert {j.job_id for j in failed.items} == {f"j{i:02d}" for i in range(0, 25, 3)}
+    assert failed.next_cursor is None
+
+    newest = store.list_jobs(limit=1)[0]
+    window = store.list_jobs_page(limit=50, query=JobQuery(created_before=newest.created_at))
+    assert newest.job_id not in {j.job_id for j in window.items}
+    assert len(window.items) == 24
+
+    with pytest.raises(InvalidCursor):
+        store.list_jobs_page(cursor="not-a-cursor")
+    store.close()
+
+
+def test_job_rows_carry_exactly_the_job_record_fields(tmp_path: Path) -> None:
+    store = LocalSqliteStore(str(tmp_path / "app.db"))
+    store.create_job_if_missing(job_id="j", bucket="b", key="k", status=JobStatus.submitted)
+    with store._conn() as conn:
+        conn.execute("ALTER TABLE jobs ADD COLUMN internal_note TEXT;")
+
+    (row,) = store.list_job_rows().items
+    assert row == store.get_job("j").model_dump(mode="json")
+    store.close()
+
+
+def _probe(streams: int) -> dict:
+    return {
+        "format": {"duration": "61.5", "format_name": "mov,mp4", "bit_rate": "4000000"},
+        "streams": [{"codec_type": "video", "codec_name": "h264", "width": 1920, "height": 1080}]
+        + [
+            {"codec_type": "audio", "codec_name": "aac", "tags": {"language": f"l{i}"}}
+            for i in range(streams - 1)
+        ],
+    }
+
+
+def test_results_store_projection_and_inflate_payload_only_on_request(tmp_path: Path) -> None:
+    store = LocalSqliteStore(str(tmp_path / "app.db"))
+    metadata = _probe(streams=40)
+    store.store_result(job_id="j1", metadata=metadata, summary="s")
+
+    compact = store.get_result("j1")
+    assert compact is not None and compact.metadata is None
+    assert (compact.projection.duration_s, compact.projection.video_codec) == (61.5, "h264")
+    assert (compact.projection.audio_streams, compact.projection.bit_rate) == (39, 4_000_000)
+
+    full = store.get_result("j1", full=True)
+    assert full is not None and full.metadata == metadata
+    with store._conn() as conn:
+        blob = conn.execute("SELECT metadata_gz FROM results WHERE job_id='j1';").fetchone()[0]
+    assert len(blob) < len(json.dumps(metadata)) / 5
+    store.close()
+
+
+def test_results_written_before_compaction_still_read(tmp_path: Path) -> None:
+    store = LocalSqliteStore(str(tmp_path / "app.db"))
+    metadata = _probe(streams=2)
+    with store._conn() as conn:
+        conn.execute(
+            "INSERT INTO results(job_id, metadata_json, summary) VALUES (?, ?, ?);",
+            ("old", json.dumps(metadata), "s"),
+        )
+    result = store.get_result("old", full=True)
+    assert result is not None and result.metadata == metadata
+    assert result.projection.width == 1920
+    store.close()
+
+
+def test_results_written_before_search_are_backfilled(tmp_path: Path) -> None:
+    db = str(tmp_path / "app.db")
+    store = LocalSqliteStore(db)
+    store.create_job_if_missing(job_id="old", bucket="b", key="k", status=JobStatus.succeeded)
+    with store._conn() as conn:
+        conn.execute(
+            "INSERT INTO results(job_id, metadata_json, summary) VALUES (?, ?, ?);",
+            ("old", json.dumps(_probe(streams=2)), "s"),
+        )
+    assert store.search_results().items == []
+    store.close()
+
+    store = LocalSqliteStore(db)
+    hits = store.search_results(query=ResultQuery(min_height=1080)).items
+    assert [h.job_id for h in hits] == ["old"]
+    assert hits[0].completed_at == store.get_job("old").updated_at
+    store.close()
+
+
+def _video(codec: str, height: int, duration: float) -> dict:
+    return {
+        "format": {"duration": str(duration)},
+        "streams": [
+            {
+                "codec_type": "video",
+                "codec_name": codec,
+                "width": height * 16 // 9,
+                "height": height,
+            }
+        ],
+    }
+
+
+def test_search_filters_projection_and_pages_by_completion(tmp_path: Path) -> None:
+    store = LocalSqliteStore(str(tmp_path / "app.db"))
+    for i in range(12):
+        codec = "hevc" if i % 2 else "h264"
+        store.store_result(
+            job_id=f"j{i:02d}",
+            metadata=_video(codec, 2160 if i % 3 else 1080, 60.0 * i),
+            summary="s",
+        )
+
+    query = ResultQuery(video_codec="hevc", min_height=2160, min_duration_s=300)
+    seen: list[str] = []
+    cursor = None
+    while True:
+        page = store.search_results(limit=2, cursor=cursor, query=query)
+        seen.extend(hit.job_id for hit in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == ["j11", "j07", "j05"]
+    assert store.search_results(query=ResultQuery(max_duration_s=60)).items[0].job_id == "j01"
+
+    with store._conn() as conn:
+        plan = " ".join(
+            r["detail"]
+            for r in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT job_id FROM results "
+                "WHERE completed_at IS NOT NULL AND video_codec = ? "
+                "ORDER BY completed_at DESC, job_id DESC LIMIT 3;",
+                ("hevc",),
+            )
+        )
+    assert "idx_results_video_codec" in plan and "TEMP B-TREE" not in plan
+    store.close()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import io
+import json
+import threading
+import time
+from typing import Any
+
+import pytest
+from botocore.exceptions import ClientError
+
+from edvmp.shared.bedrock import BedrockClient
+from edvmp.shared.summarizer import SummarizationService, TokenBucket
+
+
+class FakeRuntime:
+    def __init__(self, *, throttle_first: int = 0, delay_s: float = 0.0):
+        self.calls = 0
+        self._throttle_first = throttle_first
+        self._delay_s = delay_s
+        self._lock = threading.Lock()
+
+    def invoke_model(self, *, modelId: str, body: str) -> dict[str, Any]:  # noqa: N803
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        time.sleep(self._delay_s)
+        if call <= self._throttle_first:
+            raise ClientError(
+                {"Error": {"Code": "ThrottlingException", "Message": "slow down"}}, "InvokeModel"
+            )
+        payload = {"content": [{"text": f"summary #{call}"}]}
+        return {"body": io.BytesIO(json.dumps(payload).encode("utf-8"))}
+
+
+def _service(runtime: FakeRuntime, **overrides: Any) -> SummarizationService:
+    options: dict[str, Any] = {
+        "max_concurrency": 4,
+        "rate_per_s": 0,
+        "burst": 1,
+        "max_attempts": 4,
+        "cache_ttl_s": 60,
+        "cache_max_entries": 100,
+        "duration_bucket_s": 10.0,
+    }
+    options.update(overrides)
+    client = BedrockClient(mode="aws", model_id="m", region_name="us-east-1", client=runtime)
+    return SummarizationService(client, **options)
+
+
+def _metadata(duration: str, *, width: int = 1920) -> dict[str, Any]:
+    return {
+        "format": {"duration": duration},
+        "streams": [{"codec_type": "video", "codec_name": "h264", "width": width, "height": 1080}],
+    }
+
+
+def test_throttling_is_retried(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("tenacity.nap.time.sleep", lambda _: None)
+    runtime = FakeRuntime(throttle_first=2)
+    service = _service(runtime)
+
+    assert service.summarize(metadata=_metadata("12.0")) == "summary #3"
+    assert runtime.calls == 3
+
+
+def test_throttling_gives_up_after_max_attempts(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("tenacity.nap.time.sleep", lambda _: None)
+    runtime = FakeRuntime(throttle_first=10)
+    service = _service(runtime, max_attempts=2)
+
+    with pytest.raises(ClientError):
+        service.summarize(metadata=_metadata("12.0"))
+    assert runtime.calls == 2
+
+
+def test_near_identical_metadata_reuses_cached_summary() -> None:
+    runtime = FakeRuntime()
+    service = _service(runtime)
+
+    first = service.summarize(metadata=_metadata("12.0"))
+    assert service.summarize(metadata=_metadata("17.9")) == first
+    assert service.summarize(metadata=_metadata("12.0", width=1280)) != first
+    assert runtime.calls == 2
+
+
+def test_concurrent_identical_requests_share_one_call() -> None:
+    runtime = FakeRuntime(delay_s=0.2)
+    service = _service(runtime)
+    results: list[str] = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(service.summarize(metadata=_metadata("5"))))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert runtime.calls == 1
+    assert results == ["summary #1"] * 5
+
+
+def test_token_bucket_limits_sustained_rate() -> None:
+    bucket = TokenBucket(rate_per_s=50, burst=2)
+    start = time.monotonic()
+    for _ in range(7):
+        bucket.acquire()
+    # Two calls ride the burst, the remaining five wait ~20ms each.
+    assert time.monotonic() - start >= 0.09
+
+
+def test_mock_mode_bypasses_cache() -> None:
+    client = BedrockClient(mode="mock", model_id="m", region_name="us-east-1")
+    service = SummarizationService(
+        client,
+        max_concurrency=1,
+        rate_per_s=0,
+        burst=1,
+        max_attempts=1,
+        cache_ttl_s=60,
+        cache_max_entries=10,
+        duration_bucket_s=10.0,
+    )
+    assert "duration_s=12.0" in service.summarize(metadata=_metadata("12.0"))
+    assert "duration_s=17.9" in service.summarize(metadata=_metadata("17.9"))
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from edvmp.worker.executor import JobExecutor
+
+
+def test_executor_bounds_in_flight_jobs_and_drains() -> None:
+    executor = JobExecutor(concurrency=2)
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+    done: list[int] = []
+
+    def job(i: int) -> None:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+            done.append(i)
+
+    for i in range(6):
+        executor.submit(lambda i=i: job(i))
+    executor.drain()
+
+    assert peak == 2
+    assert sorted(done) == list(range(6))
+    assert executor.in_flight == 0
+
+
+def test_wait_for_capacity_reports_free_slots() -> None:
+    executor = JobExecutor(concurrency=3)
+    release = threading.Event()
+
+    def blocked() -> None:
+        release.wait(timeout=5)
+
+    executor.submit(blocked)
+
+    assert executor.wait_for_capacity(timeout=1) == 2
+    release.set()
+    executor.drain()
+    assert executor.wait_for_capacity(timeout=1) == 3
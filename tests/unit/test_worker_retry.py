@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from edvmp.shared.config import Settings
+from edvmp.shared.models import JobStatus
+from edvmp.shared.queue import QueueMessage, RedisDlq
+from edvmp.shared.store import LocalSqliteStore
+from edvmp.worker.main import JobState, WorkerContext, _on_dead_letter, _on_job_error
+from edvmp.worker.retry import RetryPolicies, RetryPolicy
+
+
+class ListClient:
+    def __init__(self) -> None:
+        self.lists: dict[str, list[str]] = {}
+
+    def rpush(self, name: str, value: str) -> None:
+        self.lists.setdefault(name, []).append(value)
+
+
+def test_policies_follow_the_failure_category() -> None:
+    policies = RetryPolicies(
+        default=RetryPolicy(max_attempts=3, base_delay_s=1.0, max_delay_s=60.0),
+        overrides={"provider_error": {"max_attempts": 9}, "custom": {"base_delay_s": 2}},
+    )
+
+    assert policies.for_category("bad_media").max_attempts == 1
+    assert policies.for_category("provider_error").max_attempts == 9
+    assert policies.for_category("provider_error").base_delay_s == 15.0
+    assert policies.for_category("custom") == RetryPolicy(3, 2.0, 60.0)
+    assert policies.for_category("unexpected_exception").max_attempts == 3
+
+    policy = RetryPolicy(max_attempts=10, base_delay_s=4.0, max_delay_s=20.0)
+    delays = [policy.delay_s(attempt) for attempt in (1, 2, 3, 4) for _ in range(50)]
+    assert all(2.0 <= d <= 4.0 for d in delays[:50])
+    assert all(10.0 <= d <= 20.0 for d in delays[150:])
+
+
+def _job(ctx_dir: Path, acked: list[str]) -> tuple[WorkerContext, JobState, list]:
+    store = LocalSqliteStore(str(ctx_dir / "app.db"))
+    store.create_job_if_missing(
+        job_id="j1", bucket="videos", key="uploads/j1/a.mp4", status=JobStatus.processing
+    )
+    requeued: list[tuple[QueueMessage, float]] = []
+    ctx = WorkerContext(
+        settings=Settings(APP_ENV="local", EVENTBUS_URL=""),
+        store=store,
+        dlq=RedisDlq(ListClient(), "dlq"),  # type: ignore[arg-type]
+        s3=None,
+        bedrock=None,  # type: ignore[arg-type]
+        probe=lambda _: {},
+        eventbus_url="",
+        requeue=lambda message, delay_s: requeued.append((message, delay_s)),
+    )
+    msg = QueueMessage(
+        "ProcessVideo", {"job_id": "j1", "bucket": "videos", "key": "uploads/j1/a.mp4"}
+    )
+    return ctx, JobState.from_message(msg, lambda: acked.append("j1")), requeued
+
+
+def test_retry_is_requeued_with_its_attempt_and_the_lease_released(tmp_path: Path) -> None:
+    acked: list[str] = []
+    ctx, job, requeued = _job(tmp_path, acked)
+
+    assert _on_job_error(ctx, job, ConnectionError("s3 endpoint unreachable")) is None
+
+    ((message, delay_s),) = requeued
+    assert message.payload["attempt"] == 1 and 2.5 <= delay_s <= 5.0
+    assert acked == ["j1"]
+    assert JobState.from_message(message, lambda: None).attempt == 1
+
+
+def test_bad_media_goes_straight_to_the_dlq(tmp_path: Path) -> None:
+    acked: list[str] = []
+    ctx, job, requeued = _job(tmp_path, acked)
+
+    assert _on_job_error(ctx, job, RuntimeError("moov atom not found")) is None
+
+    assert requeued == [] and acked == ["j1"]
+    (raw,) = ctx.dlq._client.lists["dlq"]  # type: ignore[union-attr]
+    assert json.loads(raw)["error_code"] == "bad_media"
+    job_record = ctx.store.get_job("j1")
+    assert job_record is not None and job_record.status == JobStatus.failed
+
+
+def test_dead_lettered_message_fails_its_job(tmp_path: Path) -> None:
+    ctx, job, _ = _job(tmp_path, [])
+
+    _on_dead_letter(ctx, job.message)
+    _on_dead_letter(ctx, QueueMessage("Mystery", {"x": 1}))
+
+    job_dlq, other = (json.loads(raw) for raw in ctx.dlq._client.lists["dlq"])  # type: ignore[union-attr]
+    assert (job_dlq["job_id"], job_dlq["error_code"]) == ("j1", "poison_message")
+    assert (other["message_type"], other["error_code"]) == ("Mystery", "poison_message")
+    job_record = ctx.store.get_job("j1")
+    assert job_record is not None and job_record.error_code == "poison_message"
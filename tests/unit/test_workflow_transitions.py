@@ -2,8 +2,12 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from edvmp.orchestrator.handlers import handle_job_completed, handle_object_created
-from edvmp.shared.models import JobCompletedEvent, JobStatus, ObjectCreatedEvent
+from edvmp.orchestrator.handlers import (
+    handle_event_batch,
+    handle_job_completed,
+    handle_object_created,
+)
+from edvmp.shared.models import JobCompletedEvent, JobPriority, JobStatus, ObjectCreatedEvent
 from edvmp.shared.queue import QueueMessage
 from edvmp.shared.store import LocalSqliteStore
 
@@ -44,3 +48,84 @@ def test_job_completed_updates_status(tmp_path: Path) -> None:
     job = store.get_job("j1")
     assert job is not None
     assert job.status == JobStatus.succeeded
+
+
+def test_event_batch_is_applied_with_per_event_isolation(tmp_path: Path) -> None:
+    store = LocalSqliteStore(str(tmp_path / "app.db"))
+    store.create_job_if_missing(job_id="done", bucket="videos", key="uploads/done/a.mp4", status=JobStatus.processing)
+
+    created = ObjectCreatedEvent(bucket="videos", key="uploads/abc/sample.mp4", size=1234).model_dump(mode="json")
+    events = [
+        ("1-0", created),
+        ("2-0", created),
+        ("3-0", {"event_type": "JobCompleted", "job_id": "done"}),  # missing status: invalid
+        ("4-0", JobCompletedEvent(job_id="done", status=JobStatus.succeeded).model_dump(mode="json")),
+    ]
+    result = handle_event_batch(store=store, events=events)
+
+    assert result.ack_ids == ["1-0", "2-0", "4-0"]
+    assert result.failed_ids == ["3-0"]
+    assert [d.action for d in result.decisions] == ["enqueued", "skip_duplicate"]
+    assert [m.payload for m in result.messages] == [
+        {
+            "job_id": "abc",
+            "bucket": "videos",
+            "key": "uploads/abc/sample.mp4",
+            "size": 1234,
+            "priority": "standard",
+        }
+    ]
+    job = store.get_job("abc")
+    assert job is not None and job.status == JobStatus.processing
+    done = store.get_job("done")
+    assert done is not None and done.status == JobStatus.succeeded
+
+
+def test_failed_savepoint_rolls_back_only_its_event(tmp_path: Path) -> None:
+    store = LocalSqliteStore(str(tmp_path / "app.db"))
+    with store.transaction():
+        store.create_job_if_missing(job_id="keep", bucket="b", key="uploads/keep/a", status=JobStatus.submitted)
+        try:
+            with store.transaction():
+                store.create_job_if_missing(job_id="drop", bucket="b", key="uploads/drop/a", status=JobStatus.submitted)
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+
+    assert store.get_job("keep") is not None
+    assert store.get_job("drop") is None
+
+
+def test_enqueued_payload_carries_priority_and_submitter_from_the_job(tmp_path: Path) -> None:
+    store = LocalSqliteStore(str(tmp_path / "app.db"))
+    store.create_job_if_missing(
+        job_id="abc",
+        bucket="videos",
+        key="uploads/abc/a.mp4",
+        status=JobStatus.awaiting_upload,
+        priority=JobPriority.bulk,
+        submitter="backfill-bot",
+    )
+    event = ObjectCreatedEvent(bucket="videos", key="uploads/abc/a.mp4").model_dump(mode="json")
+
+    result = handle_event_batch(store=store, events=[("1-0", event)])
+
+    payload = result.messages[0].payload
+    assert (payload["priority"], payload["submitter"]) == ("bulk", "backfill-bot")
+
+
+def test_event_redelivered_after_a_failed_enqueue_is_emitted_again(tmp_path: Path) -> None:
+    store = LocalSqliteStore(str(tmp_path / "app.db"))
+    event = ObjectCreatedEvent(bucket="videos", key="uploads/abc/a.mp4").model_dump(mode="json")
+
+    first = handle_event_batch(store=store, events=[("1-0", event)])
+    # The Redis pipeline failed, so the claim was never confirmed and the event is reclaimed.
+    retried = handle_event_batch(store=store, events=[("1-0", event)])
+    store.mark_idempotency_enqueued(retried.enqueued_keys)
+    duplicate = handle_event_batch(store=store, events=[("2-0", event)])
+
+    assert [d.action for d in first.decisions] == ["enqueued"]
+    assert [d.action for d in retried.decisions] == ["reenqueued"]
+    assert [m.payload["job_id"] for m in retried.messages] == ["abc"]
+    assert [d.action for d in duplicate.decisions] == ["skip_duplicate"]
+    assert duplicate.messages == []